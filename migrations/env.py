@@ -17,6 +17,7 @@ from src.db.models import (
     ChatThread,
     ChatMessage,
     LangGraphCheckpoint,
+    EmbeddingCacheEntry,
 )
 
 config = context.config
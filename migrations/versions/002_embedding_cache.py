@@ -0,0 +1,33 @@
+"""Persistent embedding cache table
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'embedding_cache',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('dimensions', sa.Integer(), nullable=False),
+        sa.Column('embedding', Vector(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index('ix_embedding_cache_created_at', 'embedding_cache', ['created_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_embedding_cache_created_at')
+    op.drop_table('embedding_cache')
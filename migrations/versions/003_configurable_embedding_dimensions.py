@@ -0,0 +1,51 @@
+"""Resize embedding columns to EMBEDDING_DIMENSIONS
+
+Existing vectors cannot be converted between widths, so a resize clears the
+embedding column; re-run the seed afterwards to re-embed at the new width.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.config import EMBEDDING_DIMENSIONS
+
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORIGINAL_DIMENSIONS = 1536
+
+VECTOR_INDEXES = {
+    'clinical_organizations': 'idx_org_embedding',
+    'clinical_tools': 'idx_tool_embedding',
+}
+
+
+def _resize(dimensions: int) -> None:
+    conn = op.get_bind()
+    for table, index in VECTOR_INDEXES.items():
+        current = conn.execute(sa.text("""
+            SELECT atttypmod FROM pg_attribute
+            WHERE attrelid = CAST(:table AS regclass) AND attname = 'embedding'
+        """), {"table": table}).scalar()
+        if current == dimensions:
+            continue
+        op.drop_index(index, table_name=table)
+        op.execute(
+            f'ALTER TABLE {table} ALTER COLUMN embedding TYPE vector({dimensions}) USING NULL'
+        )
+        op.create_index(index, table, ['embedding'], postgresql_using='hnsw', postgresql_ops={'embedding': 'vector_cosine_ops'})
+
+
+def upgrade() -> None:
+    _resize(EMBEDDING_DIMENSIONS)
+
+
+def downgrade() -> None:
+    _resize(ORIGINAL_DIMENSIONS)
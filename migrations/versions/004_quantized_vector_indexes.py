@@ -0,0 +1,58 @@
+"""Quantized (halfvec / binary) HNSW expression indexes
+
+Candidate indexes for the quantized retriever modes. Both are expression
+indexes over the existing full-precision column, which stays the source of
+truth for exact re-ranking. Requires pgvector >= 0.7.0; skipped otherwise.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.config import EMBEDDING_DIMENSIONS
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger('alembic.runtime.migration')
+
+VECTOR_INDEXES = {
+    'clinical_organizations': 'idx_org_embedding',
+    'clinical_tools': 'idx_tool_embedding',
+}
+
+
+def _supports_quantization() -> bool:
+    version = op.get_bind().execute(sa.text(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+    )).scalar()
+    return version is not None and tuple(int(p) for p in version.split('.')[:2]) >= (0, 7)
+
+
+def upgrade() -> None:
+    if not _supports_quantization():
+        logger.warning("pgvector < 0.7.0: skipping quantized indexes (upgrade the extension and re-run init_db)")
+        return
+    dims = int(EMBEDDING_DIMENSIONS)
+    for table, index in VECTOR_INDEXES.items():
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS {index}_halfvec ON {table} '
+            f'USING hnsw ((embedding::halfvec({dims})) halfvec_cosine_ops)'
+        )
+        op.execute(
+            f'CREATE INDEX IF NOT EXISTS {index}_binary ON {table} '
+            f'USING hnsw ((binary_quantize(embedding)::bit({dims})) bit_hamming_ops)'
+        )
+
+
+def downgrade() -> None:
+    for index in VECTOR_INDEXES.values():
+        op.execute(f'DROP INDEX IF EXISTS {index}_halfvec')
+        op.execute(f'DROP INDEX IF EXISTS {index}_binary')
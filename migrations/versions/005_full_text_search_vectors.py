@@ -0,0 +1,44 @@
+"""Generated tsvector columns with GIN indexes for hybrid search
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTORS = {
+    'clinical_organizations': (
+        'idx_org_search_vector',
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(specialty, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'C')",
+    ),
+    'clinical_tools': (
+        'idx_tool_search_vector',
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(problem_solved, '')), 'C')",
+    ),
+}
+
+
+def upgrade() -> None:
+    for table, (index, expression) in SEARCH_VECTORS.items():
+        op.execute(
+            f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search_vector tsvector '
+            f'GENERATED ALWAYS AS ({expression}) STORED'
+        )
+        op.create_index(index, table, ['search_vector'], postgresql_using='gin', if_not_exists=True)
+
+
+def downgrade() -> None:
+    for table, (index, _) in SEARCH_VECTORS.items():
+        op.drop_index(index, table_name=table, if_exists=True)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,32 @@
+"""B-tree and GIN indexes for structured retriever filters
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_org_state', 'clinical_organizations', ['state'], if_not_exists=True)
+    op.create_index('idx_org_type', 'clinical_organizations', ['org_type'], if_not_exists=True)
+    op.create_index('idx_org_specialty', 'clinical_organizations', ['specialty'], if_not_exists=True)
+    op.create_index('idx_org_ai_use_cases', 'clinical_organizations', ['ai_use_cases'], postgresql_using='gin', if_not_exists=True)
+    op.create_index('idx_tool_category', 'clinical_tools', ['category'], if_not_exists=True)
+    op.create_index('idx_tool_target_users', 'clinical_tools', ['target_users'], postgresql_using='gin', if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_tool_target_users', table_name='clinical_tools', if_exists=True)
+    op.drop_index('idx_tool_category', table_name='clinical_tools', if_exists=True)
+    op.drop_index('idx_org_ai_use_cases', table_name='clinical_organizations', if_exists=True)
+    op.drop_index('idx_org_specialty', table_name='clinical_organizations', if_exists=True)
+    op.drop_index('idx_org_type', table_name='clinical_organizations', if_exists=True)
+    op.drop_index('idx_org_state', table_name='clinical_organizations', if_exists=True)
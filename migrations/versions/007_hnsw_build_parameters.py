@@ -0,0 +1,54 @@
+"""Rebuild HNSW indexes with HNSW_M / HNSW_EF_CONSTRUCTION
+
+Indexes whose stored build options already match the configuration are left
+alone, so re-running with unchanged settings is a no-op.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.config import HNSW_M, HNSW_EF_CONSTRUCTION
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VECTOR_INDEXES = {
+    'clinical_organizations': 'idx_org_embedding',
+    'clinical_tools': 'idx_tool_embedding',
+}
+
+DEFAULT_M = 16
+DEFAULT_EF_CONSTRUCTION = 64
+
+
+def _rebuild(m: int, ef_construction: int) -> None:
+    conn = op.get_bind()
+    wanted = {f'm={int(m)}', f'ef_construction={int(ef_construction)}'}
+    for table, index in VECTOR_INDEXES.items():
+        options = conn.execute(sa.text(
+            "SELECT reloptions FROM pg_class WHERE relname = :index"
+        ), {"index": index}).scalar()
+        if set(options or []) == wanted:
+            continue
+        op.drop_index(index, table_name=table, if_exists=True)
+        op.create_index(
+            index, table, ['embedding'],
+            postgresql_using='hnsw',
+            postgresql_ops={'embedding': 'vector_cosine_ops'},
+            postgresql_with={'m': int(m), 'ef_construction': int(ef_construction)},
+        )
+
+
+def upgrade() -> None:
+    _rebuild(HNSW_M, HNSW_EF_CONSTRUCTION)
+
+
+def downgrade() -> None:
+    _rebuild(DEFAULT_M, DEFAULT_EF_CONSTRUCTION)
@@ -0,0 +1,47 @@
+"""updated_at columns maintained by trigger for incremental index refresh
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHANGE_TRACKED = {
+    'clinical_organizations': 'idx_org_updated_at',
+    'clinical_tools': 'idx_tool_updated_at',
+}
+
+
+def upgrade() -> None:
+    op.execute("""
+        CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table, index in CHANGE_TRACKED.items():
+        op.execute(
+            f'ALTER TABLE {table} ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now()'
+        )
+        op.create_index(index, table, ['updated_at'], if_not_exists=True)
+        op.execute(
+            f'CREATE OR REPLACE TRIGGER {table}_touch_updated_at BEFORE UPDATE ON {table} '
+            f'FOR EACH ROW EXECUTE FUNCTION touch_updated_at()'
+        )
+
+
+def downgrade() -> None:
+    for table, index in CHANGE_TRACKED.items():
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_touch_updated_at ON {table}')
+        op.drop_index(index, table_name=table, if_exists=True)
+        op.drop_column(table, 'updated_at')
+    op.execute('DROP FUNCTION IF EXISTS touch_updated_at()')
@@ -0,0 +1,64 @@
+"""Corpus version triggers and UNLOGGED retrieval result cache
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = '009'
+down_revision: Union[str, None] = '008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+VERSIONED_TABLES = ['clinical_organizations', 'clinical_tools']
+
+
+def upgrade() -> None:
+    op.create_table(
+        'corpus_versions',
+        sa.Column('table_name', sa.String(63), primary_key=True),
+        sa.Column('version', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        'retrieval_cache',
+        sa.Column('cache_key', sa.String(64), primary_key=True),
+        sa.Column('table_name', sa.String(63), nullable=False),
+        sa.Column('corpus_version', sa.BigInteger(), nullable=False),
+        sa.Column('results', JSONB(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        prefixes=['UNLOGGED'],
+    )
+    op.create_index('ix_retrieval_cache_created_at', 'retrieval_cache', ['created_at'])
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_corpus_version() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO corpus_versions (table_name, version, updated_at)
+            VALUES (TG_TABLE_NAME, 1, now())
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = corpus_versions.version + 1, updated_at = now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in VERSIONED_TABLES:
+        op.execute(f"INSERT INTO corpus_versions (table_name, version) VALUES ('{table}', 0)")
+        op.execute(
+            f'CREATE OR REPLACE TRIGGER {table}_bump_corpus_version '
+            f'AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} '
+            f'FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version()'
+        )
+
+
+def downgrade() -> None:
+    for table in VERSIONED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS {table}_bump_corpus_version ON {table}')
+    op.execute('DROP FUNCTION IF EXISTS bump_corpus_version()')
+    op.drop_index('ix_retrieval_cache_created_at', table_name='retrieval_cache')
+    op.drop_table('retrieval_cache')
+    op.drop_table('corpus_versions')
@@ -0,0 +1,51 @@
+"""UNLOGGED semantic answer cache with an HNSW index on query embeddings
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+from pgvector.sqlalchemy import Vector
+
+from src.config import EMBEDDING_DIMENSIONS, HNSW_M, HNSW_EF_CONSTRUCTION
+
+revision: str = '010'
+down_revision: Union[str, None] = '009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'semantic_cache',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('namespace', sa.String(64), nullable=False),
+        sa.Column('query', sa.Text(), nullable=False),
+        sa.Column('embedding', Vector(EMBEDDING_DIMENSIONS), nullable=False),
+        sa.Column('route', sa.String(50)),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.Column('tools_results', JSONB(), nullable=False),
+        sa.Column('orgs_results', JSONB(), nullable=False),
+        sa.Column('confidence', JSONB(), nullable=False),
+        sa.Column('corpus_version', sa.BigInteger(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        prefixes=['UNLOGGED'],
+    )
+    op.create_index('ix_semantic_cache_expires_at', 'semantic_cache', ['expires_at'])
+    op.create_index(
+        'idx_semantic_cache_embedding', 'semantic_cache', ['embedding'],
+        postgresql_using='hnsw',
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+        postgresql_with={'m': int(HNSW_M), 'ef_construction': int(HNSW_EF_CONSTRUCTION)},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_semantic_cache_embedding', table_name='semantic_cache')
+    op.drop_index('ix_semantic_cache_expires_at', table_name='semantic_cache')
+    op.drop_table('semantic_cache')
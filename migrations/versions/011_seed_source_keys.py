@@ -0,0 +1,44 @@
+"""Natural keys and content hashes for incremental re-seeding
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '011'
+down_revision: Union[str, None] = '010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SOURCE_KEYED = {
+    'clinical_organizations': 'idx_org_source_key',
+    'clinical_tools': 'idx_tool_source_key',
+}
+
+
+def upgrade() -> None:
+    for table, index in SOURCE_KEYED.items():
+        op.add_column(table, sa.Column('source_key', sa.String(255)))
+        op.add_column(table, sa.Column('content_hash', sa.String(64)))
+        op.add_column(table, sa.Column('record_hash', sa.String(64)))
+        # Earlier seeds had no keys: key the first row per name; the next sync
+        # re-embeds it once and deletes the unkeyed duplicates
+        op.execute(f"""
+            UPDATE {table} t
+            SET source_key = t.name
+            FROM (SELECT min(id) AS id FROM {table} GROUP BY name) first
+            WHERE t.id = first.id
+        """)
+        op.create_index(index, table, ['source_key'], unique=True)
+
+
+def downgrade() -> None:
+    for table, index in SOURCE_KEYED.items():
+        op.drop_index(index, table_name=table, if_exists=True)
+        op.drop_column(table, 'record_hash')
+        op.drop_column(table, 'content_hash')
+        op.drop_column(table, 'source_key')
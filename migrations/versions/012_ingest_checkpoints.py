@@ -0,0 +1,31 @@
+"""Checkpoints for resumable streaming ingestion
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '012'
+down_revision: Union[str, None] = '011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingest_checkpoints',
+        sa.Column('table_name', sa.String(63), primary_key=True),
+        sa.Column('source', sa.String(1024), primary_key=True),
+        sa.Column('fingerprint', sa.String(64), nullable=False),
+        sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+        sa.Column('records', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingest_checkpoints')
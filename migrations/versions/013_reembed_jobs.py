@@ -0,0 +1,64 @@
+"""Background re-embedding jobs; shadow-column writes skip the change triggers
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-17
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '013'
+down_revision: Union[str, None] = '012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def set_trigger_functions(shadow_write_guard: bool) -> None:
+    guard = """
+            IF current_setting('app.shadow_write', true) = 'on' THEN
+                RETURN {result};
+            END IF;""" if shadow_write_guard else ""
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+        BEGIN{guard.format(result='NEW')}
+            NEW.updated_at = now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION bump_corpus_version() RETURNS trigger AS $$
+        BEGIN{guard.format(result='NULL')}
+            INSERT INTO corpus_versions (table_name, version, updated_at)
+            VALUES (TG_TABLE_NAME, 1, now())
+            ON CONFLICT (table_name)
+            DO UPDATE SET version = corpus_versions.version + 1, updated_at = now();
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reembed_jobs',
+        sa.Column('table_name', sa.String(63), primary_key=True),
+        sa.Column('backend', sa.String(20), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('dimensions', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='running'),
+        sa.Column('rows_done', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('last_id', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('rows_per_second', sa.Float()),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('flipped_at', sa.DateTime(timezone=True)),
+    )
+    set_trigger_functions(shadow_write_guard=True)
+
+
+def downgrade() -> None:
+    set_trigger_functions(shadow_write_guard=False)
+    op.drop_table('reembed_jobs')
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Compare one-at-a-time search against batched search_many (one embedding call, one SQL statement)."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+from src.benchmark.batching import batch_search_report
+from src.benchmark.queries import DEFAULT_QUERIES, read_texts
+from src.embeddings import get_embeddings_batch
+from src.retrievers import OrgsRetriever, ToolsRetriever
+
+
+def cycle_queries(base: list[str], count: int) -> list[str]:
+    """Repeat base queries with a numeric suffix so every text is distinct."""
+    return [
+        base[i] if i < len(base) else f"{base[i % len(base)]} ({i // len(base)})"
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries-file", help="JSONL queries (default: example queries)")
+    parser.add_argument("--num-queries", type=int, default=1000,
+                        help="Distinct queries generated from the example set")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    if args.queries_file:
+        queries = read_texts(args.queries_file)
+    else:
+        queries = cycle_queries(DEFAULT_QUERIES, args.num_queries)
+
+    reports = {}
+    for retriever_cls in (ToolsRetriever, OrgsRetriever):
+        retriever = retriever_cls(embed_fn=None)
+        report = batch_search_report(
+            retriever, queries, get_embeddings_batch, k=args.k, batch_size=args.batch_size
+        )
+        reports[retriever_cls.table] = report
+        print(
+            f"{retriever_cls.table}: {report['queries']} queries, "
+            f"sequential {report['sequential_seconds']}s ({report['sequential_qps']} q/s), "
+            f"batched {report['batched_seconds']}s ({report['batched_qps']} q/s), "
+            f"identical results {report['identical_results']:.1%}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"k": args.k, "tables": reports}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Compare rows/s of the ORM seed path and binary COPY (direct and staged) on the same rows."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+from src.benchmark.ingest import INGEST_METHODS, ingest_report
+from src.config import EMBEDDING_DIMENSIONS, LOCAL_EMBEDDING_WORKERS
+from src.embeddings.local_embed import LocalEmbedder
+
+TABLES = {"tools": "clinical_tools", "orgs": "clinical_organizations"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), default=list(TABLES))
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--methods", nargs="+", choices=INGEST_METHODS, default=list(INGEST_METHODS))
+    parser.add_argument("--dimensions", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--workers", type=int, default=LOCAL_EMBEDDING_WORKERS,
+                        help="Local embedding worker processes")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    embedder = LocalEmbedder(dimensions=args.dimensions, workers=args.workers)
+    reports = []
+    try:
+        for name in args.tables:
+            report = ingest_report(TABLES[name], args.rows, embedder, tuple(args.methods))
+            reports.append(report)
+            print(f"\n{report['table']}: {report['rows']} rows, {report['dimensions']} dims")
+            for method, result in report["methods"].items():
+                speedup = f" ({result['speedup_vs_orm']}x ORM)" if "speedup_vs_orm" in result else ""
+                print(f"  {method:>13}: {result['rows_per_second']:>10} rows/s{speedup}")
+    finally:
+        embedder.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(reports, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
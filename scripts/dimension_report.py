@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Report recall@k vs. embedding width to choose EMBEDDING_DIMENSIONS with data."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+import numpy as np
+
+from src.benchmark.dimensions import dimension_report
+from src.benchmark.queries import DEFAULT_QUERIES, read_texts
+from src.config import EMBEDDING_BACKEND, EMBEDDING_MODEL
+from src.seed.clinical_data import CLINICAL_ORGANIZATIONS, CLINICAL_TOOLS
+from src.seed.run_seed import create_embedding_text_org, create_embedding_text_tool
+
+
+def model_name() -> str:
+    if EMBEDDING_BACKEND == "local":
+        from src.embeddings.local_embed import LOCAL_EMBEDDING_MODEL
+        return LOCAL_EMBEDDING_MODEL
+    return EMBEDDING_MODEL
+
+
+def embed_native(texts: list[str]) -> np.ndarray:
+    """Embed at the backend's full width."""
+    if EMBEDDING_BACKEND == "local":
+        from src.embeddings.local_embed import embed_texts
+        return embed_texts(texts, 3072)
+    from src.embeddings.openai_embed import get_native_embeddings
+    return np.asarray(get_native_embeddings(texts), dtype=np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus-file", help="JSONL corpus (default: seed data)")
+    parser.add_argument("--queries-file", help="JSONL queries (default: example queries)")
+    parser.add_argument("--dimensions", default="128,256,384,512,768,1024,1536")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    corpus_texts = read_texts(args.corpus_file) if args.corpus_file else (
+        [create_embedding_text_org(o) for o in CLINICAL_ORGANIZATIONS]
+        + [create_embedding_text_tool(t) for t in CLINICAL_TOOLS]
+    )
+    query_texts = read_texts(args.queries_file) if args.queries_file else DEFAULT_QUERIES
+
+    print(f"Embedding {len(corpus_texts)} documents and {len(query_texts)} queries "
+          f"({EMBEDDING_BACKEND}, {model_name()})...")
+    corpus = embed_native(corpus_texts)
+    queries = embed_native(query_texts)
+
+    rows = dimension_report(
+        corpus, queries, [int(d) for d in args.dimensions.split(",")], k=args.k
+    )
+    report = {
+        "backend": EMBEDDING_BACKEND,
+        "model": model_name(),
+        "native_dimensions": int(corpus.shape[1]),
+        "corpus_size": len(corpus_texts),
+        "queries": len(query_texts),
+        "k": args.k,
+        "results": rows,
+    }
+
+    print(f"\n{'dims':>6} {'recall@' + str(args.k):>10} {'bytes/vec':>10} {'size':>6}")
+    for row in rows:
+        print(f"{row['dimensions']:>6} {row[f'recall@{args.k}']:>10.4f} "
+              f"{row['bytes_per_vector']:>10} {row['relative_size']:>6.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Stream a JSONL or CSV catalog export into a vector table, resuming from its checkpoint."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+from src.config import INGEST_BATCH_SIZE, INGEST_CONCURRENCY
+from src.seed.stream import READERS, ingest_file
+
+TABLES = {"tools": "clinical_tools", "orgs": "clinical_organizations"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("table", choices=list(TABLES))
+    parser.add_argument("path", help="JSONL (.jsonl/.ndjson) or CSV (.csv) export")
+    parser.add_argument("--format", choices=list(READERS), help="Input format (default: from extension)")
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=INGEST_CONCURRENCY,
+                        help="Batches embedded ahead of the writer")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and start at byte 0")
+    parser.add_argument("--reembed", action="store_true", help="Re-embed every record")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="Drop the embedding index during the load and build it afterwards")
+    parser.add_argument("--namespace",
+                        help="Source key namespace (default: the file name); reuse it for later exports")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    report = ingest_file(
+        TABLES[args.table],
+        args.path,
+        input_format=args.format,
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        restart=args.restart,
+        reembed=args.reembed,
+        defer_indexes=args.defer_indexes,
+        namespace=args.namespace,
+    )
+    resumed = f" (resumed at byte {report['resumed_from']})" if report["resumed_from"] else ""
+    print(
+        f"{report['table']}: {report['records']} records{resumed} in {report['seconds']}s "
+        f"({report['records_per_second']} records/s)\n"
+        f"  {report['inserted']} inserted, {report['updated']} updated ({report['embedded']} embedded), "
+        f"{report['unchanged']} unchanged, {report['invalid']} invalid, {report['duplicates']} duplicates"
+    )
+    for build in report["index_builds"]:
+        concurrently = " concurrently" if build["concurrently"] else ""
+        print(
+            f"  built {build['index']}{concurrently} in {build['build_seconds']}s "
+            f"({build['parallel_workers']} parallel workers, maintenance_work_mem {build['maintenance_work_mem']})"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Measure MMR re-ranking overhead and result diversity against plain top-k search."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+from src.benchmark.diversity import mmr_report
+from src.benchmark.queries import DEFAULT_QUERIES, read_texts
+from src.config import MMR_FETCH_K
+from src.embeddings import get_embeddings_batch
+from src.retrievers import OrgsRetriever, ToolsRetriever
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries-file", help="JSONL queries (default: example queries)")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--fetch-k", type=int, default=MMR_FETCH_K, help="MMR candidate pool size")
+    parser.add_argument("--lambdas", type=float, nargs="+", default=[0.5, 0.7])
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the query set")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    queries = read_texts(args.queries_file) if args.queries_file else DEFAULT_QUERIES
+    print(f"Embedding {len(queries)} queries...")
+    embeddings = get_embeddings_batch(queries)
+
+    reports = [
+        mmr_report(
+            retriever_cls, embeddings, k=args.k, fetch_k=args.fetch_k,
+            lambdas=tuple(args.lambdas), repeat=args.repeat
+        )
+        for retriever_cls in (ToolsRetriever, OrgsRetriever)
+    ]
+
+    for report in reports:
+        print(f"\n{report['table']} (k={report['k']}, fetch_k={report['fetch_k']})")
+        print(f"  {'stage':<12} {'p50 ms':>8} {'select us':>10} {'relevance':>10} {'redundancy':>11} {'overlap':>8}")
+        baseline = report["baseline"]
+        print(
+            f"  {'top-k':<12} {baseline['latency']['p50_ms']:>8.3f} {'-':>10} "
+            f"{baseline['mean_similarity']:>10} {baseline['intra_list_similarity']:>11} {'-':>8}"
+        )
+        print(f"  {'pool':<12} {report['pool_latency']['p50_ms']:>8.3f}")
+        for lambda_mult, stats in report["mmr"].items():
+            print(
+                f"  {'mmr ' + lambda_mult:<12} {stats['latency']['p50_ms']:>8.3f} {stats['select_us']:>10} "
+                f"{stats['mean_similarity']:>10} {stats['intra_list_similarity']:>11} "
+                f"{stats['overlap_with_baseline']:>8}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"k": args.k, "queries": len(queries), "tables": reports}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Benchmark quantized (halfvec / binary) candidate search with exact re-ranking."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+import numpy as np
+
+from src.benchmark.quantization import quantization_report
+from src.benchmark.queries import DEFAULT_QUERIES, read_texts
+from src.db.models.base import engine
+from src.db.schema import QUANTIZED_EXPRESSIONS, create_quantized_indexes
+from src.embeddings import get_embeddings_batch
+from src.retrievers import OrgsRetriever, ToolsRetriever
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries-file", help="JSONL queries (default: example queries)")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--rerank-candidates", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query set")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    query_texts = read_texts(args.queries_file) if args.queries_file else DEFAULT_QUERIES
+    print(f"Embedding {len(query_texts)} queries...")
+    queries = np.asarray(get_embeddings_batch(query_texts), dtype=np.float32)
+
+    # init_schema only builds the configured mode's index; compare all of them
+    with engine.connect() as conn:
+        create_quantized_indexes(conn, queries.shape[1], tuple(QUANTIZED_EXPRESSIONS))
+        conn.commit()
+
+    reports = [
+        quantization_report(
+            retriever_cls, queries, k=args.k,
+            rerank_candidates=args.rerank_candidates, repeat=args.repeat
+        )
+        for retriever_cls in (ToolsRetriever, OrgsRetriever)
+    ]
+
+    for report in reports:
+        print(f"\n{report['table']} ({report['rows']} rows)")
+        for index, size in report["index_bytes"].items():
+            print(f"  {index:<32} {size / 1024:>10.1f} KiB")
+        print(f"  {'mode':<8} {'p50 ms':>8} {'p99 ms':>8} {'recall@' + str(args.k):>10}")
+        for mode, stats in report["modes"].items():
+            if "error" in stats:
+                print(f"  {mode:<8} error: {stats['error']}")
+                continue
+            print(f"  {mode:<8} {stats['p50_ms']:>8.3f} {stats['p99_ms']:>8.3f} "
+                  f"{stats[f'recall@{args.k}']:>10.4f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"k": args.k, "rerank_candidates": args.rerank_candidates,
+                       "tables": reports}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,7 @@ sys.path.insert(0, ".")
 
 from src.retrievers.tools_retriever import ToolsRetriever
 from src.retrievers.orgs_retriever import OrgsRetriever
-from src.embeddings.openai_embed import get_embedding
+from src.embeddings import get_embedding
 
 
 def print_org_results(results: list[dict], query: str):
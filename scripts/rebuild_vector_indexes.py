@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""Rebuild the embedding indexes (re-clustering IVFFlat lists) after large data changes or an index type switch."""
+
+import argparse
+import sys
+sys.path.insert(0, ".")
+
+from src.config import IVFFLAT_LISTS, VECTOR_INDEX_TYPE
+from src.db.schema import VECTOR_INDEX_TYPES, VECTOR_INDEXES, rebuild_vector_indexes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--type", choices=VECTOR_INDEX_TYPES, default=VECTOR_INDEX_TYPE,
+                        help="Index type to build (default: VECTOR_INDEX_TYPE)")
+    parser.add_argument("--lists", type=int, default=IVFFLAT_LISTS,
+                        help="IVFFlat lists (default: IVFFLAT_LISTS, else derived from row count)")
+    parser.add_argument("--tables", nargs="+", choices=list(VECTOR_INDEXES), default=list(VECTOR_INDEXES))
+    parser.add_argument("--concurrently", action="store_true",
+                        help="Build without blocking writes (CREATE INDEX CONCURRENTLY)")
+    args = parser.parse_args()
+
+    for result in rebuild_vector_indexes(args.type, args.lists, args.tables, args.concurrently):
+        lists = f", {result['lists']} lists" if result["lists"] else ""
+        print(
+            f"{result['index']} on {result['table']}: {result['type']}{lists} in {result['build_seconds']}s "
+            f"({result['parallel_workers']} parallel workers, maintenance_work_mem {result['maintenance_work_mem']})"
+        )
+
+
+if __name__ == "__main__":
+    main()
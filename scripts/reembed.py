@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Re-embed the vector tables into a new embedding model without downtime: start, run, status, flip, finish."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+from src.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_MODEL,
+    REEMBED_BATCH_SIZE,
+    REEMBED_ROWS_PER_SECOND,
+)
+from src.seed.reembed import (
+    abort_reembed,
+    finish_reembed,
+    flip_embeddings,
+    job_status,
+    run_reembed,
+    start_reembed,
+)
+
+
+def print_status(status: list[dict]) -> None:
+    if not status:
+        print("No re-embedding job")
+    for job in status:
+        rate = f", {job['rows_per_second']} rows/s" if job["rows_per_second"] else ""
+        eta = f", ~{job['eta_seconds']:.0f}s left" if job["eta_seconds"] else ""
+        index = "" if job["shadow_index"] else ", shadow index not built"
+        print(
+            f"{job['table']}: {job['status']} -> {'/'.join(map(str, job['embedding']))}, "
+            f"{job['covered']}/{job['rows']} rows ({job['coverage']:.1%}){rate}{eta}{index}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    start = commands.add_parser("start", help="Add the shadow columns for a new embedding")
+    start.add_argument("--backend", choices=["openai", "local"], default=EMBEDDING_BACKEND)
+    start.add_argument("--model", default=EMBEDDING_MODEL)
+    start.add_argument("--dimensions", type=int, default=EMBEDDING_DIMENSIONS)
+    run = commands.add_parser("run", help="Fill the shadow columns (resumes where it stopped)")
+    run.add_argument("--batch-size", type=int, default=REEMBED_BATCH_SIZE)
+    run.add_argument("--rows-per-second", type=float, default=REEMBED_ROWS_PER_SECOND,
+                     help="Throughput cap (0 = unthrottled)")
+    run.add_argument("--flip", action="store_true", help="Flip as soon as every table is ready")
+    commands.add_parser("status", help="Coverage, throughput and time left")
+    commands.add_parser("flip", help="Switch searches to the shadow columns")
+    commands.add_parser("finish", help="Drop the previous vectors once the config names the new embedding")
+    commands.add_parser("abort", help="Drop an unflipped job's shadow columns")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "start":
+            report = start_reembed(args.backend, args.model, args.dimensions)
+            print_status(report)
+        elif args.command == "run":
+            report = {"runs": run_reembed(args.batch_size, args.rows_per_second)}
+            for result in report["runs"]:
+                print(
+                    f"{result['table']}: {result['rows']} rows in {result['seconds']}s "
+                    f"({result['rows_per_second']} rows/s)"
+                )
+            if args.flip:
+                report["flip"] = flip_embeddings()
+                flip = report["flip"]
+                print(f"Flipped from {flip['from']} to {flip['to']} in {flip['seconds']}s")
+        elif args.command == "status":
+            report = job_status()
+            print_status(report)
+        elif args.command == "flip":
+            report = flip_embeddings()
+            print(f"Flipped from {report['from']} to {report['to']} in {report['seconds']}s")
+            print("Set EMBEDDING_BACKEND/EMBEDDING_MODEL/EMBEDDING_DIMENSIONS to match, then run `finish`")
+        elif args.command == "finish":
+            report = finish_reembed()
+            print(f"Finished: {', '.join(report['tables'])} hold {report['embedding']}")
+        else:
+            report = abort_reembed()
+            print(f"Aborted: {', '.join(report['aborted']) or 'no job'}")
+    except ValueError as e:
+        sys.exit(str(e))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
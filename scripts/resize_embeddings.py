@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+"""Resize vector columns to EMBEDDING_DIMENSIONS (clears embeddings; re-seed afterwards)."""
+
+import sys
+sys.path.insert(0, ".")
+
+from src.config import EMBEDDING_DIMENSIONS
+from src.db.schema import check_embedding_dimensions, resize_embedding_columns
+
+if __name__ == "__main__":
+    if check_embedding_dimensions():
+        print(f"Embedding columns already vector({EMBEDDING_DIMENSIONS}).")
+    else:
+        print(f"Resizing embedding columns to vector({EMBEDDING_DIMENSIONS})...")
+        resize_embedding_columns(EMBEDDING_DIMENSIONS)
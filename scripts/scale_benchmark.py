@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""Benchmark ingest, index build, search latency, QPS and recall on synthetic corpora of any size."""
+
+import argparse
+import json
+import subprocess
+import sys
+from datetime import datetime, timezone
+sys.path.insert(0, ".")
+
+from src.benchmark.scale import scale_report
+from src.benchmark.synthetic import synthetic_queries
+from src.config import EMBEDDING_DIMENSIONS, HNSW_M, HNSW_EF_CONSTRUCTION, LOCAL_EMBEDDING_WORKERS
+from src.db.schema import VECTOR_INDEX_TYPES
+from src.embeddings.local_embed import LocalEmbedder
+from src.retrievers import OrgsRetriever, ToolsRetriever
+
+RETRIEVERS = {"tools": ToolsRetriever, "orgs": OrgsRetriever}
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tables", nargs="+", choices=list(RETRIEVERS), default=list(RETRIEVERS))
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000],
+                        help="Corpus sizes to run, e.g. 10000 100000 1000000")
+    parser.add_argument("--num-queries", type=int, default=100)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--index-types", nargs="+", choices=VECTOR_INDEX_TYPES, default=["hnsw"],
+                        help="Indexes to build and compare on the same rows")
+    parser.add_argument("--ef-search", type=int, help="hnsw.ef_search (default: server setting)")
+    parser.add_argument("--lists", type=int, help="IVFFlat lists (default: derived from row count)")
+    parser.add_argument("--probes", type=int, nargs="+", default=[10], help="ivfflat.probes values to run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8],
+                        help="Thread counts for the QPS runs (at most the engine pool size, 15)")
+    parser.add_argument("--searches", type=int, default=1000, help="Searches per QPS run")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Rows generated and copied at a time")
+    parser.add_argument("--dimensions", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--workers", type=int, default=LOCAL_EMBEDDING_WORKERS,
+                        help="Local embedding worker processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep the bench_ tables afterwards")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    embedder = LocalEmbedder(dimensions=args.dimensions, workers=args.workers)
+    queries = synthetic_queries(args.num_queries, args.seed)
+    runs = []
+    try:
+        for rows in args.rows:
+            for name in args.tables:
+                print(f"\n{RETRIEVERS[name].table}: {rows} rows")
+                report = scale_report(
+                    RETRIEVERS[name], rows, queries, embedder, k=args.k, ef_search=args.ef_search,
+                    concurrency=tuple(args.concurrency), searches=args.searches,
+                    chunk_size=args.chunk_size, seed=args.seed, keep=args.keep,
+                    index_types=tuple(args.index_types), lists=args.lists, probes=tuple(args.probes)
+                )
+                runs.append(report)
+                ingest = report["ingest"]
+                print(
+                    f"  ingest: {ingest['rows_per_second']} rows/s "
+                    f"(COPY {ingest['copy_rows_per_second']} rows/s)"
+                )
+                for index in report["indexes"]:
+                    lists = f" ({index['lists']} lists)" if index["lists"] else ""
+                    print(
+                        f"  {index['type']}{lists} build: {index['build_seconds']}s, "
+                        f"{index['bytes'] / 2**20:.1f} MiB"
+                    )
+                    for scan in index["scans"]:
+                        setting = ", ".join(f"{key} {scan[key]}" for key in ("ef_search", "probes") if key in scan)
+                        search = scan["search"]
+                        print(
+                            f"    {setting}: p50 {search['latency']['p50_ms']} ms, "
+                            f"p95 {search['latency']['p95_ms']} ms, p99 {search['latency']['p99_ms']} ms, "
+                            f"recall@{args.k} {search[f'recall@{args.k}']}"
+                        )
+                        for point in scan["throughput"]:
+                            print(
+                                f"    {point['concurrency']:>3} threads: {point['qps']} q/s, "
+                                f"p95 {point['latency']['p95_ms']} ms"
+                            )
+    finally:
+        embedder.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "git_commit": git_commit(),
+                "config": {
+                    "dimensions": args.dimensions,
+                    "k": args.k,
+                    "queries": args.num_queries,
+                    "index_types": args.index_types,
+                    "ef_search": args.ef_search,
+                    "lists": args.lists,
+                    "probes": args.probes,
+                    "hnsw_m": HNSW_M,
+                    "hnsw_ef_construction": HNSW_EF_CONSTRUCTION,
+                    "seed": args.seed,
+                },
+                "runs": runs,
+            }, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
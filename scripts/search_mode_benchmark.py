@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Benchmark hybrid (full-text + vector RRF) search latency against vector-only search."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+from src.benchmark.queries import DEFAULT_QUERIES, read_texts
+from src.benchmark.search_modes import search_mode_report
+from src.embeddings import get_embeddings_batch
+from src.retrievers import OrgsRetriever, ToolsRetriever
+
+NAME_QUERIES = ["Lexicomp", "UpToDate", "Epic Sepsis Model", "Mayo Clinic"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries-file", help="JSONL queries (default: example + name queries)")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5, help="Passes over the query set")
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    queries = read_texts(args.queries_file) if args.queries_file else DEFAULT_QUERIES + NAME_QUERIES
+    print(f"Embedding {len(queries)} queries...")
+    embeddings = get_embeddings_batch(queries)
+
+    reports = [
+        search_mode_report(retriever_cls, queries, embeddings, k=args.k, repeat=args.repeat)
+        for retriever_cls in (ToolsRetriever, OrgsRetriever)
+    ]
+
+    for report in reports:
+        print(f"\n{report['table']} (top-1 agreement: {report.get('top1_agreement', '-')})")
+        print(f"  {'mode':<8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+        for mode, stats in report["modes"].items():
+            print(f"  {mode:<8} {stats['p50_ms']:>8.3f} {stats['p95_ms']:>8.3f} {stats['p99_ms']:>8.3f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"k": args.k, "queries": len(queries), "tables": reports}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,22 @@
 #!/usr/bin/env python3
-"""Seed database with clinical healthcare data."""
+"""Seed database with clinical healthcare data (incremental; safe to re-run)."""
 
+import argparse
 import sys
 sys.path.insert(0, ".")
 
 from src.seed.run_seed import run_seed
 
 if __name__ == "__main__":
-    run_seed()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reembed", action="store_true",
+                        help="Re-embed every row, e.g. after switching EMBEDDING_BACKEND")
+    parser.add_argument("--defer-indexes", action="store_true",
+                        help="Drop the embedding indexes during the load and build them afterwards")
+    args = parser.parse_args()
+    for report in run_seed(reembed=args.reembed, defer_indexes=args.defer_indexes):
+        print(
+            f"{report['table']}: {report['inserted']} inserted, {report['updated']} updated "
+            f"({report['embedded']} embedded), {report['unchanged']} unchanged, "
+            f"{report['deleted']} deleted in {report['seconds']}s"
+        )
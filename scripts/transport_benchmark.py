@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Per-search client CPU, latency and bytes on the wire for list, text-literal and binary query vectors."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+from src.benchmark.queries import DEFAULT_QUERIES, read_texts
+from src.benchmark.transport import TRANSPORTS, transport_report
+from src.config import DATABASE_URL
+from src.embeddings import get_embeddings_batch
+from src.retrievers import OrgsRetriever, ToolsRetriever
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries-file", help="JSONL queries (default: example queries)")
+    parser.add_argument("--num-queries", type=int, default=500,
+                        help="Searches per transport, cycling through the queries")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--transports", nargs="+", choices=list(TRANSPORTS), default=list(TRANSPORTS))
+    parser.add_argument("--output", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    queries = read_texts(args.queries_file) if args.queries_file else DEFAULT_QUERIES
+    vectors = get_embeddings_batch(queries)
+    embeddings = [vectors[i % len(vectors)] for i in range(args.num_queries)]
+
+    reports = {}
+    for retriever_cls in (ToolsRetriever, OrgsRetriever):
+        report = transport_report(
+            retriever_cls(embed_fn=None), DATABASE_URL, embeddings,
+            k=args.k, warmup=args.warmup, transports=tuple(args.transports)
+        )
+        reports[retriever_cls.table] = report
+        print(f"{retriever_cls.table} ({report['dimensions']} dims, {report['queries']} searches):")
+        for name, result in report["transports"].items():
+            print(
+                f"  {name:>6}: sent {result['bytes_sent_per_query']} B, "
+                f"received {result['bytes_received_per_query']} B, "
+                f"client CPU {result['client_cpu_us']} us (encode {result['encode_us']} us), "
+                f"p50 {result['latency']['p50_ms']} ms, "
+                f"identical results {result['identical_results']:.1%}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"k": args.k, "tables": reports}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
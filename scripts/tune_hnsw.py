@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Sweep hnsw.ef_search, record the recall/latency curve and recommend search profiles."""
+
+import argparse
+import json
+import sys
+sys.path.insert(0, ".")
+
+import numpy as np
+
+from src.benchmark.corpus import load_vectors
+from src.benchmark.hnsw_tuning import DEFAULT_EF_VALUES, ef_search_sweep, recommend_ef_search
+from src.benchmark.queries import DEFAULT_QUERIES, read_texts
+from src.config import HNSW_M, HNSW_EF_CONSTRUCTION
+from src.embeddings import get_embeddings_batch
+from src.retrievers import OrgsRetriever, ToolsRetriever
+
+
+def sample_stored_queries(count: int, seed: int = 0) -> np.ndarray:
+    """Use stored embeddings as queries when there is no query log."""
+    matrices = [load_vectors(cls.table)[1] for cls in (ToolsRetriever, OrgsRetriever)]
+    vectors = np.vstack([m for m in matrices if len(m)])
+    rng = np.random.default_rng(seed)
+    return vectors[rng.choice(len(vectors), size=min(count, len(vectors)), replace=False)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries-file", help="JSONL queries (default: example queries)")
+    parser.add_argument("--sample-queries", type=int, default=0,
+                        help="Also use N stored embeddings as queries")
+    parser.add_argument("--ef-values", default=",".join(str(ef) for ef in DEFAULT_EF_VALUES))
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="Passes over the query set")
+    parser.add_argument("--fast-recall", type=float, default=0.95)
+    parser.add_argument("--accurate-recall", type=float, default=0.99)
+    parser.add_argument("--output", help="Write JSON curve to this path")
+    args = parser.parse_args()
+
+    query_texts = read_texts(args.queries_file) if args.queries_file else DEFAULT_QUERIES
+    print(f"Embedding {len(query_texts)} queries...")
+    queries = np.asarray(get_embeddings_batch(query_texts), dtype=np.float32)
+    if args.sample_queries:
+        queries = np.vstack([queries, sample_stored_queries(args.sample_queries)])
+
+    ef_values = [int(ef) for ef in args.ef_values.split(",")]
+    sweeps = [
+        ef_search_sweep(retriever_cls, queries, ef_values, k=args.k, repeat=args.repeat)
+        for retriever_cls in (ToolsRetriever, OrgsRetriever)
+    ]
+
+    recall_key = f"recall@{args.k}"
+    for sweep in sweeps:
+        print(f"\n{sweep['table']} ({sweep['rows']} rows, m={HNSW_M}, ef_construction={HNSW_EF_CONSTRUCTION})")
+        print(f"  {'ef_search':>9} {recall_key:>10} {'p50 ms':>8} {'p99 ms':>8}")
+        for point in sweep["curve"]:
+            print(f"  {point['ef_search']:>9} {point[recall_key]:>10.4f} "
+                  f"{point['p50_ms']:>8.3f} {point['p99_ms']:>8.3f}")
+
+    recommended = {
+        "HNSW_EF_SEARCH_FAST": max(
+            recommend_ef_search(s["curve"], args.fast_recall, args.k) for s in sweeps
+        ),
+        "HNSW_EF_SEARCH_ACCURATE": max(
+            recommend_ef_search(s["curve"], args.accurate_recall, args.k) for s in sweeps
+        ),
+    }
+    print(f"\nRecommended profiles: {recommended}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "hnsw": {"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION},
+                "queries": len(queries),
+                "targets": {"fast": args.fast_recall, "accurate": args.accurate_recall},
+                "recommended": recommended,
+                "tables": sweeps,
+            }, f, indent=2)
+        print(f"Curve written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
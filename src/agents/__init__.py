@@ -3,10 +3,13 @@ from src.agents.graph import create_clinical_graph
 from src.agents.tools import (
     search_clinical_tools,
     search_healthcare_orgs,
+    search_clinical_tools_many,
+    search_healthcare_orgs_many,
     search_clinical_workflow,
     CLINICAL_TOOLS,
     ToolSearchInput,
     OrgSearchInput,
+    MultiQuerySearchInput,
     CombinedSearchInput,
 )
 
@@ -16,9 +19,12 @@ __all__ = [
     "create_clinical_graph",
     "search_clinical_tools",
     "search_healthcare_orgs",
+    "search_clinical_tools_many",
+    "search_healthcare_orgs_many",
     "search_clinical_workflow",
     "CLINICAL_TOOLS",
     "ToolSearchInput",
     "OrgSearchInput",
+    "MultiQuerySearchInput",
     "CombinedSearchInput",
 ]
@@ -2,11 +2,30 @@ from typing import Literal
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
 
-from src.config import OPENAI_API_KEY
+from src.config import (
+    OPENAI_API_KEY,
+    RETRIEVER_BACKEND,
+    SEARCH_PROFILES,
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSIONS,
+    MMR_LAMBDA,
+    MMR_FETCH_K,
+    VECTOR_INDEX_TYPE,
+)
 from src.logger import get_logger
-from src.embeddings.openai_embed import get_embedding
-from src.retrievers import ToolsRetriever, OrgsRetriever
+from src.embeddings import get_embedding
+from src.embeddings.context import embedding_scope
+from src.retrievers import (
+    ToolsRetriever,
+    OrgsRetriever,
+    CombinedRetriever,
+    MemoryRetriever,
+    retrieval_cache,
+)
+from src.retrievers.pgvector_retriever import profile_settings
 
+from src.agents.semantic_cache import SemanticCache, SemanticCachedGraph
 from src.agents.state import AgentState, GraphState, default_confidence
 from src.agents.supervisor import SupervisorAgent
 from src.agents.tool_finder import ToolFinderAgent
@@ -23,8 +42,27 @@ def calc_overall_confidence(confidence: dict) -> float:
     return round(total, 3)
 
 
-def create_clinical_graph(llm=None, checkpointer=None):
-    """Create the clinical decision support multi-agent graph."""
+def create_clinical_graph(
+    llm=None,
+    checkpointer=None,
+    search_profile: str = "fast",
+    semantic_cache: SemanticCache | None = None,
+    mmr_lambda: dict[str, float | None] | None = None
+):
+    """Create the clinical decision support multi-agent graph.
+    
+    search_profile selects the HNSW ef_search (or IVFFlat probes) used by the
+    retrievers ("fast" or "accurate").
+    mmr_lambda maps agent name to its MMR diversity setting (default MMR_LAMBDA).
+    With a semantic_cache, the compiled graph is wrapped so paraphrases of an
+    earlier query are answered from the cache.
+    """
+    if search_profile not in SEARCH_PROFILES:
+        raise ValueError(
+            f"Unknown search profile '{search_profile}'; expected one of {sorted(SEARCH_PROFILES)}"
+        )
+    scan_settings = profile_settings(search_profile)
+    mmr_lambda = {**MMR_LAMBDA, **(mmr_lambda or {})}
     
     if llm is None:
         llm = ChatOpenAI(
@@ -33,16 +71,34 @@ def create_clinical_graph(llm=None, checkpointer=None):
             temperature=0
         )
     
-    tools_retriever = ToolsRetriever(embed_fn=get_embedding)
-    orgs_retriever = OrgsRetriever(embed_fn=get_embedding)
+    def make_retriever(source, agent: str):
+        if RETRIEVER_BACKEND == "memory":
+            return MemoryRetriever(embed_fn=get_embedding, source=source, mmr_lambda=mmr_lambda[agent])
+        return source(
+            embed_fn=get_embedding,
+            **scan_settings,
+            result_cache=retrieval_cache,
+            mmr_lambda=mmr_lambda[agent]
+        )
+    
+    advisor_tools = make_retriever(ToolsRetriever, "workflow_advisor")
+    advisor_orgs = make_retriever(OrgsRetriever, "workflow_advisor")
+    combined_retriever = None
+    # The combined query has no MMR stage, so diversified searches go table by table
+    if RETRIEVER_BACKEND != "memory" and mmr_lambda["workflow_advisor"] is None:
+        combined_retriever = CombinedRetriever(
+            embed_fn=get_embedding,
+            retrievers={"tools": advisor_tools, "orgs": advisor_orgs}
+        )
     
     supervisor = SupervisorAgent(llm=llm)
-    tool_finder = ToolFinderAgent(retriever=tools_retriever, llm=llm)
-    org_matcher = OrgMatcherAgent(retriever=orgs_retriever, llm=llm)
+    tool_finder = ToolFinderAgent(retriever=make_retriever(ToolsRetriever, "tool_finder"), llm=llm)
+    org_matcher = OrgMatcherAgent(retriever=make_retriever(OrgsRetriever, "org_matcher"), llm=llm)
     workflow_advisor = WorkflowAdvisorAgent(
-        tools_retriever=tools_retriever,
-        orgs_retriever=orgs_retriever,
-        llm=llm
+        tools_retriever=advisor_tools,
+        orgs_retriever=advisor_orgs,
+        llm=llm,
+        combined_retriever=combined_retriever
     )
     
     def supervisor_node(state: GraphState) -> dict:
@@ -55,7 +111,8 @@ def create_clinical_graph(llm=None, checkpointer=None):
     
     def tool_finder_node(state: GraphState) -> dict:
         agent_state = AgentState.from_graph_state(state)
-        result = tool_finder.run(agent_state)
+        with embedding_scope():
+            result = tool_finder.run(agent_state)
         conf = {**state.get("confidence", default_confidence()), **result.confidence}
         conf["overall"] = calc_overall_confidence(conf)
         return {
@@ -66,7 +123,8 @@ def create_clinical_graph(llm=None, checkpointer=None):
     
     def org_matcher_node(state: GraphState) -> dict:
         agent_state = AgentState.from_graph_state(state)
-        result = org_matcher.run(agent_state)
+        with embedding_scope():
+            result = org_matcher.run(agent_state)
         conf = {**state.get("confidence", default_confidence()), **result.confidence}
         conf["overall"] = calc_overall_confidence(conf)
         return {
@@ -77,7 +135,8 @@ def create_clinical_graph(llm=None, checkpointer=None):
     
     def workflow_advisor_node(state: GraphState) -> dict:
         agent_state = AgentState.from_graph_state(state)
-        result = workflow_advisor.run(agent_state)
+        with embedding_scope():
+            result = workflow_advisor.run(agent_state)
         conf = {**state.get("confidence", default_confidence()), **result.confidence}
         conf["overall"] = calc_overall_confidence(conf)
         return {
@@ -115,6 +174,22 @@ def create_clinical_graph(llm=None, checkpointer=None):
     
     if checkpointer:
         logger.info("Compiling graph with checkpointer")
-        return graph.compile(checkpointer=checkpointer)
+        compiled = graph.compile(checkpointer=checkpointer)
+    else:
+        compiled = graph.compile()
+    
+    if semantic_cache is None:
+        return compiled
     
-    return graph.compile()
+    namespace = SemanticCache.namespace({
+        "llm": getattr(llm, "model_name", type(llm).__name__),
+        "search_profile": search_profile,
+        "vector_index": VECTOR_INDEX_TYPE,
+        "retriever_backend": RETRIEVER_BACKEND,
+        "embedding_backend": EMBEDDING_BACKEND,
+        "embedding_model": EMBEDDING_MODEL,
+        "dimensions": EMBEDDING_DIMENSIONS,
+        "mmr": [mmr_lambda, MMR_FETCH_K],
+    })
+    logger.info(f"Semantic answer cache enabled (threshold {semantic_cache.threshold})")
+    return SemanticCachedGraph(compiled, semantic_cache, namespace)
@@ -0,0 +1,310 @@
+"""Semantic cache of final graph answers, matched by query embedding similarity."""
+
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Iterator
+
+from sqlalchemy import text
+
+from src.config import (
+    FILTER_FALLBACK_EF_SEARCH,
+    SEMANTIC_CACHE,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL_SECONDS,
+    SEMANTIC_CACHE_MAX_ENTRIES,
+)
+from src.db.models.base import engine, pgvector_version
+from src.embeddings import get_embedding
+from src.embeddings.context import embedding_scope, scoped_embedding
+from src.retrievers.pgvector_retriever import query_vector, set_ef_search
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+ANSWER_FIELDS = ("route", "response", "tools_results", "orgs_results", "confidence")
+
+# Versions only grow, so their sum changes whenever any vector table is written.
+CORPUS_VERSION_SQL = "SELECT coalesce(sum(version), 0)::bigint FROM corpus_versions"
+
+
+@dataclass
+class SemanticCacheStats:
+    """Per-process counters for the semantic answer cache."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    errors: int = 0
+    hit_seconds: float = 0.0
+    miss_seconds: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+            "hit_rate": round(self.hit_rate, 4),
+            "avg_hit_ms": round(1000 * self.hit_seconds / self.hits, 2) if self.hits else None,
+            "avg_miss_ms": round(1000 * self.miss_seconds / self.misses, 2) if self.misses else None,
+        }
+
+
+class SemanticCache:
+    """
+    Final graph answers in the UNLOGGED semantic_cache table, looked up by
+    nearest query embedding through an HNSW cosine index.
+
+    A lookup hits when the closest live entry in the namespace is at least
+    threshold similar. Entries expire after their TTL, and each records the
+    corpus version (sum of corpus_versions) read before its graph run, so any
+    write to a vector table invalidates every cached answer. Cache failures are
+    logged and fall through to the graph.
+    """
+
+    _pgvector_version: tuple[int, ...] | None = None
+
+    def __init__(
+        self,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+        prune_every: int = 100
+    ):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._stats = SemanticCacheStats()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def namespace(settings: dict) -> str:
+        """Namespace for a graph configuration; answers are only shared within one."""
+        payload = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> SemanticCacheStats:
+        """Snapshot of the cache counters."""
+        with self._lock:
+            return SemanticCacheStats(**asdict(self._stats))
+
+    def lookup(self, namespace: str, embedding: list[float]) -> tuple[int | None, dict | None]:
+        """Current corpus version and the closest live answer within the threshold, if any."""
+        try:
+            with engine.connect() as conn:
+                version = conn.execute(text(CORPUS_VERSION_SQL)).scalar()
+                self._widen_scan(conn)
+                row = conn.execute(text("""
+                    SELECT query, route, response, tools_results, orgs_results, confidence,
+                           1 - (embedding <=> CAST(:vec AS vector)) AS similarity
+                    FROM semantic_cache
+                    WHERE namespace = :namespace
+                      AND corpus_version = :version
+                      AND expires_at > now()
+                    ORDER BY embedding <=> CAST(:vec AS vector)
+                    LIMIT 1
+                """), {
+                    "vec": query_vector(embedding),
+                    "namespace": namespace,
+                    "version": version,
+                }).first()
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            self._count("errors")
+            return None, None
+        if row is None or row.similarity < self.threshold:
+            if row is not None:
+                logger.debug(f"Semantic cache near miss ({row.similarity:.3f}): '{row.query[:50]}...'")
+            return version, None
+        logger.info(f"Semantic cache hit ({row.similarity:.3f}) on: '{row.query[:50]}...'")
+        return version, {field: getattr(row, field) for field in ANSWER_FIELDS}
+
+    def _widen_scan(self, conn) -> None:
+        """
+        Keep the HNSW scan going until an entry passes the namespace, version
+        and expiry filters, for this transaction only. Strict order, since the
+        lookup takes just the nearest row; pgvector < 0.8 gets a wider ef_search.
+        """
+        if SemanticCache._pgvector_version is None:
+            SemanticCache._pgvector_version = pgvector_version(conn)
+        if SemanticCache._pgvector_version >= (0, 8):
+            conn.execute(text("SELECT set_config('hnsw.iterative_scan', 'strict_order', true)"))
+        else:
+            set_ef_search(conn, FILTER_FALLBACK_EF_SEARCH)
+
+    def store(
+        self,
+        namespace: str,
+        query: str,
+        embedding: list[float],
+        version: int,
+        answer: dict,
+        ttl_seconds: float | None = None
+    ) -> None:
+        """Cache an answer computed at a corpus version, pruning dead entries periodically."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("""
+                    INSERT INTO semantic_cache (
+                        namespace, query, embedding, route, response,
+                        tools_results, orgs_results, confidence, corpus_version, created_at, expires_at
+                    )
+                    VALUES (
+                        :namespace, :query, CAST(:vec AS vector), :route, :response,
+                        CAST(:tools_results AS jsonb), CAST(:orgs_results AS jsonb),
+                        CAST(:confidence AS jsonb), :version, now(), now() + make_interval(secs => :ttl)
+                    )
+                """), {
+                    "namespace": namespace,
+                    "query": query,
+                    "vec": query_vector(embedding),
+                    "route": answer.get("route"),
+                    "response": answer.get("response", ""),
+                    "tools_results": json.dumps(answer.get("tools_results", []), default=str),
+                    "orgs_results": json.dumps(answer.get("orgs_results", []), default=str),
+                    "confidence": json.dumps(answer.get("confidence", {}), default=str),
+                    "version": version,
+                    "ttl": ttl,
+                })
+                writes = self._count("writes")
+                if writes % self.prune_every == 0:
+                    self.prune(conn)
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Semantic cache write failed: {e}")
+            self._count("errors")
+
+    def prune(self, conn) -> int:
+        """Delete expired entries, entries from older corpus versions and the oldest beyond max_entries."""
+        dead = conn.execute(text(f"""
+            DELETE FROM semantic_cache
+            WHERE expires_at <= now()
+               OR corpus_version < ({CORPUS_VERSION_SQL})
+        """)).rowcount or 0
+        overflow = conn.execute(text("""
+            DELETE FROM semantic_cache
+            WHERE id IN (
+                SELECT id FROM semantic_cache
+                ORDER BY created_at DESC
+                OFFSET :max_entries
+            )
+        """), {"max_entries": self.max_entries}).rowcount or 0
+        if dead or overflow:
+            logger.info(f"Pruned semantic cache: {dead} expired or stale, {overflow} over capacity")
+        return dead + overflow
+
+    def namespace_stats(self) -> list[dict]:
+        """Live and dead entries per namespace."""
+        with engine.connect() as conn:
+            rows = conn.execute(text(f"""
+                WITH v AS (SELECT ({CORPUS_VERSION_SQL}) AS version)
+                SELECT c.namespace,
+                       count(*) FILTER (WHERE c.expires_at > now() AND c.corpus_version = v.version) AS live,
+                       count(*) FILTER (WHERE c.expires_at <= now() OR c.corpus_version <> v.version) AS dead
+                FROM semantic_cache c CROSS JOIN v
+                GROUP BY c.namespace
+                ORDER BY c.namespace
+            """)).fetchall()
+        return [dict(row._mapping) for row in rows]
+
+    def record(self, hit: bool, seconds: float) -> None:
+        """Count a served request and its latency."""
+        with self._lock:
+            if hit:
+                self._stats.hits += 1
+                self._stats.hit_seconds += seconds
+            else:
+                self._stats.misses += 1
+                self._stats.miss_seconds += seconds
+
+    def _count(self, field: str) -> int:
+        with self._lock:
+            value = getattr(self._stats, field) + 1
+            setattr(self._stats, field, value)
+            return value
+
+
+class SemanticCachedGraph:
+    """
+    Compiled graph wrapper that answers from a SemanticCache when a similar
+    query was answered before, and caches the graph's answer otherwise.
+
+    Results carry a cache_hit flag. A hit skips the graph entirely, so a
+    checkpointer records nothing for that turn. Any other attribute is
+    delegated to the compiled graph.
+    """
+
+    def __init__(
+        self,
+        graph,
+        cache: SemanticCache,
+        namespace: str,
+        embed_fn: Callable[[str], list[float]] = get_embedding
+    ):
+        self.graph = graph
+        self.cache = cache
+        self.namespace = namespace
+        self.embed_fn = embed_fn
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
+
+    def invoke(self, state: dict, config: dict | None = None, **kwargs) -> dict:
+        """Cached answer for the state's query, or the graph's result."""
+        started = time.perf_counter()
+        # One scope so the retrievers reuse the query embedding computed for the lookup
+        with embedding_scope():
+            embedding = scoped_embedding(self.embed_fn, state["query"])
+            version, answer = self.cache.lookup(self.namespace, embedding)
+            if answer is not None:
+                self.cache.record(True, time.perf_counter() - started)
+                return {**state, **answer, "cache_hit": True}
+            result = self.graph.invoke(state, config, **kwargs)
+        self._store(state["query"], embedding, version, result)
+        self.cache.record(False, time.perf_counter() - started)
+        return {**result, "cache_hit": False}
+
+    def stream(self, state: dict, config: dict | None = None, **kwargs) -> Iterator[dict]:
+        """Graph updates, or a single semantic_cache update carrying the cached answer."""
+        started = time.perf_counter()
+        # Servers resume each step in a fresh context, so the scope is reopened per step
+        memo = {}
+        with embedding_scope(memo):
+            embedding = scoped_embedding(self.embed_fn, state["query"])
+            version, answer = self.cache.lookup(self.namespace, embedding)
+        if answer is not None:
+            self.cache.record(True, time.perf_counter() - started)
+            yield {"semantic_cache": {**answer, "cache_hit": True}}
+            return
+        final = dict(state)
+        events = iter(self.graph.stream(state, config, **kwargs))
+        while True:
+            with embedding_scope(memo):
+                event = next(events, None)
+            if event is None:
+                break
+            for output in event.values():
+                if isinstance(output, dict):
+                    final.update(output)
+            yield event
+        self._store(state["query"], embedding, version, final)
+        self.cache.record(False, time.perf_counter() - started)
+
+    def _store(self, query: str, embedding: list[float], version: int | None, result: dict) -> None:
+        # Unknown version means the lookup failed; errors and empty answers aren't worth replaying.
+        if version is None or result.get("error") or not result.get("response"):
+            return
+        self.cache.store(self.namespace, query, embedding, version, result)
+
+
+semantic_cache = SemanticCache() if SEMANTIC_CACHE else None
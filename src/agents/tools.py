@@ -1,8 +1,11 @@
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 
-from src.embeddings.openai_embed import get_embedding
-from src.retrievers import ToolsRetriever, OrgsRetriever
+from src.config import QUERY_SEARCH_PROFILE
+from src.embeddings import get_embedding, get_embeddings_batch
+from src.embeddings.context import embedding_scope
+from src.retrievers import ToolsRetriever, OrgsRetriever, retrieval_cache
+from src.retrievers.pgvector_retriever import profile_settings
 from src.logger import get_logger
 
 logger = get_logger(__name__)
@@ -12,12 +15,28 @@ class ToolSearchInput(BaseModel):
     """Input schema for searching clinical tools."""
     query: str = Field(description="Search query for finding clinical decision support tools")
     limit: int = Field(default=5, description="Maximum number of results to return")
+    category: str | None = Field(default=None, description="Only return tools in this category")
+    target_users: list[str] | None = Field(
+        default=None, description="Only return tools for any of these user roles (e.g. physicians)"
+    )
 
 
 class OrgSearchInput(BaseModel):
     """Input schema for searching healthcare organizations."""
     query: str = Field(description="Search query for finding healthcare organizations with AI implementations")
     limit: int = Field(default=5, description="Maximum number of results to return")
+    state: str | None = Field(default=None, description="Only return organizations in this US state (full name)")
+    org_type: str | None = Field(default=None, description="Only return this organization type (e.g. health_system)")
+    specialty: str | None = Field(default=None, description="Only return organizations with this specialty")
+    ai_use_cases: list[str] | None = Field(
+        default=None, description="Only return organizations with any of these AI use cases"
+    )
+
+
+class MultiQuerySearchInput(BaseModel):
+    """Input schema for running several searches at once."""
+    queries: list[str] = Field(description="Search queries, one per topic to look up")
+    limit: int = Field(default=3, description="Maximum number of results per query")
 
 
 class CombinedSearchInput(BaseModel):
@@ -28,7 +47,12 @@ class CombinedSearchInput(BaseModel):
 
 
 @tool(args_schema=ToolSearchInput)
-def search_clinical_tools(query: str, limit: int = 5) -> list[dict]:
+def search_clinical_tools(
+    query: str,
+    limit: int = 5,
+    category: str | None = None,
+    target_users: list[str] | None = None
+) -> list[dict]:
     """
     Search for clinical decision support tools by semantic similarity.
     
@@ -41,23 +65,22 @@ def search_clinical_tools(query: str, limit: int = 5) -> list[dict]:
     """
     logger.info(f"Tool 'search_clinical_tools' called: query='{query[:50]}...', limit={limit}")
     
-    retriever = ToolsRetriever(embed_fn=get_embedding)
-    results = retriever.search(query, limit=limit)
-    return [
-        {
-            "name": r["name"],
-            "category": r["category"],
-            "description": r["description"],
-            "problem_solved": r["problem_solved"],
-            "target_users": r["target_users"],
-            "similarity": round(r["similarity"], 3)
-        }
-        for r in results
-    ]
+    retriever = ToolsRetriever(embed_fn=get_embedding, result_cache=retrieval_cache, **_scan_settings())
+    results = retriever.search(
+        query, limit=limit, filters={"category": category, "target_users": target_users}
+    )
+    return [_format_tool(r) for r in results]
 
 
 @tool(args_schema=OrgSearchInput)
-def search_healthcare_orgs(query: str, limit: int = 5) -> list[dict]:
+def search_healthcare_orgs(
+    query: str,
+    limit: int = 5,
+    state: str | None = None,
+    org_type: str | None = None,
+    specialty: str | None = None,
+    ai_use_cases: list[str] | None = None
+) -> list[dict]:
     """
     Search for healthcare organizations with AI implementations by semantic similarity.
     
@@ -68,20 +91,46 @@ def search_healthcare_orgs(query: str, limit: int = 5) -> list[dict]:
     - Real-world examples of clinical AI
     """
     logger.info(f"Tool 'search_healthcare_orgs' called: query='{query[:50]}...', limit={limit}")
-    retriever = OrgsRetriever(embed_fn=get_embedding)
-    results = retriever.search(query, limit=limit)
-    return [
-        {
-            "name": r["name"],
-            "org_type": r["org_type"],
-            "specialty": r["specialty"],
-            "city": r["city"],
-            "state": r["state"],
-            "ai_use_cases": r["ai_use_cases"],
-            "similarity": round(r["similarity"], 3)
-        }
-        for r in results
-    ]
+    retriever = OrgsRetriever(embed_fn=get_embedding, result_cache=retrieval_cache, **_scan_settings())
+    results = retriever.search(query, limit=limit, filters={
+        "state": state,
+        "org_type": org_type,
+        "specialty": specialty,
+        "ai_use_cases": ai_use_cases,
+    })
+    return [_format_org(r) for r in results]
+
+
+@tool(args_schema=MultiQuerySearchInput)
+def search_clinical_tools_many(queries: list[str], limit: int = 3) -> dict:
+    """
+    Search clinical decision support tools for several queries in one call.
+    
+    Use this tool instead of repeated search_clinical_tools calls when the user
+    asks about several distinct needs at once (e.g. documentation AND drug safety).
+    """
+    logger.info(f"Tool 'search_clinical_tools_many' called: {len(queries)} queries, limit={limit}")
+    retriever = ToolsRetriever(
+        embed_fn=get_embedding, embed_batch_fn=get_embeddings_batch, **_scan_settings()
+    )
+    results = retriever.search_many(queries, limit=limit)
+    return {query: [_format_tool(r) for r in rows] for query, rows in zip(queries, results)}
+
+
+@tool(args_schema=MultiQuerySearchInput)
+def search_healthcare_orgs_many(queries: list[str], limit: int = 3) -> dict:
+    """
+    Search healthcare organizations for several queries in one call.
+    
+    Use this tool instead of repeated search_healthcare_orgs calls when the user
+    asks about several distinct topics at once (e.g. sepsis AND imaging).
+    """
+    logger.info(f"Tool 'search_healthcare_orgs_many' called: {len(queries)} queries, limit={limit}")
+    retriever = OrgsRetriever(
+        embed_fn=get_embedding, embed_batch_fn=get_embeddings_batch, **_scan_settings()
+    )
+    results = retriever.search_many(queries, limit=limit)
+    return {query: [_format_org(r) for r in rows] for query, rows in zip(queries, results)}
 
 
 @tool(args_schema=CombinedSearchInput)
@@ -96,11 +145,12 @@ def search_clinical_workflow(query: str, tools_limit: int = 3, orgs_limit: int =
     - End-to-end clinical AI solutions
     """
     logger.info(f"Tool 'search_clinical_workflow' called: query='{query[:50]}...'")
-    tools_retriever = ToolsRetriever(embed_fn=get_embedding)
-    orgs_retriever = OrgsRetriever(embed_fn=get_embedding)
+    tools_retriever = ToolsRetriever(embed_fn=get_embedding, result_cache=retrieval_cache, **_scan_settings())
+    orgs_retriever = OrgsRetriever(embed_fn=get_embedding, result_cache=retrieval_cache, **_scan_settings())
     
-    tools_results = tools_retriever.search(query, limit=tools_limit)
-    orgs_results = orgs_retriever.search(query, limit=orgs_limit)
+    with embedding_scope():
+        tools_results = tools_retriever.search(query, limit=tools_limit)
+        orgs_results = orgs_retriever.search(query, limit=orgs_limit)
     
     return {
         "tools": [
@@ -124,4 +174,38 @@ def search_clinical_workflow(query: str, tools_limit: int = 3, orgs_limit: int =
     }
 
 
-CLINICAL_TOOLS = [search_clinical_tools, search_healthcare_orgs, search_clinical_workflow]
+def _scan_settings() -> dict:
+    """Index scan settings of the query search profile, as the /search endpoints use."""
+    return profile_settings(QUERY_SEARCH_PROFILE)
+
+
+def _format_tool(r: dict) -> dict:
+    return {
+        "name": r["name"],
+        "category": r["category"],
+        "description": r["description"],
+        "problem_solved": r["problem_solved"],
+        "target_users": r["target_users"],
+        "similarity": round(r["similarity"], 3)
+    }
+
+
+def _format_org(r: dict) -> dict:
+    return {
+        "name": r["name"],
+        "org_type": r["org_type"],
+        "specialty": r["specialty"],
+        "city": r["city"],
+        "state": r["state"],
+        "ai_use_cases": r["ai_use_cases"],
+        "similarity": round(r["similarity"], 3)
+    }
+
+
+CLINICAL_TOOLS = [
+    search_clinical_tools,
+    search_healthcare_orgs,
+    search_clinical_tools_many,
+    search_healthcare_orgs_many,
+    search_clinical_workflow,
+]
@@ -6,6 +6,7 @@ from langchain_core.messages import SystemMessage, HumanMessage
 
 from src.agents.state import AgentState
 from src.retrievers.base import BaseRetriever
+from src.retrievers.combined_retriever import CombinedRetriever
 from src.logger import get_logger
 
 logger = get_logger(__name__)
@@ -40,17 +41,18 @@ class WorkflowAdvisorAgent:
         self, 
         tools_retriever: BaseRetriever, 
         orgs_retriever: BaseRetriever, 
-        llm: BaseChatModel
+        llm: BaseChatModel,
+        combined_retriever: CombinedRetriever | None = None
     ):
         self.tools_retriever = tools_retriever
         self.orgs_retriever = orgs_retriever
         self.llm = llm
+        self.combined_retriever = combined_retriever
     
     def run(self, state: AgentState) -> AgentState:
         """Search both tables and generate comprehensive response."""
         logger.info(f"WorkflowAdvisor processing: '{state.query[:50]}...'")
-        tools_results = self.tools_retriever.search(state.query, limit=3)
-        orgs_results = self.orgs_retriever.search(state.query, limit=3)
+        tools_results, orgs_results = self._search(state.query, limit=3)
         
         state.tools_results = tools_results
         state.orgs_results = orgs_results
@@ -79,6 +81,16 @@ class WorkflowAdvisorAgent:
         
         return state
     
+    def _search(self, query: str, limit: int) -> tuple[list[dict], list[dict]]:
+        """Search both tables, in one round trip when a combined retriever is set."""
+        if self.combined_retriever is not None:
+            results = self.combined_retriever.search(query, limit=limit)
+            return results["tools"], results["orgs"]
+        return (
+            self.tools_retriever.search(query, limit=limit),
+            self.orgs_retriever.search(query, limit=limit),
+        )
+    
     def _calc_retrieval_confidence(
         self, tools: list[dict], orgs: list[dict]
     ) -> float:
@@ -27,6 +27,8 @@ async def lifespan(app: FastAPI):
     logger.info("FastAPI app started")
     yield
     logger.info("FastAPI app shutting down")
+    from src.db.models.base import async_engine
+    await async_engine.dispose()
 
 
 app = FastAPI(
@@ -47,9 +49,11 @@ app.add_middleware(
 from src.api.routes.health import router as health_router
 from src.api.routes.agent import router as agent_router
 from src.api.routes.threads import router as threads_router
+from src.api.routes.search import router as search_router
 
 app.include_router(health_router)
 app.include_router(agent_router, prefix="/api")
 app.include_router(threads_router, prefix="/api")
+app.include_router(search_router, prefix="/api")
 
-logger.info("FastAPI app configured with routes: /health, /api/query, /api/threads")
+logger.info("FastAPI app configured with routes: /health, /api/query, /api/threads, /api/search")
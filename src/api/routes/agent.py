@@ -4,8 +4,10 @@ from fastapi import APIRouter, HTTPException
 from sse_starlette.sse import EventSourceResponse
 
 from src.api.schemas import QueryRequest, QueryResponse, ConfidenceScore
+from src.config import QUERY_SEARCH_PROFILE
 from src.logger import get_logger
 from src.agents.graph import create_clinical_graph
+from src.agents.semantic_cache import semantic_cache
 
 logger = get_logger(__name__)
 
@@ -18,8 +20,10 @@ def get_graph():
     """Lazy initialization of the graph."""
     global _graph
     if _graph is None:
-        logger.info("Initializing clinical graph...")
-        _graph = create_clinical_graph()
+        logger.info(f"Initializing clinical graph (search profile: {QUERY_SEARCH_PROFILE})...")
+        _graph = create_clinical_graph(
+            search_profile=QUERY_SEARCH_PROFILE, semantic_cache=semantic_cache
+        )
         logger.info("Clinical graph initialized")
     return _graph
 
@@ -49,7 +53,8 @@ def query(request: QueryRequest):
         confidence = result.get("confidence", {})
         logger.info(
             f"Query processed: route={result.get('route')}, "
-            f"confidence={confidence.get('overall', 0):.2f}"
+            f"confidence={confidence.get('overall', 0):.2f}, "
+            f"cache_hit={result.get('cache_hit', False)}"
         )
 
         return QueryResponse(
@@ -58,6 +63,7 @@ def query(request: QueryRequest):
             tools_results=result.get("tools_results", []),
             orgs_results=result.get("orgs_results", []),
             confidence=ConfidenceScore(**confidence),
+            cache_hit=result.get("cache_hit", False),
         )
 
     except Exception as e:
@@ -1,6 +1,12 @@
 from fastapi import APIRouter
 
-from src.api.schemas import HealthResponse
+from src.api.schemas import (
+    HealthResponse,
+    EmbeddingMetricsResponse,
+    RetrievalCacheMetricsResponse,
+    SemanticCacheMetricsResponse,
+    ReembedStatusResponse,
+)
 from src.logger import get_logger
 
 logger = get_logger(__name__)
@@ -13,3 +19,50 @@ def health_check():
     """Health check endpoint."""
     logger.info("Health check requested")
     return {"status": "healthy", "service": "clinical-ai-agent"}
+
+
+@router.get("/health/embeddings", response_model=EmbeddingMetricsResponse)
+def embedding_metrics():
+    """Embedding cache hit rates and batching histograms."""
+    from src.embeddings import get_backend
+    backend = get_backend()
+    cache = getattr(backend, "embedding_cache", None)
+    batcher = getattr(backend, "embedding_batcher", None)
+    return {
+        "cache": cache.stats.to_dict() if cache else None,
+        "batcher": batcher.stats() if batcher else None,
+    }
+
+
+@router.get("/health/retrieval-cache", response_model=RetrievalCacheMetricsResponse)
+def retrieval_cache_metrics():
+    """Retrieval result cache hit rate and corpus versions."""
+    from src.retrievers import retrieval_cache
+    if retrieval_cache is None:
+        return {"enabled": False, "stats": None, "tables": None}
+    return {
+        "enabled": True,
+        "stats": retrieval_cache.stats.to_dict(),
+        "tables": retrieval_cache.table_stats(),
+    }
+
+
+@router.get("/health/semantic-cache", response_model=SemanticCacheMetricsResponse)
+def semantic_cache_metrics():
+    """Semantic answer cache hit rate, hit/miss latency and entries per namespace."""
+    from src.agents.semantic_cache import semantic_cache
+    if semantic_cache is None:
+        return {"enabled": False, "stats": None, "namespaces": None}
+    return {
+        "enabled": True,
+        "stats": semantic_cache.stats.to_dict(),
+        "namespaces": semantic_cache.namespace_stats(),
+    }
+
+
+@router.get("/health/reembed", response_model=ReembedStatusResponse)
+def reembed_status():
+    """Re-embedding coverage, throughput and time left per table."""
+    from src.embeddings.spec import active_embedding
+    from src.seed.reembed import job_status
+    return {"active_embedding": list(active_embedding()), "jobs": job_status()}
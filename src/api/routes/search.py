@@ -0,0 +1,48 @@
+"""Direct retrieval endpoints, served natively async."""
+
+from fastapi import APIRouter, HTTPException
+
+from src.api.schemas import SearchRequest, SearchResponse
+from src.config import QUERY_SEARCH_PROFILE
+from src.embeddings import get_embedding
+from src.logger import get_logger
+from src.retrievers import ToolsRetriever, OrgsRetriever, PgVectorRetriever, retrieval_cache
+from src.retrievers.pgvector_retriever import profile_settings
+
+logger = get_logger(__name__)
+
+router = APIRouter()
+
+_retrievers: dict[str, PgVectorRetriever] = {}
+
+
+def get_retriever(source: str) -> PgVectorRetriever:
+    """Lazy initialization of the retrievers."""
+    if not _retrievers:
+        settings = profile_settings(QUERY_SEARCH_PROFILE)
+        _retrievers["tools"] = ToolsRetriever(
+            embed_fn=get_embedding, result_cache=retrieval_cache, **settings
+        )
+        _retrievers["orgs"] = OrgsRetriever(
+            embed_fn=get_embedding, result_cache=retrieval_cache, **settings
+        )
+    return _retrievers[source]
+
+
+@router.post("/search/{source}", response_model=SearchResponse)
+async def search(source: str, request: SearchRequest):
+    """Semantic search over tools or organizations without an agent, on the async engine."""
+    if source not in ("tools", "orgs"):
+        raise HTTPException(status_code=404, detail=f"Unknown search source '{source}'")
+    logger.info(f"API search {source}: '{request.query[:50]}...'")
+
+    try:
+        results = await get_retriever(source).asearch(
+            request.query, limit=request.limit, filters=request.filters
+        )
+        return SearchResponse(results=results)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.exception(f"Error searching {source}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -16,6 +16,7 @@ from src.api.schemas import (
     MessageResponse,
     SuccessResponse,
 )
+from src.config import THREAD_SEARCH_PROFILE
 from src.logger import get_logger
 from src.db.threads import (
     create_thread,
@@ -28,6 +29,7 @@ from src.db.threads import (
 )
 from src.db.checkpointer import PostgresCheckpointer
 from src.agents.graph import create_clinical_graph
+from src.agents.semantic_cache import semantic_cache
 
 logger = get_logger(__name__)
 
@@ -45,8 +47,14 @@ def get_graph_with_checkpointer():
         _checkpointer = PostgresCheckpointer()
 
     if _graph is None:
-        logger.info("Initializing clinical graph with checkpointer...")
-        _graph = create_clinical_graph(checkpointer=_checkpointer)
+        logger.info(
+            f"Initializing clinical graph with checkpointer (search profile: {THREAD_SEARCH_PROFILE})..."
+        )
+        _graph = create_clinical_graph(
+            checkpointer=_checkpointer,
+            search_profile=THREAD_SEARCH_PROFILE,
+            semantic_cache=semantic_cache,
+        )
         logger.info("Clinical graph with checkpointer initialized")
 
     return _graph
@@ -173,6 +181,7 @@ def query_thread(thread_id: str, request: QueryRequest):
             tools_results=result.get("tools_results", []),
             orgs_results=result.get("orgs_results", []),
             confidence=ConfidenceScore(**confidence),
+            cache_hit=result.get("cache_hit", False),
         )
     except HTTPException:
         raise
@@ -13,6 +13,20 @@ class QueryRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=2000)
 
 
+class SearchRequest(BaseModel):
+    """Request body for direct search endpoints."""
+
+    query: str = Field(..., min_length=1, max_length=2000)
+    limit: int = Field(default=5, ge=1, le=50)
+    filters: dict[str, str | list[str]] | None = None
+
+
+class SearchResponse(BaseModel):
+    """Ranked rows from a direct search."""
+
+    results: list[dict]
+
+
 class ThreadCreate(BaseModel):
     """Request body for creating a thread."""
 
@@ -42,6 +56,7 @@ class QueryResponse(BaseModel):
     tools_results: list[dict]
     orgs_results: list[dict]
     confidence: ConfidenceScore
+    cache_hit: bool = False
 
 
 class MessageResponse(BaseModel):
@@ -77,6 +92,36 @@ class HealthResponse(BaseModel):
     service: str
 
 
+class EmbeddingMetricsResponse(BaseModel):
+    """Embedding cache counters and micro-batcher histograms."""
+
+    cache: dict | None
+    batcher: dict | None
+
+
+class RetrievalCacheMetricsResponse(BaseModel):
+    """Retrieval result cache counters (this process) and live entries per table."""
+
+    enabled: bool
+    stats: dict | None
+    tables: list[dict] | None
+
+
+class SemanticCacheMetricsResponse(BaseModel):
+    """Semantic answer cache counters and latencies (this process) and entries per namespace."""
+
+    enabled: bool
+    stats: dict | None
+    namespaces: list[dict] | None
+
+
+class ReembedStatusResponse(BaseModel):
+    """Background re-embedding progress per vector table, and the embedding queries use."""
+
+    active_embedding: list
+    jobs: list[dict]
+
+
 class ErrorResponse(BaseModel):
     """Standard error response."""
 
@@ -0,0 +1,44 @@
+"""Throughput of per-query search vs. batched search_many over the same queries."""
+
+import time
+
+from src.retrievers.base import BaseRetriever
+
+
+def batch_search_report(
+    retriever: BaseRetriever,
+    queries: list[str],
+    embed_batch_fn,
+    k: int = 5,
+    batch_size: int = 256
+) -> dict:
+    """
+    Wall time for embedding and searching every query one at a time, then in
+    batches via search_many, and whether both return the same ids.
+    """
+    started = time.perf_counter()
+    sequential = []
+    for query in queries:
+        embedding = embed_batch_fn([query])[0]
+        sequential.append(retriever.search_by_vector(embedding, limit=k))
+    sequential_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batched = []
+    for i in range(0, len(queries), batch_size):
+        chunk = queries[i:i + batch_size]
+        batched += retriever.search_many_by_vector(embed_batch_fn(chunk), limit=k)
+    batched_seconds = time.perf_counter() - started
+
+    same = sum(
+        [row["id"] for row in a] == [row["id"] for row in b] for a, b in zip(sequential, batched)
+    )
+    return {
+        "queries": len(queries),
+        "batch_size": batch_size,
+        "sequential_seconds": round(sequential_seconds, 3),
+        "batched_seconds": round(batched_seconds, 3),
+        "sequential_qps": round(len(queries) / sequential_seconds, 1) if sequential_seconds else None,
+        "batched_qps": round(len(queries) / batched_seconds, 1) if batched_seconds else None,
+        "identical_results": round(same / len(queries), 4) if queries else None,
+    }
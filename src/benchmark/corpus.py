@@ -0,0 +1,33 @@
+"""Read benchmark corpora and index statistics from the database."""
+
+import numpy as np
+from sqlalchemy import text
+
+from src.db.models.base import engine
+
+
+def load_vectors(table: str) -> tuple[list, np.ndarray]:
+    """All ids and full-precision embeddings of a table."""
+    with engine.connect() as conn:
+        rows = conn.execute(text(
+            f"SELECT id, embedding::text AS embedding FROM {table} WHERE embedding IS NOT NULL"
+        )).fetchall()
+    ids = [row.id for row in rows]
+    matrix = np.array(
+        [[float(x) for x in row.embedding.strip("[]").split(",")] for row in rows],
+        dtype=np.float32
+    )
+    return ids, matrix
+
+
+def index_sizes(table: str) -> dict[str, int]:
+    """On-disk size in bytes of each vector index on a table."""
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT i.relname AS index_name, pg_relation_size(i.oid) AS size
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_am am ON am.oid = i.relam
+            WHERE x.indrelid = CAST(:table AS regclass) AND am.amname IN ('hnsw', 'ivfflat')
+        """), {"table": table}).fetchall()
+    return {row.index_name: int(row.size) for row in rows}
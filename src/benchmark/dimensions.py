@@ -0,0 +1,41 @@
+"""Recall-vs-dimension study for shortened (Matryoshka) embeddings."""
+
+import time
+
+import numpy as np
+
+from src.benchmark.metrics import exact_top_k, normalize_rows, recall_at_k
+
+
+def shorten(matrix: np.ndarray, dimensions: int) -> np.ndarray:
+    """
+    Shorten embeddings to the first `dimensions` components and re-normalize.
+    This matches the text-embedding-3 `dimensions` parameter.
+    """
+    return normalize_rows(np.asarray(matrix, dtype=np.float32)[:, :dimensions])
+
+
+def dimension_report(
+    corpus: np.ndarray,
+    queries: np.ndarray,
+    dimensions: list[int],
+    k: int = 5
+) -> list[dict]:
+    """Recall@k against full-width exact search and storage cost for each width."""
+    native = corpus.shape[1]
+    truth = exact_top_k(corpus, queries, k)
+    report = []
+    for dims in sorted(d for d in dimensions if d <= native):
+        short_corpus = shorten(corpus, dims)
+        short_queries = shorten(queries, dims)
+        started = time.perf_counter()
+        retrieved = exact_top_k(short_corpus, short_queries, k)
+        scan_ms = (time.perf_counter() - started) * 1000
+        report.append({
+            "dimensions": dims,
+            f"recall@{k}": round(recall_at_k(retrieved.tolist(), truth.tolist(), k), 4),
+            "bytes_per_vector": 4 * dims + 8,
+            "relative_size": round(dims / native, 4),
+            "exact_scan_ms_per_query": round(scan_ms / max(len(queries), 1), 4),
+        })
+    return report
@@ -0,0 +1,87 @@
+"""Latency overhead and result diversity of MMR re-ranking against plain top-k search."""
+
+import time
+
+import numpy as np
+
+from src.benchmark.corpus import load_vectors
+from src.benchmark.metrics import latency_summary, normalize_rows
+from src.retrievers.mmr import mmr_select
+from src.retrievers.pgvector_retriever import PgVectorRetriever
+
+
+def result_diversity(results: list[list[dict]], vectors: dict, embeddings: list[list[float]]) -> dict:
+    """Mean query similarity and mean pairwise similarity within each result list (lower = more diverse)."""
+    relevance, redundancy = [], []
+    for rows, embedding in zip(results, embeddings):
+        relevance += [row["similarity"] for row in rows]
+        if len(rows) > 1:
+            matrix = normalize_rows(np.stack([vectors[row["id"]] for row in rows]))
+            pairwise = matrix @ matrix.T
+            redundancy.append(float(pairwise[np.triu_indices(len(rows), 1)].mean()))
+    return {
+        "mean_similarity": round(float(np.mean(relevance)), 4) if relevance else None,
+        "intra_list_similarity": round(float(np.mean(redundancy)), 4) if redundancy else None,
+    }
+
+
+def mmr_report(
+    retriever_cls: type[PgVectorRetriever],
+    embeddings: list[list[float]],
+    k: int = 5,
+    fetch_k: int = 20,
+    lambdas: tuple[float, ...] = (0.5, 0.7),
+    repeat: int = 3
+) -> dict:
+    """
+    Search latency without MMR, for the fetch_k candidate pool and at each
+    lambda, the NumPy selection time alone, and how relevant, redundant and
+    different from plain top-k the results are.
+    """
+    ids, matrix = load_vectors(retriever_cls.table)
+    vectors = dict(zip(ids, matrix))
+
+    def run(retriever, limit):
+        samples, results = [], []
+        for _ in range(repeat):
+            results = []
+            for embedding in embeddings:
+                started = time.perf_counter()
+                results.append(retriever.search_by_vector(embedding, limit=limit))
+                samples.append((time.perf_counter() - started) * 1000)
+        return latency_summary(samples), results
+
+    plain = retriever_cls(embed_fn=None)
+    latency, baseline = run(plain, k)
+    report = {
+        "table": retriever_cls.table,
+        "queries": len(embeddings),
+        "k": k,
+        "fetch_k": fetch_k,
+        "baseline": {"latency": latency, **result_diversity(baseline, vectors, embeddings)},
+        "mmr": {},
+    }
+    # Plain search for the whole candidate pool separates the cost of fetching more rows from MMR itself
+    report["pool_latency"], pools = run(plain, max(fetch_k, k))
+
+    for lambda_mult in lambdas:
+        retriever = retriever_cls(embed_fn=None, mmr_lambda=lambda_mult, mmr_fetch_k=fetch_k)
+        latency, results = run(retriever, k)
+
+        started = time.perf_counter()
+        for pool, embedding in zip(pools, embeddings):
+            candidates = np.stack([vectors[row["id"]] for row in pool]) if pool else np.empty((0, 0))
+            mmr_select(np.asarray(embedding, dtype=np.float32), candidates, k, lambda_mult)
+        select_us = 1e6 * (time.perf_counter() - started) / max(len(pools), 1)
+
+        overlap = [
+            len({row["id"] for row in a} & {row["id"] for row in b}) / max(len(b), 1)
+            for a, b in zip(results, baseline)
+        ]
+        report["mmr"][str(lambda_mult)] = {
+            "latency": latency,
+            "select_us": round(select_us, 1),
+            "overlap_with_baseline": round(float(np.mean(overlap)), 4) if overlap else None,
+            **result_diversity(results, vectors, embeddings),
+        }
+    return report
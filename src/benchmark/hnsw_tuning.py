@@ -0,0 +1,36 @@
+"""Sweep hnsw.ef_search against exact search to chart the recall/latency curve."""
+
+import numpy as np
+
+from src.benchmark.corpus import load_vectors
+from src.benchmark.metrics import exact_top_k
+from src.benchmark.quantization import benchmark_retriever
+from src.retrievers.pgvector_retriever import PgVectorRetriever
+
+DEFAULT_EF_VALUES = [10, 20, 40, 64, 100, 200, 400]
+
+
+def ef_search_sweep(
+    retriever_cls: type[PgVectorRetriever],
+    queries: np.ndarray,
+    ef_values: list[int] = DEFAULT_EF_VALUES,
+    k: int = 5,
+    repeat: int = 3
+) -> dict:
+    """Recall@k and latency of full-precision HNSW search at each ef_search."""
+    ids, corpus = load_vectors(retriever_cls.table)
+    truth = [[ids[i] for i in row] for row in exact_top_k(corpus, queries, k)]
+    curve = []
+    for ef in sorted(ef_values):
+        retriever = retriever_cls(embed_fn=None, quantization="none", ef_search=ef)
+        curve.append({"ef_search": ef, **benchmark_retriever(retriever, queries, truth, k, repeat)})
+    return {"table": retriever_cls.table, "rows": len(ids), "k": k, "curve": curve}
+
+
+def recommend_ef_search(curve: list[dict], target_recall: float, k: int) -> int:
+    """Smallest ef_search reaching target recall@k (the largest swept value if none does)."""
+    points = sorted(curve, key=lambda point: point["ef_search"])
+    for point in points:
+        if point[f"recall@{k}"] >= target_recall:
+            return point["ef_search"]
+    return points[-1]["ef_search"]
@@ -0,0 +1,72 @@
+"""Rows per second of the ORM seed path against binary COPY on the same rows."""
+
+import time
+
+from sqlalchemy import text
+from sqlalchemy.orm import declarative_base
+
+from src.benchmark.scale import BENCH_PREFIX, create_bench_table, drop_bench_table
+from src.benchmark.synthetic import CORPORA, synthetic_rows
+from src.db.models import ClinicalOrganization, ClinicalTool
+from src.db.models.base import engine, get_session
+from src.embeddings.local_embed import LocalEmbedder
+from src.seed.bulk_load import bulk_load
+
+MODELS = {model.__tablename__: model for model in (ClinicalOrganization, ClinicalTool)}
+
+INGEST_METHODS = ("orm", "copy", "copy_staging")
+
+
+def bench_model(model):
+    """ORM class mapped to the bench_ copy of a model's table."""
+    base = declarative_base()
+    table = model.__table__.to_metadata(base.metadata, name=BENCH_PREFIX + model.__tablename__)
+    return type(f"Bench{model.__name__}", (base,), {"__table__": table})
+
+
+def orm_load(model, rows: list[dict]) -> None:
+    """The seed's ORM path: one object and session.add per row, one commit."""
+    with get_session() as session:
+        for row in rows:
+            session.add(model(**row))
+
+
+def ingest_report(
+    table: str,
+    rows: int,
+    embedder: LocalEmbedder,
+    methods: tuple[str, ...] = INGEST_METHODS,
+    seed: int = 0
+) -> dict:
+    """
+    Load the same synthetic rows and embeddings into an index-free bench_ table
+    once per method, emptying it in between. Embedding time is excluded.
+    """
+    _, embedding_text, columns = CORPORA[table]
+    data = [row for chunk in synthetic_rows(table, rows, seed=seed) for row in chunk]
+    vectors = embedder.embed_batch([embedding_text(row) for row in data])
+    # Lists, as get_embeddings_batch hands the seed
+    data = [{**row, "embedding": vector.tolist()} for row, vector in zip(data, vectors)]
+    bench = create_bench_table(table, embedder.dimensions)
+    results = {}
+    try:
+        for method in methods:
+            with engine.connect() as conn:
+                conn.execute(text(f"TRUNCATE {bench}"))
+                conn.commit()
+            started = time.perf_counter()
+            if method == "orm":
+                orm_load(bench_model(MODELS[table]), data)
+            else:
+                bulk_load(bench, data, columns + ["embedding", "created_at"], staging=method == "copy_staging")
+            seconds = time.perf_counter() - started
+            results[method] = {
+                "seconds": round(seconds, 3),
+                "rows_per_second": round(len(data) / seconds, 1),
+            }
+    finally:
+        drop_bench_table(table)
+    if "orm" in results:
+        for result in results.values():
+            result["speedup_vs_orm"] = round(results["orm"]["seconds"] / result["seconds"], 1)
+    return {"table": table, "rows": len(data), "dimensions": embedder.dimensions, "methods": results}
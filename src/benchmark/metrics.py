@@ -0,0 +1,47 @@
+"""Shared retrieval quality and latency metrics."""
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row so dot products are cosine similarities."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Exact cosine top-k indices for each query, best first."""
+    scores = normalize_rows(queries) @ normalize_rows(corpus).T
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def recall_at_k(retrieved: list[list], truth: list[list], k: int) -> float:
+    """Mean fraction of the true top-k found in the retrieved top-k."""
+    if not truth:
+        return 0.0
+    total = 0.0
+    for got, expected in zip(retrieved, truth):
+        expected_k = set(list(expected)[:k])
+        if expected_k:
+            total += len(set(list(got)[:k]) & expected_k) / len(expected_k)
+    return total / len(truth)
+
+
+def latency_summary(samples_ms: list[float]) -> dict:
+    """p50/p95/p99/mean/max of latency samples in milliseconds."""
+    if not samples_ms:
+        return {"count": 0}
+    values = np.asarray(samples_ms, dtype=np.float64)
+    return {
+        "count": int(values.size),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "mean_ms": round(float(values.mean()), 3),
+        "max_ms": round(float(values.max()), 3),
+    }
@@ -0,0 +1,59 @@
+"""Index size, latency and recall of the quantized retriever modes."""
+
+import time
+
+import numpy as np
+
+from src.benchmark.corpus import index_sizes, load_vectors
+from src.benchmark.metrics import exact_top_k, latency_summary, recall_at_k
+from src.retrievers.pgvector_retriever import PgVectorRetriever
+
+
+def benchmark_retriever(
+    retriever: PgVectorRetriever,
+    queries: np.ndarray,
+    truth_ids: list[list],
+    k: int,
+    repeat: int = 3
+) -> dict:
+    """Latency summary and recall@k of a retriever over precomputed query vectors."""
+    samples, retrieved = [], []
+    for _ in range(repeat):
+        retrieved = []
+        for query in queries:
+            started = time.perf_counter()
+            rows = retriever.search_by_vector(query.tolist(), limit=k)
+            samples.append((time.perf_counter() - started) * 1000)
+            retrieved.append([row["id"] for row in rows])
+    return {
+        **latency_summary(samples),
+        f"recall@{k}": round(recall_at_k(retrieved, truth_ids, k), 4),
+    }
+
+
+def quantization_report(
+    retriever_cls: type[PgVectorRetriever],
+    queries: np.ndarray,
+    k: int = 5,
+    rerank_candidates: int = 40,
+    modes: tuple[str, ...] = ("none", "halfvec", "binary"),
+    repeat: int = 3
+) -> dict:
+    """Compare each quantization mode against exact search on full vectors."""
+    ids, corpus = load_vectors(retriever_cls.table)
+    truth = [[ids[i] for i in row] for row in exact_top_k(corpus, queries, k)]
+    results = {}
+    for mode in modes:
+        retriever = retriever_cls(
+            embed_fn=None, quantization=mode, rerank_candidates=rerank_candidates
+        )
+        try:
+            results[mode] = benchmark_retriever(retriever, queries, truth, k, repeat)
+        except Exception as e:
+            results[mode] = {"error": str(e).splitlines()[0]}
+    return {
+        "table": retriever_cls.table,
+        "rows": len(ids),
+        "index_bytes": index_sizes(retriever_cls.table),
+        "modes": results,
+    }
@@ -0,0 +1,20 @@
+"""Query sets shared by the benchmark scripts."""
+
+import json
+
+DEFAULT_QUERIES = [
+    "hospitals using AI to reduce physician burnout",
+    "cancer treatment and oncology research",
+    "rural healthcare and telemedicine",
+    "heart disease and cardiology AI",
+    "reduce documentation time for doctors",
+    "drug interaction checking and medication safety",
+    "clinical trial patient matching",
+    "staffing shortages and workforce management",
+]
+
+
+def read_texts(path: str) -> list[str]:
+    """Read texts from a JSONL file with a 'text' field per line."""
+    with open(path) as f:
+        return [json.loads(line)["text"] for line in f if line.strip()]
@@ -0,0 +1,238 @@
+"""Load a synthetic corpus at scale, build its vector indexes, and measure search latency, QPS and recall."""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from sqlalchemy import text
+
+from src.benchmark.metrics import latency_summary, normalize_rows, recall_at_k
+from src.benchmark.synthetic import CORPORA, synthetic_rows
+from src.db.models.base import engine
+from src.db.schema import build_vector_index
+from src.embeddings.local_embed import LocalEmbedder
+from src.retrievers.pgvector_retriever import PgVectorRetriever
+from src.seed.bulk_load import copy_rows
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+BENCH_PREFIX = "bench_"
+
+
+class TopK:
+    """Running exact cosine top-k of fixed queries over a corpus seen chunk by chunk."""
+
+    def __init__(self, queries: np.ndarray, k: int):
+        self.queries = normalize_rows(queries)
+        self.k = k
+        self.scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        self.ids = np.zeros((len(queries), 0), dtype=np.int64)
+
+    def update(self, ids: list[int], vectors: np.ndarray) -> None:
+        scores = np.hstack([self.scores, self.queries @ normalize_rows(vectors).T])
+        ids = np.hstack([self.ids, np.broadcast_to(np.asarray(ids), (len(self.queries), len(ids)))])
+        if scores.shape[1] > self.k:
+            keep = np.argpartition(-scores, self.k - 1, axis=1)[:, :self.k]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            ids = np.take_along_axis(ids, keep, axis=1)
+        self.scores, self.ids = scores, ids
+
+    def result(self) -> list[list[int]]:
+        """Ids of each query's top-k, best first."""
+        order = np.argsort(-self.scores, axis=1, kind="stable")
+        return np.take_along_axis(self.ids, order, axis=1).tolist()
+
+
+def bench_retriever(retriever_cls: type[PgVectorRetriever], **kwargs) -> PgVectorRetriever:
+    """A retriever over the bench_ copy of its table."""
+    bench_cls = type(
+        f"Bench{retriever_cls.__name__}", (retriever_cls,), {"table": BENCH_PREFIX + retriever_cls.table}
+    )
+    return bench_cls(embed_fn=None, **kwargs)
+
+
+def create_bench_table(table: str, dimensions: int) -> str:
+    """Empty bench_ table with the source table's columns (generated ones and storage too) and no indexes."""
+    bench = BENCH_PREFIX + table
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {bench}"))
+        conn.execute(text(f"CREATE TABLE {bench} (LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE)"))
+        conn.execute(text(f"ALTER TABLE {bench} ALTER COLUMN embedding TYPE vector({int(dimensions)})"))
+        conn.commit()
+    return bench
+
+
+def drop_bench_table(table: str) -> None:
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {BENCH_PREFIX + table}"))
+        conn.commit()
+
+
+def load_corpus(
+    table: str,
+    rows: int,
+    embedder: LocalEmbedder,
+    truth: TopK,
+    chunk_size: int = 5000,
+    seed: int = 0
+) -> dict:
+    """
+    Generate, embed and binary-COPY rows into the bench_ table chunk by chunk,
+    so memory stays bounded, while accumulating the exact top-k for recall.
+    """
+    _, embedding_text, columns = CORPORA[table]
+    bench = BENCH_PREFIX + table
+    embed_seconds = copy_seconds = 0.0
+    loaded = 0
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.driver_connection.cursor()
+        for chunk in synthetic_rows(table, rows, chunk_size, seed):
+            started = time.perf_counter()
+            vectors = embedder.embed_batch([embedding_text(row) for row in chunk])
+            embed_seconds += time.perf_counter() - started
+            truth.update([row["id"] for row in chunk], vectors)
+
+            started = time.perf_counter()
+            copy_rows(
+                cursor, bench, columns + ["embedding"],
+                ({**row, "embedding": vector} for row, vector in zip(chunk, vectors))
+            )
+            raw.driver_connection.commit()
+            copy_seconds += time.perf_counter() - started
+            loaded += len(chunk)
+            logger.info(f"Loaded {loaded}/{rows} rows into {bench}")
+        with raw.driver_connection.cursor() as analyze:
+            analyze.execute(f"ANALYZE {bench}")
+        raw.driver_connection.commit()
+    finally:
+        raw.close()
+    return {
+        "rows": loaded,
+        "embed_seconds": round(embed_seconds, 3),
+        "copy_seconds": round(copy_seconds, 3),
+        "copy_rows_per_second": round(loaded / copy_seconds, 1) if copy_seconds else None,
+        "rows_per_second": round(loaded / (embed_seconds + copy_seconds), 1) if loaded else None,
+    }
+
+
+def build_index(table: str, index_type: str = "hnsw", lists: int | None = None) -> dict:
+    """Build the bench_ table's cosine index; returns type, IVFFlat lists, build seconds and size."""
+    bench = BENCH_PREFIX + table
+    build = build_vector_index(bench, f"{bench}_embedding", index_type, lists)
+    with engine.connect() as conn:
+        size = conn.execute(text(f"SELECT pg_relation_size('{bench}_embedding')")).scalar()
+    return {"type": index_type, "lists": build["lists"], "build_seconds": build["build_seconds"], "bytes": int(size)}
+
+
+def drop_index(table: str) -> None:
+    bench = BENCH_PREFIX + table
+    with engine.connect() as conn:
+        conn.execute(text(f"DROP INDEX IF EXISTS {bench}_embedding"))
+        conn.commit()
+
+
+def measure_search(
+    retriever: PgVectorRetriever,
+    queries: np.ndarray,
+    truth_ids: list[list[int]],
+    k: int,
+    repeat: int = 3
+) -> dict:
+    """Sequential search latency and recall@k against the exact top-k."""
+    samples, retrieved = [], []
+    for _ in range(repeat):
+        retrieved = []
+        for query in queries:
+            started = time.perf_counter()
+            rows = retriever.search_by_vector(query.tolist(), limit=k)
+            samples.append((time.perf_counter() - started) * 1000)
+            retrieved.append([row["id"] for row in rows])
+    return {
+        "latency": latency_summary(samples),
+        f"recall@{k}": round(recall_at_k(retrieved, truth_ids, k), 4),
+    }
+
+
+def measure_throughput(
+    retriever: PgVectorRetriever,
+    queries: np.ndarray,
+    k: int,
+    concurrency: int,
+    searches: int
+) -> dict:
+    """QPS and latency with `concurrency` threads issuing `searches` searches in total."""
+    vectors = [query.tolist() for query in queries]
+
+    def search(i: int) -> float:
+        started = time.perf_counter()
+        retriever.search_by_vector(vectors[i % len(vectors)], limit=k)
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(search, range(searches)))
+    elapsed = time.perf_counter() - started
+    return {
+        "concurrency": concurrency,
+        "qps": round(searches / elapsed, 1),
+        "latency": latency_summary(samples),
+    }
+
+
+def scale_report(
+    retriever_cls: type[PgVectorRetriever],
+    rows: int,
+    queries: list[str],
+    embedder: LocalEmbedder,
+    k: int = 10,
+    ef_search: int | None = None,
+    concurrency: tuple[int, ...] = (1, 4, 8),
+    searches: int = 1000,
+    chunk_size: int = 5000,
+    seed: int = 0,
+    keep: bool = False,
+    index_types: tuple[str, ...] = ("hnsw",),
+    lists: int | None = None,
+    probes: tuple[int, ...] = (10,)
+) -> dict:
+    """
+    Ingest, then for each index type in turn on the same rows: build time and
+    size, latency, recall@k and QPS (HNSW at ef_search, IVFFlat at each probes).
+    """
+    table = retriever_cls.table
+    query_vectors = embedder.embed_batch(queries)
+    truth = TopK(query_vectors, k)
+    create_bench_table(table, embedder.dimensions)
+    indexes = []
+    try:
+        ingest = load_corpus(table, rows, embedder, truth, chunk_size, seed)
+        truth_ids = truth.result()
+        for index_type in index_types:
+            index = build_index(table, index_type, lists)
+            scans = [{"ef_search": ef_search}] if index_type == "hnsw" else [{"probes": p} for p in probes]
+            index["scans"] = []
+            for scan in scans:
+                retriever = bench_retriever(retriever_cls, **scan)
+                index["scans"].append({
+                    **scan,
+                    "search": measure_search(retriever, query_vectors, truth_ids, k),
+                    "throughput": [
+                        measure_throughput(retriever, query_vectors, k, level, searches)
+                        for level in concurrency
+                    ],
+                })
+            indexes.append(index)
+            # The last index stays with a kept table
+            if index_type != index_types[-1] or not keep:
+                drop_index(table)
+    finally:
+        if not keep:
+            drop_bench_table(table)
+    return {
+        "table": table,
+        "rows": rows,
+        "ingest": ingest,
+        "indexes": indexes,
+    }
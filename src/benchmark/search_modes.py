@@ -0,0 +1,35 @@
+"""Latency of vector vs. hybrid (full-text + vector RRF) search."""
+
+import time
+
+from src.benchmark.metrics import latency_summary
+from src.retrievers.pgvector_retriever import PgVectorRetriever
+
+
+def search_mode_report(
+    retriever_cls: type[PgVectorRetriever],
+    queries: list[str],
+    embeddings: list[list[float]],
+    k: int = 5,
+    modes: tuple[str, ...] = ("vector", "hybrid"),
+    repeat: int = 3
+) -> dict:
+    """Latency summary per search mode, plus how often the two modes agree on the top result."""
+    results, top_hits = {}, {}
+    for mode in modes:
+        retriever = retriever_cls(embed_fn=None, search_mode=mode)
+        samples = []
+        for _ in range(repeat):
+            top_hits[mode] = []
+            for query, embedding in zip(queries, embeddings):
+                started = time.perf_counter()
+                rows = retriever.search_by_vector(embedding, limit=k, query=query)
+                samples.append((time.perf_counter() - started) * 1000)
+                top_hits[mode].append(rows[0]["id"] if rows else None)
+        results[mode] = latency_summary(samples)
+
+    report = {"table": retriever_cls.table, "modes": results}
+    if "vector" in top_hits and "hybrid" in top_hits and queries:
+        same = sum(a == b for a, b in zip(top_hits["vector"], top_hits["hybrid"]))
+        report["top1_agreement"] = round(same / len(queries), 4)
+    return report
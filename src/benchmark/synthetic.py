@@ -0,0 +1,101 @@
+"""Deterministic synthetic clinical tools/organizations corpora of any size."""
+
+import random
+from typing import Callable, Iterator
+
+from src.seed.clinical_data import CLINICAL_ORGANIZATIONS, CLINICAL_TOOLS
+from src.seed.run_seed import create_embedding_text_org, create_embedding_text_tool
+
+# Field values come from the seed catalog so filters and text look like the real data
+CATEGORIES = sorted({tool["category"] for tool in CLINICAL_TOOLS})
+TARGET_USERS = sorted({user for tool in CLINICAL_TOOLS for user in tool["target_users"]})
+ORG_TYPES = sorted({org["org_type"] for org in CLINICAL_ORGANIZATIONS})
+SPECIALTIES = sorted({org["specialty"] for org in CLINICAL_ORGANIZATIONS})
+LOCATIONS = sorted({(org["city"], org["state"]) for org in CLINICAL_ORGANIZATIONS})
+AI_USE_CASES = sorted({case for org in CLINICAL_ORGANIZATIONS for case in org["ai_use_cases"]})
+
+CAPABILITIES = [
+    "early warning scoring", "ambient note drafting", "medication reconciliation",
+    "imaging triage", "risk stratification", "prior authorization automation",
+    "discharge planning", "staffing forecasts", "coding assistance", "patient outreach",
+    "trial eligibility screening", "sepsis surveillance", "readmission prediction",
+    "order set recommendations", "care gap detection", "remote vitals monitoring",
+]
+PROBLEMS = [
+    "physician burnout", "documentation time", "missed diagnoses", "alert fatigue",
+    "adverse drug events", "long emergency department waits", "nurse turnover",
+    "claim denials", "hospital readmissions", "delayed cancer screening",
+    "rural specialist access", "ICU deterioration", "no-show appointments",
+    "fragmented care transitions", "sepsis mortality", "manual chart abstraction",
+]
+SETTINGS = [
+    "intensive care units", "emergency departments", "primary care clinics",
+    "oncology centers", "rural hospitals", "home health", "inpatient wards",
+    "ambulatory surgery centers", "telehealth programs", "pediatric hospitals",
+]
+NAME_PREFIXES = ["Clinical", "Smart", "Insight", "Care", "Vital", "Precision", "Pulse", "Nova"]
+NAME_NOUNS = ["Assist", "Navigator", "Sentinel", "Scribe", "Compass", "Monitor", "Advisor", "Engine"]
+ORG_SUFFIXES = ["Health", "Medical Center", "Health System", "Regional Hospital", "Clinic"]
+
+
+def synthetic_tool(i: int, seed: int = 0) -> dict:
+    """Row i of the synthetic clinical_tools corpus."""
+    rng = random.Random(f"tool:{seed}:{i}")
+    capability, problem, setting = rng.choice(CAPABILITIES), rng.choice(PROBLEMS), rng.choice(SETTINGS)
+    return {
+        "id": i + 1,
+        "name": f"{rng.choice(NAME_PREFIXES)} {rng.choice(NAME_NOUNS)} {i}",
+        "category": rng.choice(CATEGORIES),
+        "description": f"{capability.capitalize()} for {setting}, focused on {problem}.",
+        "target_users": rng.sample(TARGET_USERS, rng.randint(1, 3)),
+        "problem_solved": f"Reduces {problem} in {setting}",
+    }
+
+
+def synthetic_org(i: int, seed: int = 0) -> dict:
+    """Row i of the synthetic clinical_organizations corpus."""
+    rng = random.Random(f"org:{seed}:{i}")
+    city, state = rng.choice(LOCATIONS)
+    capability, problem = rng.choice(CAPABILITIES), rng.choice(PROBLEMS)
+    return {
+        "id": i + 1,
+        "name": f"{city} {rng.choice(ORG_SUFFIXES)} {i}",
+        "org_type": rng.choice(ORG_TYPES),
+        "specialty": rng.choice(SPECIALTIES),
+        "description": f"Uses {capability} to address {problem} across its {rng.choice(SETTINGS)}.",
+        "city": city,
+        "state": state,
+        "services": {"emergency": rng.random() < 0.5, "telehealth": rng.random() < 0.5},
+        "ai_use_cases": rng.sample(AI_USE_CASES, rng.randint(1, 3)),
+    }
+
+
+# table -> (row generator, embedding text, columns loaded besides embedding)
+CORPORA: dict[str, tuple[Callable[[int, int], dict], Callable[[dict], str], list[str]]] = {
+    "clinical_tools": (
+        synthetic_tool,
+        create_embedding_text_tool,
+        ["id", "name", "category", "description", "target_users", "problem_solved"],
+    ),
+    "clinical_organizations": (
+        synthetic_org,
+        create_embedding_text_org,
+        ["id", "name", "org_type", "specialty", "description", "city", "state", "services", "ai_use_cases"],
+    ),
+}
+
+
+def synthetic_rows(table: str, count: int, chunk_size: int = 5000, seed: int = 0) -> Iterator[list[dict]]:
+    """Rows 0..count-1 of a table's synthetic corpus in chunks; the same seed gives the same rows."""
+    generate = CORPORA[table][0]
+    for start in range(0, count, chunk_size):
+        yield [generate(i, seed) for i in range(start, min(start + chunk_size, count))]
+
+
+def synthetic_queries(count: int, seed: int = 0) -> list[str]:
+    """Search queries drawn from the same vocabulary as the corpora."""
+    rng = random.Random(f"queries:{seed}")
+    return [
+        f"{rng.choice(CAPABILITIES)} to reduce {rng.choice(PROBLEMS)} in {rng.choice(SETTINGS)}"
+        for _ in range(count)
+    ]
@@ -0,0 +1,174 @@
+"""Client CPU, latency and bytes on the wire per search for each query vector encoding."""
+
+import socket
+import threading
+import time
+
+from pgvector.psycopg import register_vector
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+
+from src.benchmark.metrics import latency_summary
+from src.config import DB_PREPARE_THRESHOLD
+from src.retrievers.pgvector_retriever import PgVectorRetriever, query_vector, vector_literal
+
+# psycopg's own default: statements are prepared on their fifth execution
+PSYCOPG_PREPARE_THRESHOLD = 5
+
+# name -> (parameter encoder, pgvector adapter registered, prepare_threshold)
+TRANSPORTS = {
+    "list": (lambda e: [float(x) for x in e], False, PSYCOPG_PREPARE_THRESHOLD),
+    "text": (vector_literal, False, PSYCOPG_PREPARE_THRESHOLD),
+    "binary": (query_vector, True, DB_PREPARE_THRESHOLD),
+}
+
+
+class ByteCountingProxy:
+    """Local TCP relay to Postgres that counts bytes sent by the client and by the server."""
+
+    def __init__(self, target: str | tuple[str, int]):
+        # A str target is a Unix socket path, a tuple a (host, port)
+        self.target = target
+        self.sent = 0
+        self.received = 0
+        self._lock = threading.Lock()
+        self._listener = socket.create_server(("127.0.0.1", 0))
+        self.port = self._listener.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def counts(self) -> tuple[int, int]:
+        """Bytes (client -> server, server -> client) relayed so far."""
+        with self._lock:
+            return self.sent, self.received
+
+    def close(self) -> None:
+        self._listener.close()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                client, _ = self._listener.accept()
+            except OSError:
+                return
+            family = socket.AF_UNIX if isinstance(self.target, str) else socket.AF_INET
+            server = socket.socket(family, socket.SOCK_STREAM)
+            server.connect(self.target)
+            threading.Thread(target=self._pump, args=(client, server, "sent"), daemon=True).start()
+            threading.Thread(target=self._pump, args=(server, client, "received"), daemon=True).start()
+
+    def _pump(self, source: socket.socket, dest: socket.socket, counter: str) -> None:
+        try:
+            while data := source.recv(65536):
+                # Counted before relaying, so counts() is exact once the client has its reply
+                with self._lock:
+                    setattr(self, counter, getattr(self, counter) + len(data))
+                dest.sendall(data)
+        except OSError:
+            pass
+        finally:
+            for sock in (source, dest):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+
+def proxy_target(url: URL) -> str | tuple[str, int]:
+    """Where a database URL connects: a Unix socket path or (host, port)."""
+    host = url.query.get("host") or url.host or "localhost"
+    if isinstance(host, tuple):
+        host = host[0]
+    port = url.port or 5432
+    if host.startswith("/"):
+        return f"{host}/.s.PGSQL.{port}"
+    return host, port
+
+
+def transport_report(
+    retriever: PgVectorRetriever,
+    database_url: str,
+    embeddings: list[list[float]],
+    k: int = 5,
+    warmup: int = 10,
+    transports: tuple[str, ...] = ("list", "text", "binary")
+) -> dict:
+    """
+    Run the retriever's unfiltered search once per embedding for each transport,
+    each on its own connection through a ByteCountingProxy, after warmup
+    searches that open the connection and let psycopg prepare the statement.
+
+    Client CPU is this thread's CPU time per search, so it covers parameter
+    encoding and result decoding but not time spent waiting on the server.
+    """
+    url = make_url(database_url)
+    proxy = ByteCountingProxy(proxy_target(url))
+    proxied = url.set(
+        host="127.0.0.1",
+        port=proxy.port,
+        query={key: value for key, value in url.query.items() if key != "host"},
+    )
+    results, ids = {}, {}
+    try:
+        for name in transports:
+            encode, binary, prepare_threshold = TRANSPORTS[name]
+            bench_engine = create_engine(
+                proxied, pool_size=1, connect_args={"prepare_threshold": prepare_threshold}
+            )
+            if binary:
+                event.listen(bench_engine, "connect", lambda conn, record: register_vector(conn))
+            try:
+                results[name], ids[name] = _run_transport(
+                    retriever, bench_engine, proxy, encode, embeddings, k, warmup
+                )
+            finally:
+                bench_engine.dispose()
+            results[name]["prepare_threshold"] = prepare_threshold
+    finally:
+        proxy.close()
+
+    baseline = ids[transports[0]]
+    for name in transports:
+        same = sum(a == b for a, b in zip(baseline, ids[name]))
+        results[name]["identical_results"] = round(same / len(embeddings), 4) if embeddings else None
+    return {
+        "table": retriever.table,
+        "queries": len(embeddings),
+        "dimensions": len(embeddings[0]) if embeddings else None,
+        "k": k,
+        "transports": results,
+    }
+
+
+def _run_transport(retriever, bench_engine, proxy, encode, embeddings, k, warmup):
+    for embedding in embeddings[:warmup]:
+        _search(retriever, bench_engine, encode(embedding), k)
+
+    sent, received = proxy.counts()
+    encode_seconds = cpu_seconds = 0.0
+    samples, ids = [], []
+    for embedding in embeddings:
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        vec = encode(embedding)
+        encode_seconds += time.thread_time() - cpu_started
+        rows = _search(retriever, bench_engine, vec, k)
+        cpu_seconds += time.thread_time() - cpu_started
+        samples.append((time.perf_counter() - started) * 1000)
+        ids.append([row["id"] for row in rows])
+    sent_after, received_after = proxy.counts()
+
+    n = max(len(embeddings), 1)
+    return {
+        "bytes_sent_per_query": round((sent_after - sent) / n),
+        "bytes_received_per_query": round((received_after - received) / n),
+        "encode_us": round(1e6 * encode_seconds / n, 1),
+        "client_cpu_us": round(1e6 * cpu_seconds / n, 1),
+        "latency": latency_summary(samples),
+    }, ids
+
+
+def _search(retriever, bench_engine, vec, k):
+    # Same statement and per-transaction settings as PgVectorRetriever._run_search
+    params = {"vec": vec, "limit": k, "query": ""}
+    with bench_engine.connect() as conn:
+        where, strategy = retriever._prepare_search(conn, params, k, None, None)
+        return [dict(row._mapping) for row in conn.execute(retriever._statement(where, strategy), params)]
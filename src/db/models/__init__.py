@@ -6,6 +6,11 @@ from src.db.models.tool import ClinicalTool
 from src.db.models.thread import ChatThread
 from src.db.models.message import ChatMessage
 from src.db.models.checkpoint import LangGraphCheckpoint
+from src.db.models.embedding_cache import EmbeddingCacheEntry
+from src.db.models.retrieval_cache import CorpusVersion, RetrievalCacheEntry
+from src.db.models.semantic_cache import SemanticCacheEntry
+from src.db.models.ingest_checkpoint import IngestCheckpoint
+from src.db.models.reembed_job import ReembedJob
 
 __all__ = [
     "Base",
@@ -16,4 +21,10 @@ __all__ = [
     "ChatThread",
     "ChatMessage",
     "LangGraphCheckpoint",
+    "EmbeddingCacheEntry",
+    "CorpusVersion",
+    "RetrievalCacheEntry",
+    "SemanticCacheEntry",
+    "IngestCheckpoint",
+    "ReembedJob",
 ]
@@ -2,10 +2,18 @@
 
 from contextlib import contextmanager
 
-from sqlalchemy import create_engine, text
+import psycopg
+from pgvector.psycopg import register_vector, register_vector_async
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker, scoped_session
 
-from src.config import DATABASE_URL
+from src.config import (
+    DATABASE_URL,
+    ASYNC_DB_POOL_SIZE,
+    ASYNC_DB_MAX_OVERFLOW,
+    DB_PREPARE_THRESHOLD,
+)
 from src.logger import get_logger
 
 logger = get_logger(__name__)
@@ -17,9 +25,40 @@ engine = create_engine(
     pool_size=5,
     max_overflow=10,
     pool_pre_ping=True,
-    echo=False
+    echo=False,
+    connect_args={"prepare_threshold": DB_PREPARE_THRESHOLD}
 )
 
+# Separate pool on psycopg's async driver for retrievers awaited on the event
+# loop; connections are opened on first use, so sync-only scripts never touch it.
+async_engine = create_async_engine(
+    db_url,
+    pool_size=ASYNC_DB_POOL_SIZE,
+    max_overflow=ASYNC_DB_MAX_OVERFLOW,
+    pool_pre_ping=True,
+    echo=False,
+    connect_args={"prepare_threshold": DB_PREPARE_THRESHOLD}
+)
+
+
+@event.listens_for(engine, "connect")
+def _register_vector_types(dbapi_connection, connection_record):
+    """Send numpy query vectors as binary pgvector parameters (4 bytes per dimension)."""
+    try:
+        register_vector(dbapi_connection)
+    except psycopg.ProgrammingError:
+        # Extension not created yet; init_extensions() drops pooled connections once it is.
+        dbapi_connection.rollback()
+
+
+@event.listens_for(async_engine.sync_engine, "connect")
+def _register_vector_types_async(dbapi_connection, connection_record):
+    try:
+        dbapi_connection.run_async(register_vector_async)
+    except psycopg.ProgrammingError:
+        dbapi_connection.rollback()
+
+
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
 ScopedSession = scoped_session(SessionLocal)
 
@@ -46,4 +85,14 @@ def init_extensions():
     with engine.connect() as conn:
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
         conn.commit()
+    # Connections opened before the extension existed have no vector adapters
+    engine.dispose()
     logger.info("pgvector extension ready")
+
+
+def pgvector_version(conn) -> tuple[int, ...]:
+    """Installed pgvector extension version, e.g. (0, 8, 0); () when not installed."""
+    version = conn.execute(text(
+        "SELECT extversion FROM pg_extension WHERE extname = 'vector'"
+    )).scalar()
+    return tuple(int(part) for part in version.split(".")) if version else ()
@@ -0,0 +1,20 @@
+"""EmbeddingCacheEntry model."""
+
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, DateTime
+from pgvector.sqlalchemy import Vector
+
+from src.db.models.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """Persisted embedding keyed by model, dimensions and normalized text hash."""
+    
+    __tablename__ = "embedding_cache"
+    
+    cache_key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    embedding = Column(Vector(), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
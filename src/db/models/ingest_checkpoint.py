@@ -0,0 +1,19 @@
+"""IngestCheckpoint model."""
+
+from sqlalchemy import Column, BigInteger, String, DateTime, func
+
+from src.db.models.base import Base
+
+
+class IngestCheckpoint(Base):
+    """Byte offset reached by a streaming ingestion, written with each batch it covers."""
+    
+    __tablename__ = "ingest_checkpoints"
+    
+    table_name = Column(String(63), primary_key=True)
+    source = Column(String(1024), primary_key=True)
+    # Size and mtime of the file the offset belongs to; a different file starts over
+    fingerprint = Column(String(64), nullable=False)
+    byte_offset = Column(BigInteger, nullable=False, default=0)
+    records = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -2,12 +2,19 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, JSON, func
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from pgvector.sqlalchemy import Vector
 
+from src.config import EMBEDDING_DIMENSIONS
 from src.db.models.base import Base
 
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(specialty, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
 
 class ClinicalOrganization(Base):
     """Healthcare organization with AI use cases."""
@@ -23,8 +30,14 @@ class ClinicalOrganization(Base):
     state = Column(String(50))
     services = Column(JSON, default={})
     ai_use_cases = Column(ARRAY(Text))
-    embedding = Column(Vector(1536))
+    # Seed sync: natural key, hash of the embedding text and of every seeded field
+    source_key = Column(String(255))
+    content_hash = Column(String(64))
+    record_hash = Column(String(64))
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS))
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
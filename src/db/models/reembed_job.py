@@ -0,0 +1,24 @@
+"""ReembedJob model."""
+
+from sqlalchemy import Column, BigInteger, Float, Integer, String, DateTime, func
+
+from src.db.models.base import Base
+
+
+class ReembedJob(Base):
+    """Progress of re-embedding a vector table into its shadow column, and the embedding it targets."""
+    
+    __tablename__ = "reembed_jobs"
+    
+    table_name = Column(String(63), primary_key=True)
+    backend = Column(String(20), nullable=False)
+    model = Column(String(100), nullable=False)
+    dimensions = Column(Integer, nullable=False)
+    # running -> ready (shadow complete and indexed) -> flipped (shadow serving as embedding)
+    status = Column(String(20), nullable=False, default="running")
+    rows_done = Column(BigInteger, nullable=False, default=0)
+    last_id = Column(BigInteger, nullable=False, default=0)
+    rows_per_second = Column(Float)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    flipped_at = Column(DateTime(timezone=True))
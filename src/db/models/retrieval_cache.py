@@ -0,0 +1,29 @@
+"""CorpusVersion and RetrievalCacheEntry models."""
+
+from sqlalchemy import Column, BigInteger, String, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.db.models.base import Base
+
+
+class CorpusVersion(Base):
+    """Write counter per vector table, bumped by statement triggers."""
+    
+    __tablename__ = "corpus_versions"
+    
+    table_name = Column(String(63), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class RetrievalCacheEntry(Base):
+    """Cached search results, valid while their table's corpus version is current."""
+    
+    __tablename__ = "retrieval_cache"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+    
+    cache_key = Column(String(64), primary_key=True)
+    table_name = Column(String(63), nullable=False)
+    corpus_version = Column(BigInteger, nullable=False)
+    results = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
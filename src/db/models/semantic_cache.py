@@ -0,0 +1,28 @@
+"""SemanticCacheEntry model."""
+
+from sqlalchemy import Column, BigInteger, Integer, String, Text, DateTime, func
+from sqlalchemy.dialects.postgresql import JSONB
+from pgvector.sqlalchemy import Vector
+
+from src.config import EMBEDDING_DIMENSIONS
+from src.db.models.base import Base
+
+
+class SemanticCacheEntry(Base):
+    """Final graph answer for a query, reused for paraphrases until it expires or the corpus changes."""
+    
+    __tablename__ = "semantic_cache"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+    
+    id = Column(Integer, primary_key=True)
+    namespace = Column(String(64), nullable=False)
+    query = Column(Text, nullable=False)
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS), nullable=False)
+    route = Column(String(50))
+    response = Column(Text, nullable=False)
+    tools_results = Column(JSONB, nullable=False)
+    orgs_results = Column(JSONB, nullable=False)
+    confidence = Column(JSONB, nullable=False)
+    corpus_version = Column(BigInteger, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
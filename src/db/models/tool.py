@@ -2,12 +2,19 @@
 
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Text, DateTime
-from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy import Column, Computed, Integer, String, Text, DateTime, func
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from pgvector.sqlalchemy import Vector
 
+from src.config import EMBEDDING_DIMENSIONS
 from src.db.models.base import Base
 
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(problem_solved, '')), 'C')"
+)
+
 
 class ClinicalTool(Base):
     """Clinical decision support tool."""
@@ -20,8 +27,14 @@ class ClinicalTool(Base):
     description = Column(Text, nullable=False)
     target_users = Column(ARRAY(Text))
     problem_solved = Column(Text)
-    embedding = Column(Vector(1536))
+    # Seed sync: natural key, hash of the embedding text and of every seeded field
+    source_key = Column(String(255))
+    content_hash = Column(String(64))
+    record_hash = Column(String(64))
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS))
+    search_vector = Column(TSVECTOR, Computed(SEARCH_VECTOR_SQL, persisted=True))
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     def to_dict(self) -> dict:
         """Convert to dictionary."""
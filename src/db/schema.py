@@ -1,19 +1,401 @@
 """Database schema initialization using SQLAlchemy."""
 
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+
 from sqlalchemy import text
 
-from src.db.models.base import Base, engine, init_extensions
+from src.config import (
+    EMBEDDING_DIMENSIONS,
+    HNSW_M,
+    HNSW_EF_CONSTRUCTION,
+    INDEX_BUILD_MAINTENANCE_WORK_MEM,
+    INDEX_BUILD_PARALLEL_WORKERS,
+    INDEX_BUILD_PROGRESS_SECONDS,
+    IVFFLAT_LISTS,
+    VECTOR_INDEX_TYPE,
+    VECTOR_QUANTIZATION,
+)
+from src.db.models.base import Base, engine, init_extensions, pgvector_version
+from src.db.models import organization, tool
 from src.db.models import (
     ClinicalOrganization,
     ClinicalTool,
     ChatThread,
     ChatMessage,
     LangGraphCheckpoint,
+    EmbeddingCacheEntry,
+    CorpusVersion,
+    RetrievalCacheEntry,
+    SemanticCacheEntry,
+    IngestCheckpoint,
+    ReembedJob,
 )
+from src.embeddings.spec import active_embedding
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+VECTOR_INDEX_TYPES = ("hnsw", "ivfflat")
+
+VECTOR_INDEXES = {
+    "clinical_organizations": "idx_org_embedding",
+    "clinical_tools": "idx_tool_embedding",
+}
+
+# B-tree/GIN indexes backing the structured retriever filters
+FILTER_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_org_state ON clinical_organizations (state)",
+    "CREATE INDEX IF NOT EXISTS idx_org_type ON clinical_organizations (org_type)",
+    "CREATE INDEX IF NOT EXISTS idx_org_specialty ON clinical_organizations (specialty)",
+    "CREATE INDEX IF NOT EXISTS idx_org_ai_use_cases ON clinical_organizations USING gin (ai_use_cases)",
+    "CREATE INDEX IF NOT EXISTS idx_tool_category ON clinical_tools (category)",
+    "CREATE INDEX IF NOT EXISTS idx_tool_target_users ON clinical_tools USING gin (target_users)",
+]
+
+SEARCH_VECTORS = {
+    "clinical_organizations": ("idx_org_search_vector", organization.SEARCH_VECTOR_SQL),
+    "clinical_tools": ("idx_tool_search_vector", tool.SEARCH_VECTOR_SQL),
+}
+
+# updated_at columns maintained by a trigger; in-process indexes refresh from them
+CHANGE_TRACKED = {
+    "clinical_organizations": "idx_org_updated_at",
+    "clinical_tools": "idx_tool_updated_at",
+}
+
+# Unique natural keys that incremental re-seeds upsert on
+SOURCE_KEYED = {
+    "clinical_organizations": "idx_org_source_key",
+    "clinical_tools": "idx_tool_source_key",
+}
+
+# Writes made with app.shadow_write = 'on' (re-embedding into a shadow column)
+# don't change what searches see, so they neither touch rows nor bump versions.
+TOUCH_UPDATED_AT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION touch_updated_at() RETURNS trigger AS $$
+    BEGIN
+        IF current_setting('app.shadow_write', true) = 'on' THEN
+            RETURN NEW;
+        END IF;
+        NEW.updated_at = now();
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+# Statement-level trigger: any INSERT/UPDATE/DELETE/TRUNCATE bumps the table's
+# corpus version, which invalidates cached retrieval results for that table.
+BUMP_CORPUS_VERSION_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_corpus_version() RETURNS trigger AS $$
+    BEGIN
+        IF current_setting('app.shadow_write', true) = 'on' THEN
+            RETURN NULL;
+        END IF;
+        INSERT INTO corpus_versions (table_name, version, updated_at)
+        VALUES (TG_TABLE_NAME, 1, now())
+        ON CONFLICT (table_name)
+        DO UPDATE SET version = corpus_versions.version + 1, updated_at = now();
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def hnsw_options(m: int = HNSW_M, ef_construction: int = HNSW_EF_CONSTRUCTION) -> str:
+    """WITH clause for HNSW index builds."""
+    return f"WITH (m = {int(m)}, ef_construction = {int(ef_construction)})"
+
+
+def ivfflat_lists(rows: int) -> int:
+    """IVFFlat cluster count for a table size: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    if rows <= 1_000_000:
+        return max(1, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def ivfflat_options(lists: int) -> str:
+    """WITH clause for IVFFlat index builds."""
+    return f"WITH (lists = {int(lists)})"
+
+
+def vector_index_sql(
+    table: str,
+    index: str,
+    index_type: str = VECTOR_INDEX_TYPE,
+    lists: int | None = None,
+    if_not_exists: bool = False,
+    concurrently: bool = False,
+    column: str = "embedding"
+) -> str:
+    """CREATE INDEX statement for a table's cosine embedding index."""
+    if index_type == "hnsw":
+        method = f"hnsw ({column} vector_cosine_ops) {hnsw_options()}"
+    elif index_type == "ivfflat":
+        method = f"ivfflat ({column} vector_cosine_ops) {ivfflat_options(lists or 1)}"
+    else:
+        raise ValueError(f"Unknown vector index type '{index_type}'; expected one of {VECTOR_INDEX_TYPES}")
+    exists = "IF NOT EXISTS " if if_not_exists else ""
+    concurrent = "CONCURRENTLY " if concurrently else ""
+    return f"CREATE INDEX {concurrent}{exists}{index} ON {table} USING {method}"
+
+
+def create_vector_index(
+    conn,
+    table: str,
+    index: str,
+    index_type: str = VECTOR_INDEX_TYPE,
+    lists: int | None = IVFFLAT_LISTS,
+    if_not_exists: bool = False
+) -> int | None:
+    """Build a table's embedding index; IVFFlat lists default to ivfflat_lists(row count). Returns lists."""
+    if index_type == "ivfflat" and lists is None:
+        lists = ivfflat_lists(conn.execute(text(f"SELECT count(*) FROM {table}")).scalar())
+    conn.execute(text(vector_index_sql(table, index, index_type, lists, if_not_exists)))
+    return lists if index_type == "ivfflat" else None
+
+
+def vector_index_type(conn, index: str) -> str | None:
+    """Access method ("hnsw", "ivfflat", ...) of an existing index, or None if it doesn't exist."""
+    return conn.execute(text("""
+        SELECT am.amname
+        FROM pg_class c
+        JOIN pg_am am ON am.oid = c.relam
+        WHERE c.oid = to_regclass(:index)
+    """), {"index": index}).scalar()
+
+
+def set_index_build_settings(
+    conn,
+    maintenance_work_mem: str = INDEX_BUILD_MAINTENANCE_WORK_MEM,
+    parallel_workers: int = INDEX_BUILD_PARALLEL_WORKERS
+) -> dict:
+    """
+    Session settings for an index build: HNSW builds are fastest while the
+    graph fits in maintenance_work_mem, and pgvector builds in parallel.
+    Returns the effective values (the server caps workers by max_parallel_workers).
+    Callers must RESET them before the connection goes back to the pool.
+    """
+    conn.execute(text("SELECT set_config('maintenance_work_mem', :value, false)"), {"value": maintenance_work_mem})
+    conn.execute(
+        text("SELECT set_config('max_parallel_maintenance_workers', :value, false)"),
+        {"value": str(int(parallel_workers))},
+    )
+    row = conn.execute(text("""
+        SELECT current_setting('maintenance_work_mem'),
+               least(current_setting('max_parallel_maintenance_workers')::int,
+                     current_setting('max_parallel_workers')::int)
+    """)).one()
+    return {"maintenance_work_mem": row[0], "parallel_workers": row[1]}
+
+
+def reset_index_build_settings(conn) -> None:
+    """Undo set_index_build_settings on a pooled connection."""
+    conn.execute(text("RESET maintenance_work_mem"))
+    conn.execute(text("RESET max_parallel_maintenance_workers"))
+
+
+def index_build_progress(conn, table: str) -> dict | None:
+    """Phase and completed fraction of a running CREATE INDEX on a table, from pg_stat_progress_create_index."""
+    row = conn.execute(text("""
+        SELECT phase, blocks_done, blocks_total, tuples_done, tuples_total
+        FROM pg_stat_progress_create_index
+        WHERE relid = to_regclass(:table)
+    """), {"table": table}).one_or_none()
+    if row is None:
+        return None
+    phase, blocks_done, blocks_total, tuples_done, tuples_total = row
+    if tuples_total:
+        done = tuples_done / tuples_total
+    elif blocks_total:
+        done = blocks_done / blocks_total
+    else:
+        done = None
+    return {"phase": phase, "tuples_done": tuples_done, "done": round(done, 3) if done is not None else None}
+
+
+def build_vector_index(
+    table: str,
+    index: str | None = None,
+    index_type: str = VECTOR_INDEX_TYPE,
+    lists: int | None = IVFFLAT_LISTS,
+    concurrently: bool = False,
+    maintenance_work_mem: str = INDEX_BUILD_MAINTENANCE_WORK_MEM,
+    parallel_workers: int = INDEX_BUILD_PARALLEL_WORKERS,
+    progress_seconds: float = INDEX_BUILD_PROGRESS_SECONDS,
+    column: str = "embedding"
+) -> dict:
+    """
+    Build a table's embedding index (default name from VECTOR_INDEXES) with
+    the tuned build settings, logging pg_stat_progress_create_index while it
+    runs. concurrently=True builds without blocking writes, for live tables;
+    it runs outside a transaction and a failed build leaves an invalid index
+    that the next build drops. Returns the settings, build time and the
+    progress samples.
+    """
+    index = index or VECTOR_INDEXES[table]
+    with engine.connect() as conn:
+        if index_type == "ivfflat" and lists is None:
+            lists = ivfflat_lists(conn.execute(text(f"SELECT count(*) FROM {table}")).scalar())
+        conn.commit()
+    sql = vector_index_sql(table, index, index_type, lists, concurrently=concurrently, column=column)
+
+    def build(conn):
+        try:
+            settings = set_index_build_settings(conn, maintenance_work_mem, parallel_workers)
+            conn.execute(text(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {index}"))
+            conn.execute(text(sql))
+            conn.commit()
+            return settings
+        finally:
+            conn.rollback()
+            reset_index_build_settings(conn)
+            conn.commit()
+
+    samples = []
+    started = time.perf_counter()
+    with engine.connect() as conn, \
+            engine.connect().execution_options(isolation_level="AUTOCOMMIT") as monitor, \
+            ThreadPoolExecutor(max_workers=1) as executor:
+        if concurrently:
+            # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+        future = executor.submit(build, conn)
+        while not wait([future], timeout=progress_seconds).done:
+            progress = index_build_progress(monitor, table)
+            if progress:
+                progress["seconds"] = round(time.perf_counter() - started, 1)
+                samples.append(progress)
+                done = f" {progress['done']:.0%}" if progress["done"] is not None else ""
+                logger.info(f"Building {index} on {table}: {progress['phase']}{done}")
+        settings = future.result()
+    seconds = time.perf_counter() - started
+    logger.info(
+        f"Built {index} on {table} as {index_type} in {seconds:.1f}s "
+        f"({settings['parallel_workers']} parallel workers, maintenance_work_mem {settings['maintenance_work_mem']})"
+    )
+    return {
+        "table": table,
+        "index": index,
+        "type": index_type,
+        "lists": lists if index_type == "ivfflat" else None,
+        "concurrently": concurrently,
+        **settings,
+        "build_seconds": round(seconds, 3),
+        "progress": samples,
+    }
+
+
+def rebuild_vector_indexes(
+    index_type: str = VECTOR_INDEX_TYPE,
+    lists: int | None = IVFFLAT_LISTS,
+    tables: list[str] | None = None,
+    concurrently: bool = False
+) -> list[dict]:
+    """
+    Rebuild the embedding indexes as index_type, re-clustering IVFFlat lists
+    for the current data. Each new index is built under a temporary name
+    while the old one keeps serving searches (writes wait unless
+    concurrently), then swapped in one short transaction.
+    """
+    report = []
+    for table in tables or list(VECTOR_INDEXES):
+        index = VECTOR_INDEXES[table]
+        result = build_vector_index(table, f"{index}_rebuild", index_type, lists, concurrently)
+        with engine.connect() as conn:
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            conn.execute(text(f"ALTER INDEX {index}_rebuild RENAME TO {index}"))
+            conn.execute(text(f"ANALYZE {table}"))
+            conn.commit()
+        report.append({**result, "index": index})
+    return report
+
+
+@contextmanager
+def deferred_vector_indexes(
+    tables: list[str] | None = None,
+    index_type: str = VECTOR_INDEX_TYPE,
+    concurrently: bool | None = None
+):
+    """
+    Drop the embedding indexes (and any quantized expression indexes) for a
+    bulk load and build them once, in parallel, when it finishes (or fails),
+    instead of inserting every row into the graph. Searches meanwhile fall
+    back to exact scans: correct, but slow on large tables.
+    concurrently=None builds concurrently on tables that already had rows,
+    assuming those are live. Yields the list that receives the build
+    reports. A failed build is logged and raised after the other tables are
+    built, unless the load itself failed, whose error then propagates.
+    """
+    tables = tables or list(VECTOR_INDEXES)
+    live, quantized = {}, {}
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in tables:
+            index = VECTOR_INDEXES[table]
+            live[table] = conn.execute(text(f"SELECT EXISTS (SELECT 1 FROM {table})")).scalar()
+            # Quantized expression indexes are rebuilt only if the table had them
+            quantized[table] = [q for q in QUANTIZED_EXPRESSIONS if vector_index_type(conn, f"{index}_{q}")]
+            for name in [index] + [f"{index}_{q}" for q in quantized[table]]:
+                conn.execute(text(f"DROP INDEX {'CONCURRENTLY ' if live[table] else ''}IF EXISTS {name}"))
+            logger.info(f"Deferred the vector indexes on {table} until the load finishes")
+    report = []
+    load_failed = False
+    try:
+        yield report
+    except BaseException:
+        load_failed = True
+        raise
+    finally:
+        errors = []
+        for table in tables:
+            build_concurrently = live[table] if concurrently is None else concurrently
+            try:
+                result = build_vector_index(table, index_type=index_type, concurrently=build_concurrently)
+                result["quantized_indexes"] = build_quantized_indexes(
+                    table, quantized[table], index_type, build_concurrently
+                )
+                report.append(result)
+                with engine.connect() as conn:
+                    conn.execute(text(f"ANALYZE {table}"))
+                    conn.commit()
+            except Exception as e:
+                # Keep building the other tables, and don't hide a load error behind a build error
+                errors.append(e)
+                logger.exception(f"Failed to build the deferred vector indexes on {table}: {e}")
+        if errors and not load_failed:
+            raise errors[0]
+
+
+def recluster_vector_indexes(
+    tables: list[str] | None = None,
+    index_type: str = VECTOR_INDEX_TYPE
+) -> list[dict]:
+    """
+    Rebuild IVFFlat indexes after a load changed their tables: their lists
+    are clustered when the index is built and never move, so a load can
+    leave the new rows crowded into a few lists. HNSW graphs take new rows
+    as they come, so there is nothing to do for them.
+    """
+    if index_type != "ivfflat":
+        return []
+    return rebuild_vector_indexes(index_type, tables=tables)
+
+
+def check_vector_index_types(conn, index_type: str = VECTOR_INDEX_TYPE) -> bool:
+    """Warn when an existing embedding index was built as a different type than configured."""
+    matches = True
+    for table, index in VECTOR_INDEXES.items():
+        actual = vector_index_type(conn, index)
+        if actual is not None and actual != index_type:
+            matches = False
+            logger.warning(
+                f"{index} on {table} is {actual} but VECTOR_INDEX_TYPE={index_type}; "
+                f"run scripts/rebuild_vector_indexes.py"
+            )
+    return matches
+
 
 def init_schema():
     """Initialize database schema with pgvector extension."""
@@ -25,30 +407,256 @@ def init_schema():
         logger.info("Creating tables from SQLAlchemy models...")
         Base.metadata.create_all(bind=engine)
         
-        logger.info("Creating HNSW indexes for vector search...")
+        logger.info(f"Creating {VECTOR_INDEX_TYPE} indexes for vector search...")
         with engine.connect() as conn:
-            conn.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_org_embedding 
-                ON clinical_organizations 
-                USING hnsw (embedding vector_cosine_ops)
-            """))
-            conn.execute(text("""
-                CREATE INDEX IF NOT EXISTS idx_tool_embedding 
-                ON clinical_tools 
-                USING hnsw (embedding vector_cosine_ops)
-            """))
+            for table, index in VECTOR_INDEXES.items():
+                create_vector_index(conn, table, index, if_not_exists=True)
+            check_vector_index_types(conn)
+            for statement in FILTER_INDEXES:
+                conn.execute(text(statement))
             conn.execute(text("""
                 CREATE INDEX IF NOT EXISTS idx_messages_thread 
                 ON chat_messages(thread_id, created_at)
             """))
+            # A flipped re-embedding may hold another width than configured
+            create_quantized_indexes(conn, active_embedding()[2])
+            create_search_vectors(conn)
+            create_change_tracking(conn)
+            create_source_keys(conn)
+            create_corpus_versioning(conn)
+            # Always HNSW: the cache churns constantly, which IVFFlat's fixed centroids don't follow
+            conn.execute(text(f"""
+                CREATE INDEX IF NOT EXISTS idx_semantic_cache_embedding
+                ON semantic_cache
+                USING hnsw (embedding vector_cosine_ops) {hnsw_options()}
+            """))
             conn.commit()
         
+        check_embedding_dimensions()
         logger.info("Schema initialized successfully.")
     except Exception as e:
         logger.exception(f"Failed to initialize schema: {e}")
         raise
 
 
+def create_search_vectors(conn):
+    """Add the generated full-text search columns (for tables created earlier) and their GIN indexes."""
+    for table, (index, expression) in SEARCH_VECTORS.items():
+        conn.execute(text(f"""
+            ALTER TABLE {table}
+            ADD COLUMN IF NOT EXISTS search_vector tsvector
+            GENERATED ALWAYS AS ({expression}) STORED
+        """))
+        conn.execute(text(f"""
+            CREATE INDEX IF NOT EXISTS {index}
+            ON {table}
+            USING gin (search_vector)
+        """))
+
+
+def create_change_tracking(conn):
+    """Add updated_at columns (for tables created earlier), their indexes and the touch trigger."""
+    conn.execute(text(TOUCH_UPDATED_AT_FUNCTION))
+    for table, index in CHANGE_TRACKED.items():
+        conn.execute(text(f"""
+            ALTER TABLE {table}
+            ADD COLUMN IF NOT EXISTS updated_at timestamptz NOT NULL DEFAULT now()
+        """))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index} ON {table} (updated_at)"))
+        conn.execute(text(f"""
+            CREATE OR REPLACE TRIGGER {table}_touch_updated_at
+            BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION touch_updated_at()
+        """))
+
+
+def create_source_keys(conn):
+    """
+    Add the seed sync columns (for tables created earlier) and unique key
+    indexes. Rows seeded before keys existed are keyed by name, lowest id
+    first; their hashes stay empty, so the next sync re-embeds them once.
+    """
+    for table, index in SOURCE_KEYED.items():
+        for column, column_type in (
+            ("source_key", "varchar(255)"),
+            ("content_hash", "varchar(64)"),
+            ("record_hash", "varchar(64)"),
+        ):
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN IF NOT EXISTS {column} {column_type}"))
+        conn.execute(text(f"""
+            UPDATE {table} t
+            SET source_key = t.name
+            FROM (SELECT min(id) AS id FROM {table} WHERE source_key IS NULL GROUP BY name) first
+            WHERE t.id = first.id
+              AND NOT EXISTS (SELECT 1 FROM {table} k WHERE k.source_key = t.name)
+        """))
+        conn.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {index} ON {table} (source_key)"))
+
+
+def create_corpus_versioning(conn):
+    """Install the corpus version triggers on the vector tables."""
+    conn.execute(text(BUMP_CORPUS_VERSION_FUNCTION))
+    for table in CHANGE_TRACKED:
+        conn.execute(text("""
+            INSERT INTO corpus_versions (table_name, version) VALUES (:table, 0)
+            ON CONFLICT (table_name) DO NOTHING
+        """), {"table": table})
+        conn.execute(text(f"""
+            CREATE OR REPLACE TRIGGER {table}_bump_corpus_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_corpus_version()
+        """))
+
+
+def check_embedding_dimensions() -> bool:
+    """Warn when stored vector columns don't match the active embedding's dimensions."""
+    _, _, dimensions = active_embedding()
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT c.relname AS table_name, a.atttypmod AS dimensions
+            FROM pg_attribute a
+            JOIN pg_class c ON c.oid = a.attrelid
+            WHERE c.relname IN ('clinical_organizations', 'clinical_tools')
+              AND a.attname = 'embedding'
+        """)).fetchall()
+    
+    matches = True
+    for row in rows:
+        if row.dimensions != dimensions:
+            matches = False
+            logger.warning(
+                f"{row.table_name}.embedding is vector({row.dimensions}) but the active embedding "
+                f"has {dimensions} dimensions; run scripts/resize_embeddings.py and re-seed, "
+                f"or re-embed with scripts/reembed.py"
+            )
+    return matches
+
+
+def supports_quantization(conn) -> bool:
+    """halfvec and binary_quantize need pgvector >= 0.7.0."""
+    return pgvector_version(conn) >= (0, 7)
+
+
+# Expression and operator class of each quantized retriever mode's candidate index
+QUANTIZED_EXPRESSIONS = {
+    "halfvec": ("embedding::halfvec({dims})", "halfvec_cosine_ops"),
+    "binary": ("binary_quantize(embedding)::bit({dims})", "bit_hamming_ops"),
+}
+
+
+def quantized_index_sql(
+    table: str,
+    index: str,
+    quantization: str,
+    dimensions: int,
+    index_type: str = VECTOR_INDEX_TYPE,
+    lists: int | None = None,
+    concurrently: bool = False
+) -> str:
+    """CREATE INDEX IF NOT EXISTS statement for a table's halfvec or binary expression index."""
+    if quantization not in QUANTIZED_EXPRESSIONS:
+        raise ValueError(f"Unknown quantization '{quantization}'; expected one of {list(QUANTIZED_EXPRESSIONS)}")
+    expression, opclass = QUANTIZED_EXPRESSIONS[quantization]
+    if index_type == "hnsw":
+        options = hnsw_options()
+    elif index_type == "ivfflat":
+        options = ivfflat_options(lists or 1)
+    else:
+        raise ValueError(f"Unknown vector index type '{index_type}'; expected one of {VECTOR_INDEX_TYPES}")
+    return (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {index}_{quantization} ON {table} "
+        f"USING {index_type} (({expression.format(dims=int(dimensions))}) {opclass}) {options}"
+    )
+
+
+def create_quantized_indexes(
+    conn,
+    dimensions: int = EMBEDDING_DIMENSIONS,
+    quantizations: tuple[str, ...] = (VECTOR_QUANTIZATION,),
+    index_type: str = VECTOR_INDEX_TYPE,
+    lists: int | None = IVFFLAT_LISTS
+) -> bool:
+    """
+    Create the halfvec / binary-quantized expression indexes of the given
+    retriever modes (by default only the configured VECTOR_QUANTIZATION's),
+    as VECTOR_INDEX_TYPE. Returns False when none is needed or pgvector is
+    too old.
+    """
+    quantizations = [q for q in quantizations if q != "none"]
+    if not quantizations:
+        return False
+    if not supports_quantization(conn):
+        logger.warning("pgvector < 0.7.0: skipping quantized (halfvec/binary) indexes")
+        return False
+    for table, index in VECTOR_INDEXES.items():
+        table_lists = lists
+        if index_type == "ivfflat" and table_lists is None:
+            table_lists = ivfflat_lists(conn.execute(text(f"SELECT count(*) FROM {table}")).scalar())
+        for quantization in quantizations:
+            conn.execute(text(quantized_index_sql(table, index, quantization, dimensions, index_type, table_lists)))
+    return True
+
+
+def build_quantized_indexes(
+    table: str,
+    quantizations: list[str],
+    index_type: str = VECTOR_INDEX_TYPE,
+    concurrently: bool = False,
+    lists: int | None = IVFFLAT_LISTS
+) -> list[str]:
+    """
+    Build a table's quantized expression indexes at its embedding column's
+    current width, with the tuned build settings. Returns their names.
+    """
+    if not quantizations:
+        return []
+    index = VECTOR_INDEXES[table]
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        dimensions = conn.execute(text("""
+            SELECT atttypmod FROM pg_attribute
+            WHERE attrelid = to_regclass(:table) AND attname = 'embedding'
+        """), {"table": table}).scalar()
+        if index_type == "ivfflat" and lists is None:
+            lists = ivfflat_lists(conn.execute(text(f"SELECT count(*) FROM {table}")).scalar())
+        set_index_build_settings(conn)
+        try:
+            for quantization in quantizations:
+                conn.execute(text(
+                    quantized_index_sql(table, index, quantization, dimensions, index_type, lists, concurrently)
+                ))
+        finally:
+            reset_index_build_settings(conn)
+    logger.info(f"Built the {'/'.join(quantizations)} indexes on {table} as {index_type}")
+    return [f"{index}_{quantization}" for quantization in quantizations]
+
+
+def resize_embedding_columns(dimensions: int = EMBEDDING_DIMENSIONS):
+    """Change vector column width, clearing embeddings and rebuilding the vector indexes."""
+    with engine.connect() as conn:
+        for table, index in VECTOR_INDEXES.items():
+            logger.warning(f"Resizing {table}.embedding to vector({dimensions}); embeddings cleared")
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}_halfvec"))
+            conn.execute(text(f"DROP INDEX IF EXISTS {index}_binary"))
+            conn.execute(text(
+                f"ALTER TABLE {table} ALTER COLUMN embedding TYPE vector({int(dimensions)}) USING NULL"
+            ))
+            create_vector_index(conn, table, index)
+        create_quantized_indexes(conn, dimensions)
+        # Cached answers were matched in the old embedding space
+        conn.execute(text("TRUNCATE semantic_cache"))
+        conn.execute(text("DROP INDEX IF EXISTS idx_semantic_cache_embedding"))
+        conn.execute(text(
+            f"ALTER TABLE semantic_cache ALTER COLUMN embedding TYPE vector({int(dimensions)})"
+        ))
+        conn.execute(text(
+            f"CREATE INDEX idx_semantic_cache_embedding ON semantic_cache "
+            f"USING hnsw (embedding vector_cosine_ops) {hnsw_options()}"
+        ))
+        conn.commit()
+    logger.info("Embedding columns resized; re-run the seed to re-embed.")
+
+
 def drop_tables():
     """Drop all tables (use with caution)."""
     logger.warning("Dropping all tables...")
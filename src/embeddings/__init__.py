@@ -0,0 +1,36 @@
+"""Embedding backend selected by EMBEDDING_BACKEND ("openai" or "local")."""
+
+import importlib
+from types import ModuleType
+
+from src.config import EMBEDDING_BACKEND
+from src.embeddings.spec import EmbeddingSpec, active_embedding
+
+_BACKENDS = {
+    "openai": "src.embeddings.openai_embed",
+    "local": "src.embeddings.local_embed",
+}
+
+
+def get_backend(name: str = EMBEDDING_BACKEND) -> ModuleType:
+    """Import and return an embedding backend module (default: the configured one)."""
+    if name not in _BACKENDS:
+        raise ValueError(
+            f"Unknown EMBEDDING_BACKEND '{name}', expected one of {sorted(_BACKENDS)}"
+        )
+    return importlib.import_module(_BACKENDS[name])
+
+
+def get_embedding(text: str) -> list[float]:
+    """Get embedding vector for a single text in the embedding the vector columns hold."""
+    backend, model, dimensions = active_embedding()
+    return get_backend(backend).get_embedding(text, model=model, dimensions=dimensions)
+
+
+def get_embeddings_batch(texts: list[str], spec: EmbeddingSpec | None = None) -> list[list[float]]:
+    """Get embeddings for multiple texts, in `spec` or else the embedding the vector columns hold."""
+    backend, model, dimensions = spec or active_embedding()
+    return get_backend(backend).get_embeddings_batch(texts, model=model, dimensions=dimensions)
+
+
+__all__ = ["get_backend", "get_embedding", "get_embeddings_batch"]
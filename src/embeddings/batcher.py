@@ -0,0 +1,166 @@
+"""Micro-batching embedding client that coalesces concurrent single-text requests."""
+
+import asyncio
+import bisect
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Histogram:
+    """Thread-safe fixed-bucket histogram (cumulative upper bounds, like Prometheus)."""
+
+    def __init__(self, buckets: list[float]):
+        self.buckets = sorted(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> dict:
+        """Return cumulative bucket counts plus count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+        cumulative, running = {}, 0
+        for bound, count in zip(self.buckets, counts):
+            running += count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = running + counts[-1]
+        return {"buckets": cumulative, "count": cumulative["+Inf"], "sum": round(total_sum, 3)}
+
+
+@dataclass
+class _PendingEmbedding:
+    text: str
+    enqueued_at: float = field(default_factory=time.perf_counter)
+    future: Future = field(default_factory=Future)
+
+
+class EmbeddingBatcher:
+    """
+    Collect concurrent embedding requests for up to max_wait_ms and send them
+    as one batched call, then fan the vectors back out to the callers.
+
+    Works from sync threads (__call__/embed_many) and asyncio (aembed).
+    """
+
+    def __init__(
+        self,
+        embed_batch_fn: Callable[[list[str]], list[list[float]]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_concurrency: int = 4
+    ):
+        self.embed_batch_fn = embed_batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: queue.Queue[_PendingEmbedding | None] = queue.Queue()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="embedding-batch"
+        )
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.queue_wait_ms = Histogram([0.5, 1, 2, 5, 10, 25, 50, 100, 250])
+
+    def submit(self, text: str) -> Future:
+        """Enqueue a text and return a future resolving to its embedding."""
+        self._ensure_started()
+        pending = _PendingEmbedding(text=text)
+        self._queue.put(pending)
+        return pending.future
+
+    def __call__(self, text: str) -> list[float]:
+        """Embed a single text, blocking until its batch completes."""
+        return self.submit(text).result()
+
+    def embed_many(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts through the batch queue, preserving order."""
+        futures = [self.submit(t) for t in texts]
+        return [f.result() for f in futures]
+
+    async def aembed(self, text: str) -> list[float]:
+        """Embed a single text without blocking the event loop."""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def stats(self) -> dict:
+        """Batch size and queue wait histograms."""
+        return {
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_ms": self.queue_wait_ms.snapshot(),
+        }
+
+    def close(self) -> None:
+        """Stop the collector thread after draining queued requests."""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._executor.shutdown(wait=True)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._collect, name="embedding-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            deadline = first.enqueued_at + self.max_wait
+            stop = False
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._executor.submit(self._dispatch, batch)
+            if stop:
+                return
+
+    def _dispatch(self, batch: list[_PendingEmbedding]) -> None:
+        started = time.perf_counter()
+        for pending in batch:
+            self.queue_wait_ms.observe((started - pending.enqueued_at) * 1000)
+        unique_texts = list(dict.fromkeys(p.text for p in batch))
+        self.batch_sizes.observe(len(unique_texts))
+        logger.debug(f"Dispatching embedding batch: {len(batch)} requests, {len(unique_texts)} unique")
+        try:
+            embeddings = self.embed_batch_fn(unique_texts)
+            if len(embeddings) != len(unique_texts):
+                raise ValueError(
+                    f"Expected {len(unique_texts)} embeddings, got {len(embeddings)}"
+                )
+            vectors = dict(zip(unique_texts, embeddings))
+        except Exception as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+        for pending in batch:
+            pending.future.set_result(vectors[pending.text])
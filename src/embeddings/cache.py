@@ -0,0 +1,209 @@
+"""Content-addressed embedding cache with an in-process LRU tier and a persistent tier."""
+
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Callable, Protocol
+
+from sqlalchemy import text
+
+from src.db.models.base import engine
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_text(value: str) -> str:
+    """Normalize text so trivially different inputs share a cache entry."""
+    return unicodedata.normalize("NFC", " ".join(value.split()))
+
+
+@dataclass
+class CacheStats:
+    """Counters for cache effectiveness."""
+    hits: int = 0
+    persistent_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.persistent_hits + self.misses
+        return (self.hits + self.persistent_hits) / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class EmbeddingStore(Protocol):
+    """Protocol for the persistent embedding tier."""
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        ...
+
+    def put_many(self, entries: dict[str, list[float]], model: str, dimensions: int) -> int:
+        ...
+
+
+class PostgresEmbeddingStore:
+    """Persistent embedding tier backed by the embedding_cache table."""
+
+    def __init__(self, max_entries: int, prune_every: int = 100):
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._writes = 0
+
+    def get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        """Fetch cached embeddings for the given keys."""
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT cache_key, embedding::text AS embedding
+                FROM embedding_cache
+                WHERE cache_key = ANY(:keys)
+            """), {"keys": keys})
+            return {
+                row.cache_key: [float(x) for x in row.embedding.strip("[]").split(",")]
+                for row in result
+            }
+
+    def put_many(self, entries: dict[str, list[float]], model: str, dimensions: int) -> int:
+        """Store embeddings, periodically pruning the oldest rows beyond max_entries.
+
+        Returns the number of evicted rows.
+        """
+        with engine.connect() as conn:
+            conn.execute(text("""
+                INSERT INTO embedding_cache (cache_key, model, dimensions, embedding, created_at)
+                VALUES (:key, :model, :dimensions, CAST(:embedding AS vector), now())
+                ON CONFLICT (cache_key) DO NOTHING
+            """), [
+                {"key": key, "model": model, "dimensions": dimensions, "embedding": str(vec)}
+                for key, vec in entries.items()
+            ])
+            evicted = 0
+            self._writes += 1
+            if self._writes % self.prune_every == 0:
+                result = conn.execute(text("""
+                    DELETE FROM embedding_cache
+                    WHERE cache_key IN (
+                        SELECT cache_key FROM embedding_cache
+                        ORDER BY created_at DESC
+                        OFFSET :max_entries
+                    )
+                """), {"max_entries": self.max_entries})
+                evicted = result.rowcount or 0
+            conn.commit()
+            return evicted
+
+
+class EmbeddingCache:
+    """
+    Cache keyed by (model, dimensions, normalized text hash).
+
+    Lookups go LRU -> persistent store -> compute. Misses are computed in a
+    single call to the supplied compute function and written back to both tiers.
+    Persistent store failures are logged and never fail an embedding request.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        dimensions: int,
+        max_entries: int = 10000,
+        store: EmbeddingStore | None = None
+    ):
+        self.model = model
+        self.dimensions = dimensions
+        self.max_entries = max_entries
+        self.store = store
+        self._lru: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def key(self, value: str) -> str:
+        """Content-addressed cache key for a text."""
+        payload = f"{self.model}\x00{self.dimensions}\x00{normalize_text(value)}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(**{**asdict(self._stats), "size": len(self._lru)})
+
+    def clear(self) -> None:
+        """Drop the in-process tier and reset counters."""
+        with self._lock:
+            self._lru.clear()
+            self._stats = CacheStats()
+
+    def get_many(
+        self,
+        texts: list[str],
+        compute: Callable[[list[str]], list[list[float]]]
+    ) -> list[list[float]]:
+        """Return embeddings for texts, computing only the ones not cached."""
+        keys = [self.key(t) for t in texts]
+        found = self._lru_get_many(keys)
+
+        pending = [k for k in dict.fromkeys(keys) if k not in found]
+        if pending and self.store is not None:
+            stored = self._store_get_many(pending)
+            if stored:
+                found.update(stored)
+                self._lru_put_many(stored)
+                with self._lock:
+                    self._stats.persistent_hits += sum(1 for k in keys if k in stored)
+                pending = [k for k in pending if k not in stored]
+
+        if pending:
+            texts_by_key = dict(zip(keys, texts))
+            computed = dict(zip(pending, compute([texts_by_key[k] for k in pending])))
+            found.update(computed)
+            self._lru_put_many(computed)
+            with self._lock:
+                self._stats.misses += sum(1 for k in keys if k in computed)
+            if self.store is not None:
+                self._store_put_many(computed)
+
+        return [found[k] for k in keys]
+
+    def _lru_get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        found = {}
+        with self._lock:
+            for k in keys:
+                if k in self._lru:
+                    self._lru.move_to_end(k)
+                    found[k] = self._lru[k]
+                    self._stats.hits += 1
+        return found
+
+    def _lru_put_many(self, entries: dict[str, list[float]]) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for k, vec in entries.items():
+                self._lru[k] = vec
+                self._lru.move_to_end(k)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+                self._stats.evictions += 1
+
+    def _store_get_many(self, keys: list[str]) -> dict[str, list[float]]:
+        try:
+            return self.store.get_many(keys)
+        except Exception as e:
+            logger.warning(f"Embedding cache store lookup failed: {e}")
+            return {}
+
+    def _store_put_many(self, entries: dict[str, list[float]]) -> None:
+        try:
+            evicted = self.store.put_many(entries, self.model, self.dimensions)
+            if evicted:
+                with self._lock:
+                    self._stats.evictions += evicted
+        except Exception as e:
+            logger.warning(f"Embedding cache store write failed: {e}")
@@ -0,0 +1,79 @@
+"""Token-aware chunking and concurrent dispatch for large embedding batches."""
+
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservative token estimate (~3 characters per token for clinical text)."""
+    return len(text) // 3 + 1
+
+
+def chunk_ranges(texts: list[str], max_items: int, max_tokens: int) -> list[tuple[int, int]]:
+    """
+    Split texts into contiguous [start, end) ranges bounded by item count and
+    estimated tokens. A single text above max_tokens gets a range of its own.
+    """
+    ranges = []
+    start, tokens = 0, 0
+    for i, text in enumerate(texts):
+        cost = estimate_tokens(text)
+        if i > start and (i - start >= max_items or tokens + cost > max_tokens):
+            ranges.append((start, i))
+            start, tokens = i, 0
+        tokens += cost
+    if start < len(texts):
+        ranges.append((start, len(texts)))
+    return ranges
+
+
+def _with_retries(
+    fn: Callable[[], list[list[float]]],
+    max_retries: int,
+    backoff_seconds: float,
+    retry_on: tuple[type[Exception], ...]
+) -> list[list[float]]:
+    """Call fn, retrying retryable errors with exponential backoff and jitter."""
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except retry_on as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff_seconds * (2 ** attempt) * (1 + random.random())
+            logger.warning(
+                f"Embedding chunk failed ({e}); retry {attempt + 1}/{max_retries} in {delay:.2f}s"
+            )
+            time.sleep(delay)
+
+
+def embed_in_chunks(
+    texts: list[str],
+    embed_fn: Callable[[list[str]], list[list[float]]],
+    max_items: int,
+    max_tokens: int,
+    concurrency: int = 4,
+    max_retries: int = 5,
+    backoff_seconds: float = 0.5,
+    retry_on: tuple[type[Exception], ...] = (Exception,)
+) -> list[list[float]]:
+    """Embed texts in bounded chunks with bounded parallelism, preserving input order."""
+    ranges = chunk_ranges(texts, max_items, max_tokens)
+    if len(ranges) <= 1:
+        return _with_retries(lambda: embed_fn(texts), max_retries, backoff_seconds, retry_on)
+
+    logger.info(f"Embedding {len(texts)} texts in {len(ranges)} chunks (concurrency={concurrency})")
+
+    def run(bounds: tuple[int, int]) -> list[list[float]]:
+        chunk = texts[bounds[0]:bounds[1]]
+        return _with_retries(lambda: embed_fn(chunk), max_retries, backoff_seconds, retry_on)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="embedding-chunk") as pool:
+        results = list(pool.map(run, ranges))
+    return [vec for chunk in results for vec in chunk]
@@ -0,0 +1,53 @@
+"""Request-scoped reuse of query embeddings."""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+_scope: ContextVar[dict | None] = ContextVar("embedding_scope", default=None)
+
+
+@contextmanager
+def embedding_scope(memo: dict | None = None) -> Iterator[None]:
+    """
+    Share query embeddings inside the block.
+
+    Every retriever that embeds the same text with the same embedding function
+    inside one scope gets the vector computed by the first call. Nested scopes
+    reuse the outermost one. Passing the same memo to several blocks shares
+    the vectors between them, e.g. across the steps of a generator, which
+    must not keep a scope open across a yield: each step may resume in
+    another context.
+    """
+    if _scope.get() is not None:
+        yield
+        return
+    token = _scope.set({} if memo is None else memo)
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+def scoped_embedding(embed_fn: Callable[[str], list[float]], text: str) -> list[float]:
+    """Embed text, reusing a vector already computed in the current scope."""
+    memo = _scope.get()
+    if memo is None:
+        return embed_fn(text)
+    key = (embed_fn, text)
+    if key not in memo:
+        memo[key] = embed_fn(text)
+    else:
+        logger.debug(f"Reusing scoped embedding for: '{text[:50]}...'")
+    return memo[key]
+
+
+def forget_scoped_embeddings() -> None:
+    """Drop the current scope's vectors, e.g. ones embedded before a re-embedding flip."""
+    memo = _scope.get()
+    if memo:
+        memo.clear()
@@ -0,0 +1,128 @@
+"""Offline CPU embedding backend using a deterministic hashing vectorizer."""
+
+import hashlib
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from src.config import EMBEDDING_DIMENSIONS, LOCAL_EMBEDDING_WORKERS
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+LOCAL_EMBEDDING_MODEL = "local-hashing-v1"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash_feature(feature: str, dimensions: int) -> tuple[int, float]:
+    """Stable (index, sign) for a feature; Python's hash() is salted per process."""
+    digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+    return digest % dimensions, 1.0 if (digest >> 63) & 1 else -1.0
+
+
+def _features(text: str) -> list[str]:
+    """Word unigrams, word bigrams and character trigrams of each word."""
+    words = _TOKEN_RE.findall(text.lower())
+    features = [f"w:{w}" for w in words]
+    features += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        features += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    return features or ["<empty>"]
+
+
+def embed_texts(texts: list[str], dimensions: int) -> np.ndarray:
+    """Embed texts into an L2-normalized float32 matrix of shape (len(texts), dimensions)."""
+    rows, cols, signs = [], [], []
+    for row, text in enumerate(texts):
+        for feature in _features(text):
+            col, sign = _hash_feature(feature, dimensions)
+            rows.append(row)
+            cols.append(col)
+            signs.append(sign)
+
+    matrix = np.zeros((len(texts), dimensions), dtype=np.float32)
+    np.add.at(matrix, (np.asarray(rows), np.asarray(cols)), np.asarray(signs, dtype=np.float32))
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class LocalEmbedder:
+    """
+    Hashing-vectorizer embedder that runs entirely on CPU.
+
+    Batches above parallel_threshold are split across a process pool so large
+    seeds use every core; smaller batches are embedded inline.
+    """
+
+    def __init__(
+        self,
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        workers: int = LOCAL_EMBEDDING_WORKERS,
+        parallel_threshold: int = 1024
+    ):
+        self.dimensions = dimensions
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self._pool: ProcessPoolExecutor | None = None
+
+    def embed_batch(self, texts: list[str]) -> np.ndarray:
+        """Embed texts, fanning out to the worker pool for large batches."""
+        if self.workers <= 1 or len(texts) < self.parallel_threshold:
+            return embed_texts(texts, self.dimensions)
+
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        chunk_size = -(-len(texts) // self.workers)
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        parts = self._pool.map(embed_texts, chunks, [self.dimensions] * len(chunks))
+        return np.vstack(list(parts))
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+local_embedder = LocalEmbedder()
+
+# Embedders at other widths (a re-embedding target); hashing has no model to vary
+_other_embedders: dict[int, LocalEmbedder] = {}
+
+
+def _embedder_for(dimensions: int) -> LocalEmbedder:
+    if dimensions == local_embedder.dimensions:
+        return local_embedder
+    return _other_embedders.setdefault(dimensions, LocalEmbedder(dimensions=dimensions))
+
+
+def get_embedding(
+    text: str,
+    model: str = LOCAL_EMBEDDING_MODEL,
+    dimensions: int = EMBEDDING_DIMENSIONS
+) -> list[float]:
+    """Get embedding vector for a single text."""
+    logger.debug(f"Getting local embedding for text: '{text[:50]}...'")
+    return _embedder_for(dimensions).embed_batch([text])[0].tolist()
+
+
+def get_embeddings_batch(
+    texts: list[str],
+    model: str = LOCAL_EMBEDDING_MODEL,
+    dimensions: int = EMBEDDING_DIMENSIONS
+) -> list[list[float]]:
+    """Get embeddings for multiple texts."""
+    logger.info(f"Getting local batch embeddings for {len(texts)} texts")
+    try:
+        embeddings = _embedder_for(dimensions).embed_batch(texts).tolist()
+        logger.info(f"Local batch embeddings computed: {len(embeddings)} vectors")
+        return embeddings
+    except Exception as e:
+        logger.exception(f"Failed to compute local batch embeddings: {e}")
+        raise
@@ -1,37 +1,156 @@
-from openai import OpenAI
-from src.config import OPENAI_API_KEY, EMBEDDING_MODEL
+import threading
+
+from openai import (
+    OpenAI,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError,
+    RateLimitError,
+)
+from src.config import (
+    OPENAI_API_KEY,
+    EMBEDDING_MODEL,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_CACHE_SIZE,
+    EMBEDDING_CACHE_PERSIST,
+    EMBEDDING_CACHE_PERSIST_MAX_ENTRIES,
+    EMBEDDING_BATCHING,
+    EMBEDDING_BATCH_MAX_SIZE,
+    EMBEDDING_BATCH_MAX_WAIT_MS,
+    EMBEDDING_CHUNK_MAX_ITEMS,
+    EMBEDDING_CHUNK_MAX_TOKENS,
+    EMBEDDING_CHUNK_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+)
+from src.embeddings.batcher import EmbeddingBatcher
+from src.embeddings.cache import EmbeddingCache, PostgresEmbeddingStore
+from src.embeddings.chunking import embed_in_chunks
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
 client = OpenAI(api_key=OPENAI_API_KEY)
 
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+
+# Caches for embeddings other than the configured one (a re-embedding target)
+_other_caches: dict[tuple[str, int], EmbeddingCache] = {}
+_other_caches_lock = threading.Lock()
+
+embedding_cache = EmbeddingCache(
+    model=EMBEDDING_MODEL,
+    dimensions=EMBEDDING_DIMENSIONS,
+    max_entries=EMBEDDING_CACHE_SIZE,
+    store=PostgresEmbeddingStore(EMBEDDING_CACHE_PERSIST_MAX_ENTRIES)
+    if EMBEDDING_CACHE_PERSIST else None
+)
+
+
+def _create_embeddings(
+    texts: list[str],
+    dimensions: int | None = EMBEDDING_DIMENSIONS,
+    model: str = EMBEDDING_MODEL
+) -> list[list[float]]:
+    """Call the embeddings API for texts that missed the cache."""
+    params = {"model": model, "input": texts}
+    if dimensions and model.startswith("text-embedding-3"):
+        params["dimensions"] = dimensions
+    response = client.embeddings.create(**params)
+    return [item.embedding for item in response.data]
+
+
+embedding_batcher = EmbeddingBatcher(
+    _create_embeddings,
+    max_batch_size=EMBEDDING_BATCH_MAX_SIZE,
+    max_wait_ms=EMBEDDING_BATCH_MAX_WAIT_MS
+) if EMBEDDING_BATCHING else None
+
+
+def _create_query_embeddings(texts: list[str]) -> list[list[float]]:
+    """Route single-query cache misses through the micro-batcher when enabled."""
+    if embedding_batcher is None:
+        return _create_embeddings(texts)
+    return embedding_batcher.embed_many(texts)
 
-def get_embedding(text: str) -> list[float]:
+
+def _create_embeddings_chunked(
+    texts: list[str],
+    model: str = EMBEDDING_MODEL,
+    dimensions: int = EMBEDDING_DIMENSIONS
+) -> list[list[float]]:
+    """Split large inputs into provider-sized chunks dispatched concurrently with retries."""
+    return embed_in_chunks(
+        texts,
+        lambda chunk: _create_embeddings(chunk, dimensions, model),
+        max_items=EMBEDDING_CHUNK_MAX_ITEMS,
+        max_tokens=EMBEDDING_CHUNK_MAX_TOKENS,
+        concurrency=EMBEDDING_CHUNK_CONCURRENCY,
+        max_retries=EMBEDDING_MAX_RETRIES,
+        retry_on=RETRYABLE_ERRORS
+    )
+
+
+def get_native_embeddings(texts: list[str]) -> list[list[float]]:
+    """Embed texts at the model's native width, bypassing the cache (for dimension studies)."""
+    return embed_in_chunks(
+        texts,
+        lambda chunk: _create_embeddings(chunk, dimensions=None),
+        max_items=EMBEDDING_CHUNK_MAX_ITEMS,
+        max_tokens=EMBEDDING_CHUNK_MAX_TOKENS,
+        concurrency=EMBEDDING_CHUNK_CONCURRENCY,
+        max_retries=EMBEDDING_MAX_RETRIES,
+        retry_on=RETRYABLE_ERRORS
+    )
+
+
+def _cache_for(model: str, dimensions: int) -> EmbeddingCache:
+    """The embedding cache for a model and width; other than the configured one only while re-embedding."""
+    if (model, dimensions) == (EMBEDDING_MODEL, EMBEDDING_DIMENSIONS):
+        return embedding_cache
+    with _other_caches_lock:
+        if (model, dimensions) not in _other_caches:
+            _other_caches[(model, dimensions)] = EmbeddingCache(
+                model=model,
+                dimensions=dimensions,
+                max_entries=EMBEDDING_CACHE_SIZE,
+                store=embedding_cache.store
+            )
+        return _other_caches[(model, dimensions)]
+
+
+def get_embedding(
+    text: str,
+    model: str = EMBEDDING_MODEL,
+    dimensions: int = EMBEDDING_DIMENSIONS
+) -> list[float]:
     """Get embedding vector for a single text."""
     logger.debug(f"Getting embedding for text: '{text[:50]}...'")
+    if (model, dimensions) == (EMBEDDING_MODEL, EMBEDDING_DIMENSIONS):
+        create = _create_query_embeddings
+    else:
+        create = lambda texts: _create_embeddings(texts, dimensions, model)  # noqa: E731
     try:
-        response = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=text
-        )
-        logger.debug(f"Embedding received: {len(response.data[0].embedding)} dimensions")
-        return response.data[0].embedding
+        embedding = _cache_for(model, dimensions).get_many([text], create)[0]
+        logger.debug(f"Embedding received: {len(embedding)} dimensions")
+        return embedding
     except Exception as e:
         logger.exception(f"Failed to get embedding: {e}")
         raise
 
 
-def get_embeddings_batch(texts: list[str]) -> list[list[float]]:
-    """Get embeddings for multiple texts in one API call."""
+def get_embeddings_batch(
+    texts: list[str],
+    model: str = EMBEDDING_MODEL,
+    dimensions: int = EMBEDDING_DIMENSIONS
+) -> list[list[float]]:
+    """Get embeddings for multiple texts; only uncached texts hit the API, in bounded chunks."""
     logger.info(f"Getting batch embeddings for {len(texts)} texts")
     try:
-        response = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=texts
+        embeddings = _cache_for(model, dimensions).get_many(
+            texts, lambda missing: _create_embeddings_chunked(missing, model, dimensions)
         )
-        logger.info(f"Batch embeddings received: {len(response.data)} vectors")
-        return [item.embedding for item in response.data]
+        logger.info(f"Batch embeddings received: {len(embeddings)} vectors")
+        return embeddings
     except Exception as e:
         logger.exception(f"Failed to get batch embeddings: {e}")
         raise
@@ -0,0 +1,72 @@
+"""Which embedding (backend, model, dimensions) the vector columns hold."""
+
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_MODEL,
+    EMBEDDING_SPEC_REFRESH_SECONDS,
+)
+from src.db.models.base import engine
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+EmbeddingSpec = tuple[str, str, int]
+
+CONFIGURED_EMBEDDING: EmbeddingSpec = (EMBEDDING_BACKEND, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS)
+
+_lock = threading.Lock()
+_active: tuple[float, EmbeddingSpec] | None = None
+
+
+def read_active_embedding(conn) -> EmbeddingSpec:
+    """The embedding a flipped re-embedding job switched the vector columns to, else the configured one."""
+    row = conn.execute(text(
+        "SELECT backend, model, dimensions FROM reembed_jobs WHERE status = 'flipped' LIMIT 1"
+    )).first()
+    return tuple(row) if row else CONFIGURED_EMBEDDING
+
+
+def active_embedding(max_age: float = EMBEDDING_SPEC_REFRESH_SECONDS) -> EmbeddingSpec:
+    """
+    The embedding queries must use to match the stored vectors, re-read at
+    most every max_age seconds, so a re-embedding flip reaches running
+    processes without a restart. Falls back to the configured embedding
+    when the registry can't be read (e.g. before init_schema).
+    """
+    global _active
+    now = time.monotonic()
+    cached = _active
+    if cached is not None and now - cached[0] < max_age:
+        return cached[1]
+    with _lock:
+        if _active is not None and now - _active[0] < max_age:
+            return _active[1]
+        previous = _active[1] if _active else CONFIGURED_EMBEDDING
+        try:
+            with engine.connect() as conn:
+                spec = read_active_embedding(conn)
+        except SQLAlchemyError as e:
+            logger.debug(f"Couldn't read the active embedding, keeping {previous}: {e}")
+            spec = previous
+        if spec != previous:
+            logger.info(f"Vector columns now hold {spec}; embedding queries with it")
+        if spec != CONFIGURED_EMBEDDING and (_active is None or spec != _active[1]):
+            logger.warning(
+                f"Configured embedding {CONFIGURED_EMBEDDING} differs from the stored {spec}; "
+                f"update EMBEDDING_BACKEND/EMBEDDING_MODEL/EMBEDDING_DIMENSIONS"
+            )
+        _active = (now, spec)
+        return spec
+
+
+def invalidate_active_embedding() -> None:
+    """Re-read the active embedding on next use (after a flip in this process)."""
+    global _active
+    _active = None
@@ -1,19 +1,66 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Protocol
 
+from src.embeddings.context import scoped_embedding
+
 
 class EmbeddingFunction(Protocol):
     """Protocol for embedding functions (real or mock)."""
-    def __call__(self, text: str) -> list[float]: ...
+
+    def __call__(self, text: str) -> list[float]:
+        ...
+
+
+class BatchEmbeddingFunction(Protocol):
+    """Protocol for functions embedding several texts in one call."""
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        ...
 
 
 class BaseRetriever(ABC):
     """Abstract base class for pgvector retrievers."""
     
-    def __init__(self, embed_fn: EmbeddingFunction):
+    def __init__(self, embed_fn: EmbeddingFunction, embed_batch_fn: BatchEmbeddingFunction | None = None):
         self.embed_fn = embed_fn
+        self.embed_batch_fn = embed_batch_fn
+    
+    def embed_query(self, query: str) -> list[float]:
+        """Embed a query, reusing the vector computed earlier in the same embedding scope."""
+        return scoped_embedding(self.embed_fn, query)
+    
+    def embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """Embed several queries, in one call when an embed_batch_fn is set."""
+        if self.embed_batch_fn is not None:
+            return self.embed_batch_fn(list(queries))
+        return [self.embed_query(query) for query in queries]
+    
+    async def aembed_query(self, query: str) -> list[float]:
+        """embed_query in a worker thread (embedding backends are blocking), sharing the caller's scope."""
+        return await asyncio.to_thread(self.embed_query, query)
+    
+    async def aembed_queries(self, queries: list[str]) -> list[list[float]]:
+        """embed_queries in a worker thread."""
+        return await asyncio.to_thread(self.embed_queries, queries)
     
-    @abstractmethod
     def search(self, query: str, limit: int = 5) -> list[dict]:
         """Search for similar items using semantic search."""
+        return self.search_by_vector(self.embed_query(query), limit=limit)
+    
+    async def asearch(self, query: str, limit: int = 5, **kwargs) -> list[dict]:
+        """Awaitable search; runs the sync search in a worker thread unless a subclass is natively async."""
+        return await asyncio.to_thread(self.search, query, limit=limit, **kwargs)
+    
+    def search_many(self, queries: list[str], limit: int = 5) -> list[list[dict]]:
+        """Search several queries; one result list per query, in order."""
+        return self.search_many_by_vector(self.embed_queries(queries), limit=limit)
+    
+    @abstractmethod
+    def search_by_vector(self, embedding: list[float], limit: int = 5) -> list[dict]:
+        """Search for similar items given a precomputed query embedding."""
         pass
+    
+    def search_many_by_vector(self, embeddings: list[list[float]], limit: int = 5) -> list[list[dict]]:
+        """Search several precomputed embeddings; subclasses batch this into one pass."""
+        return [self.search_by_vector(embedding, limit=limit) for embedding in embeddings]
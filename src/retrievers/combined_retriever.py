@@ -0,0 +1,99 @@
+from sqlalchemy import text
+
+from src.embeddings.context import scoped_embedding
+from src.retrievers.base import EmbeddingFunction
+from src.retrievers.pgvector_retriever import (
+    PgVectorRetriever,
+    query_vector,
+    set_ef_search,
+    set_probes,
+)
+from src.db.models.base import engine
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def build_combined_sql(retrievers: dict[str, PgVectorRetriever]) -> str:
+    """UNION ALL of each retriever's ordered search, one JSON row per result."""
+    branches = [
+        f"SELECT '{name}' AS source, to_jsonb(r) AS item "
+        f"FROM ({retriever.build_sql(dimensions=retriever.quantized_dimensions())}) AS r"
+        for name, retriever in retrievers.items()
+    ]
+    return "\nUNION ALL\n".join(branches)
+
+
+def result_order(item: dict) -> tuple[float, float]:
+    """Sort key matching the branches' ORDER BY: fused rank first for hybrid results, then similarity."""
+    return item.get("rrf_score", 0.0), item["similarity"]
+
+
+class CombinedRetriever:
+    """
+    Search several pgvector retrievers in a single SQL statement.
+
+    Each retriever's ordered HNSW scan becomes one branch of a UNION ALL, so
+    all result lists come back from one connection checkout and one round trip.
+    The statement is rebuilt when a re-embedding flip resizes the quantized
+    casts, and a search whose query predates the flip is re-embedded once.
+    """
+
+    def __init__(self, embed_fn: EmbeddingFunction, retrievers: dict[str, PgVectorRetriever]):
+        self.embed_fn = embed_fn
+        self.retrievers = retrievers
+        self._statements: dict[tuple, object] = {}
+
+    def search(self, query: str, limit: int = 5) -> dict[str, list[dict]]:
+        """Search every retriever for a query, keyed by retriever name."""
+        logger.info(
+            f"Combined search over {', '.join(r.table for r in self.retrievers.values())}: "
+            f"query='{query[:50]}...', limit={limit}"
+        )
+
+        def run():
+            return self.search_by_vector(scoped_embedding(self.embed_fn, query), limit=limit, query=query)
+
+        # One query embedding serves every branch, so any retriever can refresh it
+        return next(iter(self.retrievers.values()))._with_fresh_embedding(run)
+
+    def search_by_vector(
+        self,
+        embedding: list[float],
+        limit: int = 5,
+        query: str | None = None
+    ) -> dict[str, list[dict]]:
+        """Search every retriever with a precomputed query embedding (and text, for hybrid)."""
+        params = {"vec": query_vector(embedding), "limit": limit, "query": query or ""}
+        results = {name: [] for name in self.retrievers}
+        with engine.connect() as conn:
+            candidates = [
+                c for c in (r.candidate_count(limit) for r in self.retrievers.values())
+                if c is not None
+            ]
+            if candidates:
+                params["candidates"] = max(candidates)
+            ef_values = [
+                ef for ef in (r.effective_ef_search(limit) for r in self.retrievers.values())
+                if ef is not None
+            ]
+            if ef_values:
+                set_ef_search(conn, max(ef_values))
+            probes = [r.probes for r in self.retrievers.values() if r.probes is not None]
+            if probes:
+                set_probes(conn, max(probes))
+            for row in conn.execute(self._statement(), params):
+                results[row.source].append(row.item)
+        # UNION ALL doesn't promise to keep each branch's order
+        for items in results.values():
+            items.sort(key=result_order, reverse=True)
+        logger.info(
+            "Found " + ", ".join(f"{len(items)} {name}" for name, items in results.items())
+        )
+        return results
+
+    def _statement(self):
+        key = tuple(r.quantized_dimensions() for r in self.retrievers.values())
+        if key not in self._statements:
+            self._statements[key] = text(build_combined_sql(self.retrievers))
+        return self._statements[key]
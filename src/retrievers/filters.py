@@ -0,0 +1,42 @@
+"""Structured metadata filters for pgvector retrievers."""
+
+# How a filter field is matched: "eq" matches any of the given values,
+# "overlap" matches array columns sharing at least one value.
+FILTER_CLAUSES = {
+    "eq": "{column} = ANY(CAST(:{param} AS text[]))",
+    "overlap": "{column} && CAST(:{param} AS text[])",
+}
+
+
+def normalize_filters(filters: dict | None, allowed: dict[str, str]) -> dict[str, list[str]]:
+    """Drop empty filters and turn scalar values into lists; reject unknown fields."""
+    normalized = {}
+    for field, value in (filters or {}).items():
+        if field not in allowed:
+            raise ValueError(f"Unknown filter '{field}'; expected one of {sorted(allowed)}")
+        if value is None or value == [] or value == "":
+            continue
+        normalized[field] = [value] if isinstance(value, str) else [str(v) for v in value]
+    return normalized
+
+
+def build_filter_clause(filters: dict[str, list[str]], allowed: dict[str, str]) -> tuple[str, dict]:
+    """SQL predicate (without WHERE) and bind parameters for normalized filters."""
+    clauses, params = [], {}
+    for field in sorted(filters):
+        param = f"filter_{field}"
+        clauses.append(FILTER_CLAUSES[allowed[field]].format(column=field, param=param))
+        params[param] = filters[field]
+    return " AND ".join(clauses), params
+
+
+def matches_filters(row: dict, filters: dict[str, list[str]], allowed: dict[str, str]) -> bool:
+    """Evaluate normalized filters against a result row in Python, with the SQL semantics."""
+    for field, values in filters.items():
+        value = row.get(field)
+        if allowed[field] == "overlap":
+            if not set(value or ()) & set(values):
+                return False
+        elif value not in values:
+            return False
+    return True
@@ -0,0 +1,384 @@
+"""Exact in-process vector search over a memory-mapped copy of a table's embeddings."""
+
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+from sqlalchemy import text
+
+from src.config import (
+    EMBEDDING_DIMENSIONS,
+    MEMORY_INDEX_DIR,
+    MEMORY_INDEX_REFRESH_SECONDS,
+    MMR_FETCH_K,
+)
+from src.db.models.base import engine
+from src.embeddings.spec import EmbeddingSpec, active_embedding, read_active_embedding
+from src.retrievers.base import BaseRetriever, BatchEmbeddingFunction, EmbeddingFunction
+from src.retrievers.filters import matches_filters, normalize_filters
+from src.retrievers.mmr import CANDIDATE_EMBEDDING, diversify
+from src.retrievers.pgvector_retriever import PgVectorRetriever
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# A transaction that started before the last refresh can commit rows stamped
+# with an earlier updated_at; incremental refreshes re-read this window.
+REFRESH_OVERLAP_SECONDS = 60
+
+
+def parse_vector(value: str) -> np.ndarray:
+    """pgvector text output ('[0.1,0.2,...]') as a float32 array."""
+    return np.array(value.strip("[]").split(","), dtype=np.float32)
+
+
+def normalize_matrix(matrix: np.ndarray) -> np.ndarray:
+    """Scale rows to unit length so a dot product is cosine similarity."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (matrix / norms).astype(np.float32)
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k highest scores, best first."""
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+class MemoryVectorIndex:
+    """
+    Unit-normalized float32 embeddings of one table in an .npy file that every
+    worker process maps read-only, plus a JSON manifest with the row payloads,
+    the updated_at watermark and the embedding the vectors were read in.
+
+    A refresh reads only rows changed since the watermark, writes the next
+    generation's matrix and publishes it by atomically replacing the manifest;
+    other workers notice the new manifest and remap. A re-embedding flip
+    swaps every vector without touching updated_at, so a change of the
+    active embedding reloads the whole table instead.
+    """
+
+    def __init__(
+        self,
+        table: str,
+        columns: list[str],
+        dimensions: int = EMBEDDING_DIMENSIONS,
+        directory: str = MEMORY_INDEX_DIR
+    ):
+        self.table = table
+        self.columns = columns
+        self.dimensions = dimensions
+        self.directory = directory
+        self.prefix = os.path.join(directory, f"{table}.{dimensions}")
+        self.manifest_path = f"{self.prefix}.json"
+        self.generation: int | None = None
+        self.watermark: str | None = None
+        self.embedding: list | None = None
+        self.snapshot: tuple[list[dict], np.ndarray] = ([], np.empty((0, dimensions), dtype=np.float32))
+        self.checked_at = 0.0
+        self._manifest_stat = None
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def rows(self) -> list[dict]:
+        return self.snapshot[0]
+
+    def matrix_path(self, generation: int) -> str:
+        return f"{self.prefix}.{generation}.npy"
+
+    def load(self) -> bool:
+        """Map the published generation if it differs from the one in memory."""
+        try:
+            stat = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return False
+        key = (stat.st_ino, stat.st_mtime_ns)
+        if key == self._manifest_stat:
+            return False
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+            matrix = np.load(self.matrix_path(manifest["generation"]), mmap_mode="r")
+        except FileNotFoundError:
+            # Superseded while we were opening it; the next call maps the newer one.
+            return False
+        self.snapshot = (manifest["rows"], matrix)
+        self.generation = manifest["generation"]
+        self.watermark = manifest["watermark"]
+        self.embedding = manifest.get("embedding")
+        self.dimensions = matrix.shape[1]
+        self._manifest_stat = key
+        logger.info(f"Mapped {self.table} generation {self.generation} ({len(self.rows)} rows)")
+        return True
+
+    def ensure_fresh(self, max_age: float, embedding: EmbeddingSpec | None = None) -> None:
+        """
+        Remap a newer generation, and check Postgres for changes at most every
+        max_age seconds, or right away when the index holds vectors of another
+        embedding than the queries' (a re-embedding flip switches queries
+        within EMBEDDING_SPEC_REFRESH_SECONDS).
+        """
+        self.load()
+        flipped = embedding is not None and self.embedding is not None and self.embedding != list(embedding)
+        if self.generation is not None and not flipped and time.monotonic() - self.checked_at < max_age:
+            return
+        if not self._refresh_lock.acquire(blocking=self.generation is None or flipped):
+            return
+        try:
+            self.refresh()
+        except Exception as e:
+            if self.generation is None:
+                raise
+            logger.warning(
+                f"Refreshing in-memory index for {self.table} failed; "
+                f"serving generation {self.generation}: {e}"
+            )
+        finally:
+            self._refresh_lock.release()
+
+    def refresh(self) -> bool:
+        """Apply rows changed since the published watermark; True if a new generation was written."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(f"{self.prefix}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self.load()
+                changed = self._refresh_locked()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        self.checked_at = time.monotonic()
+        return changed
+
+    def _refresh_locked(self) -> bool:
+        columns = ", ".join(self.columns)
+        select = (
+            f"SELECT {columns}, embedding::text AS embedding FROM {self.table} "
+            f"WHERE embedding IS NOT NULL"
+        )
+        with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+            embedding = list(read_active_embedding(conn))
+            state = conn.execute(text(f"""
+                SELECT count(*) AS row_count, max(updated_at) AS watermark
+                FROM {self.table} WHERE embedding IS NOT NULL
+            """)).one()
+            watermark = state.watermark.isoformat() if state.watermark else None
+            if (
+                self.generation is not None
+                and embedding == self.embedding
+                and state.row_count == len(self.rows)
+                and watermark == self.watermark
+            ):
+                return False
+
+            if self.generation is None or self.watermark is None or embedding != self.embedding:
+                changed = conn.execute(text(select)).fetchall()
+                live_ids = None
+            else:
+                changed = conn.execute(text(f"""
+                    {select}
+                      AND updated_at > CAST(:since AS timestamptz) - make_interval(secs => :overlap)
+                """), {"since": self.watermark, "overlap": REFRESH_OVERLAP_SECONDS}).fetchall()
+                live_ids = set(conn.execute(text(
+                    f"SELECT id FROM {self.table} WHERE embedding IS NOT NULL"
+                )).scalars())
+                # Rows written with an explicit, older updated_at (e.g. restored from a backup)
+                missing = live_ids - {row["id"] for row in self.rows} - {row.id for row in changed}
+                if missing:
+                    changed += conn.execute(
+                        text(f"{select} AND id = ANY(:ids)"), {"ids": list(missing)}
+                    ).fetchall()
+
+        old_rows, old_matrix = self.snapshot
+        changed_ids = {row.id for row in changed}
+        keep = [
+            i for i, row in enumerate(old_rows)
+            if live_ids is not None and row["id"] in live_ids and row["id"] not in changed_ids
+        ]
+        rows = [old_rows[i] for i in keep] + [
+            {column: getattr(row, column) for column in self.columns} for row in changed
+        ]
+        fresh = np.empty((len(changed), embedding[2]), dtype=np.float32)
+        for i, row in enumerate(changed):
+            fresh[i] = parse_vector(row.embedding)
+        kept = np.asarray(old_matrix)[keep] if keep else np.empty((0, embedding[2]), dtype=np.float32)
+        matrix = np.vstack([kept, normalize_matrix(fresh)])
+
+        logger.info(
+            f"Refreshing in-memory index for {self.table}: "
+            f"{len(changed)} rows read, {len(rows)} rows total"
+        )
+        self.publish(rows, matrix, watermark, embedding)
+        return True
+
+    def publish(
+        self,
+        rows: list[dict],
+        matrix: np.ndarray,
+        watermark: str | None,
+        embedding: list | None = None
+    ) -> None:
+        """Write rows and their unit-normalized matrix as the next generation and map it."""
+        os.makedirs(self.directory, exist_ok=True)
+        generation = (self.generation or 0) + 1
+        path = self.matrix_path(generation)
+        with open(f"{path}.tmp", "wb") as f:
+            np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+        os.replace(f"{path}.tmp", path)
+
+        manifest = {"generation": generation, "watermark": watermark, "embedding": embedding, "rows": rows}
+        with open(f"{self.manifest_path}.tmp", "w") as f:
+            json.dump(manifest, f, default=str)
+        os.replace(f"{self.manifest_path}.tmp", self.manifest_path)
+
+        # Keep the previous generation for workers still opening it.
+        for stale in glob.glob(f"{self.prefix}.*.npy"):
+            if int(stale.rsplit(".", 2)[1]) < generation - 1:
+                os.remove(stale)
+        self.load()
+
+    def search(
+        self,
+        query: np.ndarray,
+        limit: int,
+        predicate: Callable[[dict], bool] | None = None,
+        with_embeddings: bool = False
+    ) -> list[dict]:
+        """Exact cosine top-k with one matrix-vector product, over rows passing predicate."""
+        return self.search_many(query[np.newaxis, :], limit, predicate, with_embeddings)[0]
+
+    def search_many(
+        self,
+        queries: np.ndarray,
+        limit: int,
+        predicate: Callable[[dict], bool] | None = None,
+        with_embeddings: bool = False
+    ) -> list[list[dict]]:
+        """Exact cosine top-k for each row of queries with one matrix product."""
+        rows, matrix = self.snapshot
+        if not rows:
+            return [[] for _ in queries]
+        if queries.shape[1] != matrix.shape[1]:
+            raise ValueError(
+                f"Query embeddings have {queries.shape[1]} dimensions but the in-memory index for "
+                f"{self.table} holds {matrix.shape[1]} ({self.embedding})"
+            )
+        scores = queries @ matrix.T
+        if predicate is not None:
+            mask = np.fromiter((predicate(row) for row in rows), dtype=bool, count=len(rows))
+            scores[:, ~mask] = -np.inf
+            limit = min(limit, int(mask.sum()))
+        results = []
+        for row_scores in scores:
+            hits = []
+            for i in top_k(row_scores, limit):
+                hit = {**rows[i], "similarity": float(row_scores[i])}
+                if with_embeddings:
+                    hit[CANDIDATE_EMBEDDING] = matrix[i]
+                hits.append(hit)
+            results.append(hits)
+        return results
+
+
+_indexes: dict[tuple, MemoryVectorIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(
+    table: str,
+    columns: list[str],
+    dimensions: int = EMBEDDING_DIMENSIONS,
+    directory: str = MEMORY_INDEX_DIR
+) -> MemoryVectorIndex:
+    """Process-wide index for a table, shared by every retriever over it."""
+    key = (table, tuple(columns), dimensions, directory)
+    with _indexes_lock:
+        if key not in _indexes:
+            _indexes[key] = MemoryVectorIndex(table, columns, dimensions, directory)
+        return _indexes[key]
+
+
+class MemoryRetriever(BaseRetriever):
+    """
+    Drop-in alternative to a PgVectorRetriever for tables small enough to hold
+    in RAM: same rows, similarity and filters, without a database round trip.
+    `mmr_lambda` re-ranks `mmr_fetch_k` candidates by maximal marginal relevance.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbeddingFunction,
+        source: type[PgVectorRetriever],
+        refresh_seconds: float = MEMORY_INDEX_REFRESH_SECONDS,
+        index: MemoryVectorIndex | None = None,
+        embed_batch_fn: BatchEmbeddingFunction | None = None,
+        mmr_lambda: float | None = None,
+        mmr_fetch_k: int = MMR_FETCH_K
+    ):
+        super().__init__(embed_fn, embed_batch_fn)
+        if mmr_lambda is not None and not 0 <= mmr_lambda <= 1:
+            raise ValueError(f"mmr_lambda must be between 0 and 1, got {mmr_lambda}")
+        self.table = source.table
+        self.filterable = source.filterable
+        self.index = index or get_index(source.table, source.columns)
+        self.refresh_seconds = refresh_seconds
+        self.mmr_lambda = mmr_lambda
+        self.mmr_fetch_k = mmr_fetch_k
+
+    def search(self, query: str, limit: int = 5, filters: dict | None = None) -> list[dict]:
+        """Search for similar items using semantic search."""
+        return self.search_by_vector(self.embed_query(query), limit=limit, filters=filters)
+
+    def search_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        filters: dict | None = None
+    ) -> list[list[dict]]:
+        """Search several queries; one result list per query, in order."""
+        return self.search_many_by_vector(self.embed_queries(queries), limit=limit, filters=filters)
+
+    def search_by_vector(
+        self,
+        embedding: list[float],
+        limit: int = 5,
+        filters: dict | None = None
+    ) -> list[dict]:
+        """Search with a precomputed query embedding."""
+        return self.search_many_by_vector([embedding], limit=limit, filters=filters)[0]
+
+    def search_many_by_vector(
+        self,
+        embeddings: list[list[float]],
+        limit: int = 5,
+        filters: dict | None = None
+    ) -> list[list[dict]]:
+        """Search several precomputed embeddings with one matrix product."""
+        self.index.ensure_fresh(self.refresh_seconds, active_embedding())
+        normalized = normalize_filters(filters, self.filterable)
+        predicate = None
+        if normalized:
+            predicate = lambda row: matches_filters(row, normalized, self.filterable)  # noqa: E731
+        queries = normalize_matrix(np.asarray(embeddings, dtype=np.float32).reshape(len(embeddings), -1))
+        if self.mmr_lambda is None:
+            results = self.index.search_many(queries, limit, predicate)
+        else:
+            candidates = self.index.search_many(
+                queries, max(self.mmr_fetch_k, limit), predicate, with_embeddings=True
+            )
+            results = [
+                diversify(query, rows, limit, self.mmr_lambda)
+                for query, rows in zip(queries, candidates)
+            ]
+        logger.info(
+            f"Found {sum(len(r) for r in results)} rows in {self.table} (in-memory) "
+            f"for {len(embeddings)} queries"
+        )
+        return results
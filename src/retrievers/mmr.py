@@ -0,0 +1,81 @@
+"""Maximal marginal relevance (MMR) re-ranking of a retrieved candidate pool."""
+
+import numpy as np
+from pgvector import Vector
+
+# Result field carrying each candidate's vector into diversify
+CANDIDATE_EMBEDDING = "candidate_embedding"
+# Fused rank score of hybrid results; replaces query similarity as relevance when present
+FUSED_SCORE = "rrf_score"
+
+
+def embedding_array(value) -> np.ndarray:
+    """A vector (pgvector binary send format, Vector, text or sequence) as float32."""
+    if isinstance(value, bytes):
+        value = Vector.from_binary(value)
+    if isinstance(value, Vector):
+        value = value.to_numpy()
+    elif isinstance(value, str):
+        value = value.strip("[]").split(",")
+    return np.asarray(value, dtype=np.float32)
+
+
+def mmr_select(
+    query: np.ndarray,
+    candidates: np.ndarray,
+    k: int,
+    lambda_mult: float,
+    relevance: np.ndarray | None = None
+) -> list[int]:
+    """
+    Indices of k candidate rows picked greedily, each maximizing
+    lambda * sim(query, c) - (1 - lambda) * max sim(c, already picked),
+    with cosine similarities from one matrix product. A given relevance
+    array replaces sim(query, c).
+    """
+    n = len(candidates)
+    k = min(k, n)
+    if k <= 0:
+        return []
+    norms = np.linalg.norm(candidates, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    vectors = candidates / norms
+    if relevance is None:
+        query_norm = np.linalg.norm(query)
+        relevance = vectors @ (query / query_norm if query_norm else query)
+    similarity = vectors @ vectors.T
+
+    selected = [int(np.argmax(relevance))]
+    redundancy = similarity[selected[0]].copy()
+    available = np.ones(n, dtype=bool)
+    available[selected[0]] = False
+    while len(selected) < k:
+        scores = np.where(available, lambda_mult * relevance - (1 - lambda_mult) * redundancy, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, similarity[best], out=redundancy)
+    return selected
+
+
+def diversify(
+    query_embedding: list[float],
+    results: list[dict],
+    limit: int,
+    lambda_mult: float
+) -> list[dict]:
+    """
+    The limit results chosen by MMR from candidates carrying a candidate_embedding,
+    without it. Hybrid results are ranked by their rrf_score scaled to a top of 1,
+    so the keyword half of the fusion counts towards relevance.
+    """
+    if not results:
+        return []
+    candidates = np.stack([embedding_array(row[CANDIDATE_EMBEDDING]) for row in results])
+    relevance = None
+    if FUSED_SCORE in results[0]:
+        relevance = np.array([row[FUSED_SCORE] for row in results], dtype=np.float32)
+        top = relevance.max()
+        relevance = relevance / top if top > 0 else relevance
+    picked = mmr_select(embedding_array(query_embedding), candidates, limit, lambda_mult, relevance)
+    return [{k: v for k, v in results[i].items() if k != CANDIDATE_EMBEDDING} for i in picked]
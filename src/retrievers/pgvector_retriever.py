@@ -0,0 +1,679 @@
+import json
+import re
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import DataError
+
+from src.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_MODEL,
+    VECTOR_QUANTIZATION,
+    QUANTIZATION_RERANK_CANDIDATES,
+    SEARCH_MODE,
+    HYBRID_CANDIDATES,
+    RRF_K,
+    FILTER_STRATEGY,
+    FILTER_EXACT_MAX_ROWS,
+    FILTER_FALLBACK_EF_SEARCH,
+    MMR_FETCH_K,
+    SEARCH_PROFILES,
+    VECTOR_INDEX_TYPE,
+)
+from src.retrievers.base import BaseRetriever, BatchEmbeddingFunction, EmbeddingFunction
+from src.retrievers.filters import build_filter_clause, normalize_filters
+from src.retrievers.mmr import diversify
+from src.retrievers.result_cache import ResultCache
+from src.db.models.base import engine, async_engine, pgvector_version
+from src.embeddings.context import forget_scoped_embeddings
+from src.embeddings.spec import active_embedding, invalidate_active_embedding
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+QUANTIZATION_MODES = ("none", "halfvec", "binary")
+SEARCH_MODES = ("vector", "hybrid")
+FILTER_STRATEGIES = ("auto", "iterative", "exact")
+
+# pgvector's default hnsw.ef_search, the floor for candidate passes when none is requested.
+HNSW_DEFAULT_EF_SEARCH = 40
+
+# Candidate vectors for MMR in pgvector's binary send format, which decodes
+# several times faster than the text output of a plain embedding column.
+MMR_EMBEDDING_COLUMN = "vector_send(embedding) AS candidate_embedding"
+
+
+def candidate_order_expression(quantization: str, dimensions: int) -> str:
+    """ORDER BY expression for the candidate pass; matches the expression indexes."""
+    if quantization == "halfvec":
+        return f"embedding::halfvec({dimensions}) <=> CAST(:vec AS halfvec({dimensions}))"
+    if quantization == "binary":
+        return (
+            f"binary_quantize(embedding)::bit({dimensions}) "
+            f"<~> binary_quantize(CAST(:vec AS vector({dimensions})))"
+        )
+    return "embedding <=> CAST(:vec AS vector)"
+
+
+# pgvector's errors for a query vector of another width than the column or cast
+STALE_EMBEDDING_ERRORS = re.compile(r"different vector dimensions|expected \d+ dimensions, not \d+")
+
+
+def stale_query_embedding(error: DataError) -> bool:
+    """Whether a search failed because its query was embedded for columns a re-embedding flip resized."""
+    return STALE_EMBEDDING_ERRORS.search(str(error.orig)) is not None
+
+
+def build_search_sql(
+    table: str,
+    columns: list[str],
+    quantization: str = "none",
+    dimensions: int = EMBEDDING_DIMENSIONS,
+    where: str = ""
+) -> str:
+    """
+    Build the similarity search statement for a table.
+
+    With quantization, an indexed scan over the compact representation picks
+    :candidates rows, which are then re-ranked by exact cosine distance on the
+    full-precision vectors. A `where` predicate is applied inside the indexed
+    scan and the outer query restores exact order (iterative scans may relax it).
+    """
+    select_list = ",\n                ".join(columns)
+    if quantization == "none" and not where:
+        return f"""
+            SELECT
+                {select_list},
+                1 - (embedding <=> CAST(:vec AS vector)) AS similarity
+            FROM {table}
+            ORDER BY embedding <=> CAST(:vec AS vector)
+            LIMIT :limit
+        """
+    inner_limit = ":limit" if quantization == "none" else ":candidates"
+    where_clause = f"WHERE {where}" if where else ""
+    return f"""
+        SELECT
+            {select_list},
+            1 - (embedding <=> CAST(:vec AS vector)) AS similarity
+        FROM (
+            SELECT *
+            FROM {table}
+            {where_clause}
+            ORDER BY {candidate_order_expression(quantization, dimensions)}
+            LIMIT {inner_limit}
+        ) AS candidates
+        ORDER BY embedding <=> CAST(:vec AS vector)
+        LIMIT :limit
+    """
+
+
+def build_prefiltered_sql(table: str, columns: list[str], where: str) -> str:
+    """
+    Build an exact search over the rows matching `where`.
+
+    The MATERIALIZED CTE keeps the planner from pushing the filter into an HNSW
+    scan: the filter runs on its B-tree/GIN index and only the matching rows
+    are compared exactly, which is cheapest when few rows match.
+    """
+    select_list = ",\n            ".join(columns)
+    return f"""
+        WITH filtered AS MATERIALIZED (
+            SELECT
+                {select_list},
+                embedding
+            FROM {table}
+            WHERE {where}
+        )
+        SELECT
+            {select_list},
+            1 - (embedding <=> CAST(:vec AS vector)) AS similarity
+        FROM filtered
+        ORDER BY embedding <=> CAST(:vec AS vector)
+        LIMIT :limit
+    """
+
+
+def build_hybrid_sql(
+    table: str,
+    columns: list[str],
+    quantization: str = "none",
+    dimensions: int = EMBEDDING_DIMENSIONS,
+    rrf_k: int = RRF_K,
+    where: str = ""
+) -> str:
+    """
+    Build a hybrid search statement: the top :candidates rows by vector
+    distance and by full-text rank (any query term matching search_vector)
+    are fused with reciprocal rank fusion, sum(1 / (rrf_k + rank)), in one query.
+    """
+    select_list = ",\n            ".join(columns)
+    vector_where = f"WHERE {where}" if where else ""
+    text_where = f"AND {where}" if where else ""
+    return f"""
+        WITH vector_hits AS (
+            SELECT
+                id,
+                row_number() OVER (ORDER BY {candidate_order_expression(quantization, dimensions)}) AS rank
+            FROM {table}
+            {vector_where}
+            ORDER BY {candidate_order_expression(quantization, dimensions)}
+            LIMIT :candidates
+        ),
+        text_hits AS (
+            SELECT
+                id,
+                row_number() OVER (ORDER BY ts_rank_cd(search_vector, q) DESC) AS rank
+            FROM {table},
+                CAST(replace(plainto_tsquery('english', :query)::text, ' & ', ' | ') AS tsquery) AS q
+            WHERE search_vector @@ q {text_where}
+            ORDER BY ts_rank_cd(search_vector, q) DESC
+            LIMIT :candidates
+        ),
+        fused AS (
+            SELECT id, CAST(sum(1.0 / ({int(rrf_k)} + rank)) AS double precision) AS rrf_score
+            FROM (
+                SELECT id, rank FROM vector_hits
+                UNION ALL
+                SELECT id, rank FROM text_hits
+            ) AS hits
+            GROUP BY id
+        )
+        SELECT
+            {select_list},
+            1 - (embedding <=> CAST(:vec AS vector)) AS similarity,
+            fused.rrf_score
+        FROM fused
+        JOIN {table} USING (id)
+        ORDER BY fused.rrf_score DESC, embedding <=> CAST(:vec AS vector)
+        LIMIT :limit
+    """
+
+
+def build_batched_sql(search_sql: str, order_by: str = "r.similarity DESC") -> str:
+    """
+    Run a single-query search statement once per element of :vecs (and
+    :queries, for hybrid) through a LATERAL join; each row carries the
+    1-based query_index of the query it answers.
+    """
+    per_query = re.sub(r":vec\b", "q.vec", search_sql)
+    per_query = re.sub(r":query\b", "q.query", per_query)
+    return f"""
+        SELECT q.query_index, r.*
+        FROM unnest(CAST(:vecs AS vector[]), CAST(:queries AS text[]))
+            WITH ORDINALITY AS q(vec, query, query_index)
+        CROSS JOIN LATERAL ({per_query}) AS r
+        ORDER BY q.query_index, {order_by}
+    """
+
+
+def vector_literal(embedding: list[float]) -> str:
+    """pgvector text input for an embedding."""
+    return "[" + ",".join(str(float(x)) for x in embedding) + "]"
+
+
+def query_vector(embedding: list[float]) -> np.ndarray:
+    """Query embedding as a bind parameter; the engines' pgvector adapter sends it in binary."""
+    return np.asarray(embedding, dtype=np.float32)
+
+
+def set_probes(conn, probes: int) -> None:
+    """
+    Set ivfflat.probes, the number of lists an IVFFlat scan visits, for the
+    current transaction only. pgvector's default of one list misses
+    neighbours just across a list boundary, so searches name their value
+    rather than inherit it.
+    """
+    conn.execute(
+        text("SELECT set_config('ivfflat.probes', :probes, true)"),
+        {"probes": str(probes)}
+    )
+
+
+def profile_settings(profile: str, index_type: str = VECTOR_INDEX_TYPE) -> dict:
+    """Retriever scan settings for a search profile; probes only apply to IVFFlat indexes."""
+    settings = SEARCH_PROFILES[profile]
+    return {
+        "ef_search": settings["ef_search"],
+        "probes": settings["probes"] if index_type == "ivfflat" else None,
+    }
+
+
+def set_ef_search(conn, ef_search: int) -> None:
+    """
+    Set hnsw.ef_search for the current transaction only. Issued even at
+    pgvector's default, since the server or role may configure another value.
+    """
+    conn.execute(
+        text("SELECT set_config('hnsw.ef_search', :ef, true)"),
+        {"ef": str(ef_search)}
+    )
+
+
+class PgVectorRetriever(BaseRetriever):
+    """
+    Base class for retrievers over a table with an `embedding` vector column.
+
+    Subclasses set `table`, `columns` and `filterable` (filter field -> "eq" or
+    "overlap"). `quantization` selects the candidate index: "none" (full
+    vectors), "halfvec" or "binary" (re-ranked exactly). `search_mode` "hybrid"
+    fuses vector and full-text candidates with RRF. `filter_strategy` picks how
+    filtered searches run: "iterative" HNSW scans, "exact" pre-filtering, or
+    "auto" to choose from the planner's row estimate for the filter.
+    `ef_search` (HNSW) and `probes` (IVFFlat lists scanned) trade recall for
+    latency per search (None keeps the server setting).
+    `mmr_lambda` re-ranks `mmr_fetch_k` candidates by maximal marginal
+    relevance (1 = pure relevance, lower = more diverse; None = off).
+    `result_cache` serves repeated text searches without embedding or scanning.
+    Every search method has an awaitable `a`-prefixed twin on the async engine.
+    """
+
+    table: str
+    columns: list[str]
+    filterable: dict[str, str] = {}
+
+    _pgvector_version: tuple[int, ...] | None = None
+
+    def __init__(
+        self,
+        embed_fn: EmbeddingFunction,
+        quantization: str = VECTOR_QUANTIZATION,
+        rerank_candidates: int = QUANTIZATION_RERANK_CANDIDATES,
+        search_mode: str = SEARCH_MODE,
+        hybrid_candidates: int = HYBRID_CANDIDATES,
+        filter_strategy: str = FILTER_STRATEGY,
+        exact_max_rows: int = FILTER_EXACT_MAX_ROWS,
+        ef_search: int | None = None,
+        embed_batch_fn: BatchEmbeddingFunction | None = None,
+        result_cache: ResultCache | None = None,
+        mmr_lambda: float | None = None,
+        mmr_fetch_k: int = MMR_FETCH_K,
+        probes: int | None = None
+    ):
+        super().__init__(embed_fn, embed_batch_fn)
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Unknown quantization '{quantization}'; expected one of {QUANTIZATION_MODES}"
+            )
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f"Unknown search_mode '{search_mode}'; expected one of {SEARCH_MODES}")
+        if filter_strategy not in FILTER_STRATEGIES:
+            raise ValueError(
+                f"Unknown filter_strategy '{filter_strategy}'; expected one of {FILTER_STRATEGIES}"
+            )
+        if mmr_lambda is not None and not 0 <= mmr_lambda <= 1:
+            raise ValueError(f"mmr_lambda must be between 0 and 1, got {mmr_lambda}")
+        self.quantization = quantization
+        self.rerank_candidates = rerank_candidates
+        self.search_mode = search_mode
+        self.hybrid_candidates = hybrid_candidates
+        self.filter_strategy = filter_strategy
+        self.exact_max_rows = exact_max_rows
+        self.ef_search = ef_search
+        self.probes = probes
+        self.result_cache = result_cache
+        self.mmr_lambda = mmr_lambda
+        self.mmr_fetch_k = mmr_fetch_k
+        self.sql = self.build_sql()
+        self._statements: dict[tuple[str, str, bool, int | None], object] = {}
+
+    def quantized_dimensions(self) -> int | None:
+        """Width of the quantized casts, from the active embedding so a re-embedding flip resizes them."""
+        return None if self.quantization == "none" else active_embedding()[2]
+
+    def build_sql(self, where: str = "", strategy: str = "iterative", dimensions: int | None = None) -> str:
+        """Search statement for this retriever's mode, optionally filtered."""
+        columns = self.columns if self.mmr_lambda is None else [*self.columns, MMR_EMBEDDING_COLUMN]
+        if where and strategy == "exact":
+            return build_prefiltered_sql(self.table, columns, where)
+        dimensions = dimensions or self.quantized_dimensions() or EMBEDDING_DIMENSIONS
+        if self.search_mode == "hybrid":
+            return build_hybrid_sql(self.table, columns, self.quantization, dimensions, where=where)
+        return build_search_sql(self.table, columns, self.quantization, dimensions, where=where)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[dict]:
+        """Search by semantic (or hybrid) similarity, optionally filtered."""
+        self._log_search(query, limit, filters)
+
+        def run():
+            return self.search_by_vector(
+                self.embed_query(query), limit=limit, query=query, filters=filters, ef_search=ef_search
+            )
+
+        if self.result_cache is None:
+            return self._with_fresh_embedding(run)
+
+        key = self._cache_key(query, limit, filters, ef_search)
+        version, cached = self.result_cache.lookup(self.table, key)
+        if cached is not None:
+            logger.info(f"Retrieval cache hit for {self.table} (corpus version {version})")
+            return cached
+        results = self._with_fresh_embedding(run)
+        if version is not None:
+            self.result_cache.store(self.table, key, version, results)
+        return results
+
+    async def asearch(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[dict]:
+        """search without blocking the event loop on Postgres."""
+        self._log_search(query, limit, filters)
+
+        async def run():
+            return await self.asearch_by_vector(
+                await self.aembed_query(query), limit=limit, query=query,
+                filters=filters, ef_search=ef_search
+            )
+
+        if self.result_cache is None:
+            return await self._awith_fresh_embedding(run)
+
+        key = self._cache_key(query, limit, filters, ef_search)
+        version, cached = await self.result_cache.alookup(self.table, key)
+        if cached is not None:
+            logger.info(f"Retrieval cache hit for {self.table} (corpus version {version})")
+            return cached
+        results = await self._awith_fresh_embedding(run)
+        if version is not None:
+            await self.result_cache.astore(self.table, key, version, results)
+        return results
+
+    def _with_fresh_embedding(self, run):
+        """
+        Run an embed-and-search, once more with the query re-embedded if it
+        was embedded for the vector columns before a re-embedding flip (other
+        processes learn of a flip within EMBEDDING_SPEC_REFRESH_SECONDS).
+        """
+        try:
+            return run()
+        except DataError as e:
+            if not stale_query_embedding(e):
+                raise
+            self._refresh_embedding()
+            return run()
+
+    async def _awith_fresh_embedding(self, run):
+        """_with_fresh_embedding for an async embed-and-search."""
+        try:
+            return await run()
+        except DataError as e:
+            if not stale_query_embedding(e):
+                raise
+            self._refresh_embedding()
+            return await run()
+
+    def _refresh_embedding(self) -> None:
+        logger.info(f"Query embedding for {self.table} predates a re-embedding flip; re-embedding it")
+        invalidate_active_embedding()
+        forget_scoped_embeddings()
+
+    def _log_search(self, query: str, limit: int, filters: dict | None) -> None:
+        logger.info(
+            f"Searching {self.table} ({self.search_mode}): query='{query[:50]}...', "
+            f"limit={limit}, filters={filters or {}}"
+        )
+
+    def _cache_key(self, query: str, limit: int, filters: dict | None, ef_search: int | None) -> str:
+        return self.result_cache.key(
+            self.table, self.cache_settings(limit, ef_search), query, limit,
+            normalize_filters(filters, self.filterable)
+        )
+
+    def cache_settings(self, limit: int, ef_search: int | None = None) -> dict:
+        """Everything besides query, limit and filters that shapes this retriever's results."""
+        return {
+            "embedding": [EMBEDDING_BACKEND, EMBEDDING_MODEL, EMBEDDING_DIMENSIONS],
+            "quantization": self.quantization,
+            "rerank_candidates": self.rerank_candidates,
+            "search_mode": self.search_mode,
+            "hybrid_candidates": self.hybrid_candidates,
+            "rrf_k": RRF_K,
+            "filter_strategy": self.filter_strategy,
+            "ef_search": self.effective_ef_search(limit, ef_search),
+            "probes": self.probes,
+            "mmr": None if self.mmr_lambda is None else [self.mmr_lambda, self.fetch_count(limit)],
+        }
+
+    def effective_ef_search(self, limit: int, ef_search: int | None = None) -> int | None:
+        """ef_search for a search: the requested value, raised to cover the candidate pass."""
+        requested = ef_search if ef_search is not None else self.ef_search
+        candidates = self.candidate_count(limit)
+        if candidates is None:
+            return requested
+        return max(requested or HNSW_DEFAULT_EF_SEARCH, candidates)
+
+    def fetch_count(self, limit: int) -> int:
+        """Rows a search returns before MMR narrows them to limit."""
+        return limit if self.mmr_lambda is None else max(self.mmr_fetch_k, limit)
+
+    def candidate_count(self, limit: int) -> int | None:
+        """Rows fetched per candidate pass, or None for a single exact-order scan."""
+        if self.search_mode == "hybrid":
+            candidates = max(self.hybrid_candidates, limit)
+            if self.quantization != "none":
+                candidates = max(candidates, self.rerank_candidates)
+            return candidates
+        if self.quantization == "none":
+            return None
+        return max(self.rerank_candidates, limit)
+
+    def search_by_vector(
+        self,
+        embedding: list[float],
+        limit: int = 5,
+        query: str | None = None,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[dict]:
+        """Search with a precomputed query embedding; hybrid mode also needs the query text."""
+        with engine.connect() as conn:
+            return self._run_search(conn, embedding, limit, query, filters, ef_search)
+
+    async def asearch_by_vector(
+        self,
+        embedding: list[float],
+        limit: int = 5,
+        query: str | None = None,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[dict]:
+        """search_by_vector on a connection from the async pool."""
+        async with async_engine.connect() as conn:
+            return await conn.run_sync(self._run_search, embedding, limit, query, filters, ef_search)
+
+    def search_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[list[dict]]:
+        """Search several queries with one embedding batch and one SQL statement."""
+        self._log_search_many(queries, limit, filters)
+        return self._with_fresh_embedding(lambda: self.search_many_by_vector(
+            self.embed_queries(queries), limit=limit, queries=queries,
+            filters=filters, ef_search=ef_search
+        ))
+
+    async def asearch_many(
+        self,
+        queries: list[str],
+        limit: int = 5,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[list[dict]]:
+        """search_many without blocking the event loop on Postgres."""
+        self._log_search_many(queries, limit, filters)
+
+        async def run():
+            return await self.asearch_many_by_vector(
+                await self.aembed_queries(queries), limit=limit, queries=queries,
+                filters=filters, ef_search=ef_search
+            )
+
+        return await self._awith_fresh_embedding(run)
+
+    def search_many_by_vector(
+        self,
+        embeddings: list[list[float]],
+        limit: int = 5,
+        queries: list[str] | None = None,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[list[dict]]:
+        """One result list per embedding, from a single LATERAL top-k statement."""
+        if not embeddings:
+            return []
+        with engine.connect() as conn:
+            return self._run_search_many(conn, embeddings, limit, queries, filters, ef_search)
+
+    async def asearch_many_by_vector(
+        self,
+        embeddings: list[list[float]],
+        limit: int = 5,
+        queries: list[str] | None = None,
+        filters: dict | None = None,
+        ef_search: int | None = None
+    ) -> list[list[dict]]:
+        """search_many_by_vector on a connection from the async pool."""
+        if not embeddings:
+            return []
+        async with async_engine.connect() as conn:
+            return await conn.run_sync(
+                self._run_search_many, embeddings, limit, queries, filters, ef_search
+            )
+
+    def _log_search_many(self, queries: list[str], limit: int, filters: dict | None) -> None:
+        logger.info(
+            f"Searching {self.table} ({self.search_mode}) for {len(queries)} queries, "
+            f"limit={limit}, filters={filters or {}}"
+        )
+
+    def _run_search(
+        self,
+        conn,
+        embedding: list[float],
+        limit: int,
+        query: str | None,
+        filters: dict | None,
+        ef_search: int | None
+    ) -> list[dict]:
+        # Takes a sync Connection; the async methods reach it through AsyncConnection.run_sync.
+        fetch = self.fetch_count(limit)
+        params = {"vec": query_vector(embedding), "limit": fetch, "query": query or ""}
+        where, strategy = self._prepare_search(conn, params, fetch, filters, ef_search)
+        result = conn.execute(self._statement(where, strategy), params)
+        results = [dict(row._mapping) for row in result]
+        if self.mmr_lambda is not None:
+            results = diversify(embedding, results, limit, self.mmr_lambda)
+        logger.info(f"Found {len(results)} rows in {self.table}")
+        return results
+
+    def _run_search_many(
+        self,
+        conn,
+        embeddings: list[list[float]],
+        limit: int,
+        queries: list[str] | None,
+        filters: dict | None,
+        ef_search: int | None
+    ) -> list[list[dict]]:
+        params = {
+            "vecs": [query_vector(e) for e in embeddings],
+            "queries": list(queries) if queries else [""] * len(embeddings),
+            "limit": self.fetch_count(limit),
+        }
+        results = [[] for _ in embeddings]
+        where, strategy = self._prepare_search(conn, params, params["limit"], filters, ef_search)
+        for row in conn.execute(self._statement(where, strategy, batched=True), params):
+            item = dict(row._mapping)
+            results[item.pop("query_index") - 1].append(item)
+        if self.mmr_lambda is not None:
+            results = [
+                diversify(embedding, rows, limit, self.mmr_lambda)
+                for embedding, rows in zip(embeddings, results)
+            ]
+        logger.info(
+            f"Found {sum(len(r) for r in results)} rows in {self.table} for {len(embeddings)} queries"
+        )
+        return results
+
+    def _prepare_search(
+        self,
+        conn,
+        params: dict,
+        limit: int,
+        filters: dict | None,
+        ef_search: int | None
+    ) -> tuple[str, str]:
+        """Bind candidates and filters, set per-transaction scan settings; returns (where, strategy)."""
+        normalized = normalize_filters(filters, self.filterable)
+        ef_search = self.effective_ef_search(limit, ef_search)
+        candidates = self.candidate_count(limit)
+        if candidates is not None:
+            params["candidates"] = candidates
+        if ef_search is not None:
+            set_ef_search(conn, ef_search)
+        if self.probes is not None:
+            set_probes(conn, self.probes)
+        if not normalized:
+            return "", "iterative"
+        where, filter_params = build_filter_clause(normalized, self.filterable)
+        params.update(filter_params)
+        strategy = self._choose_filter_strategy(conn, where, filter_params)
+        if strategy == "iterative":
+            self._enable_iterative_scan(conn, ef_search)
+        return where, strategy
+
+    def estimate_rows(self, conn, where: str, params: dict) -> float:
+        """Planner's row estimate for a filter predicate."""
+        plan = conn.execute(
+            text(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM {self.table} WHERE {where}"), params
+        ).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return float(plan[0]["Plan"]["Plan Rows"])
+
+    def _choose_filter_strategy(self, conn, where: str, params: dict) -> str:
+        if self.search_mode == "hybrid":
+            return "iterative"
+        if self.filter_strategy != "auto":
+            return self.filter_strategy
+        estimated = self.estimate_rows(conn, where, params)
+        strategy = "exact" if estimated <= self.exact_max_rows else "iterative"
+        logger.debug(f"Filter on {self.table} matches ~{estimated:.0f} rows: {strategy} search")
+        return strategy
+
+    def _enable_iterative_scan(self, conn, ef_search: int | None) -> None:
+        """Keep scanning the index until enough rows pass the filter (pgvector >= 0.8)."""
+        if PgVectorRetriever._pgvector_version is None:
+            PgVectorRetriever._pgvector_version = pgvector_version(conn)
+        if PgVectorRetriever._pgvector_version >= (0, 8):
+            conn.execute(text("SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true)"))
+            if self.probes is not None:
+                conn.execute(text("SELECT set_config('ivfflat.iterative_scan', 'relaxed_order', true)"))
+        else:
+            set_ef_search(conn, max(FILTER_FALLBACK_EF_SEARCH, ef_search or 0))
+
+    def _statement(self, where: str = "", strategy: str = "iterative", batched: bool = False):
+        dimensions = self.quantized_dimensions()
+        key = (where, strategy, batched, dimensions)
+        if key not in self._statements:
+            sql = self.build_sql(where, strategy, dimensions)
+            if batched:
+                order_by = "r.similarity DESC"
+                if self.search_mode == "hybrid":
+                    order_by = "r.rrf_score DESC, r.similarity DESC"
+                sql = build_batched_sql(sql, order_by)
+            self._statements[key] = text(sql)
+        return self._statements[key]
@@ -0,0 +1,184 @@
+"""Cross-process cache of retriever results, invalidated by corpus version."""
+
+import hashlib
+import json
+import threading
+from dataclasses import dataclass, asdict
+
+from sqlalchemy import text
+
+from src.config import RETRIEVAL_CACHE, RETRIEVAL_CACHE_MAX_ENTRIES
+from src.db.models.base import engine, async_engine
+from src.embeddings.cache import normalize_text
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ResultCacheStats:
+    """Per-process counters for the retrieval result cache."""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    errors: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> dict:
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 4)}
+
+
+class ResultCache:
+    """
+    Search results in the UNLOGGED retrieval_cache table, shared by every
+    process, keyed by table, retriever settings, normalized query, limit and filters.
+
+    An entry records the table's corpus version read before its search ran. A
+    lookup only matches entries at the current version, and any write to the
+    table bumps the version by trigger, so cached results never outlive the
+    data they came from. Cache failures are logged and fall through to search.
+    """
+
+    def __init__(self, max_entries: int = RETRIEVAL_CACHE_MAX_ENTRIES, prune_every: int = 100):
+        self.max_entries = max_entries
+        self.prune_every = prune_every
+        self._stats = ResultCacheStats()
+        self._lock = threading.Lock()
+
+    def key(self, table: str, settings: dict, query: str, limit: int, filters: dict) -> str:
+        """Cache key for a search; filters must already be normalized."""
+        payload = json.dumps(
+            [table, settings, normalize_text(query), limit, filters], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @property
+    def stats(self) -> ResultCacheStats:
+        """Snapshot of the cache counters."""
+        with self._lock:
+            return ResultCacheStats(**asdict(self._stats))
+
+    def lookup(self, table: str, key: str) -> tuple[int | None, list[dict] | None]:
+        """Current corpus version of the table and the cached results at that version, if any."""
+        try:
+            with engine.connect() as conn:
+                row = self._select(conn, table, key)
+        except Exception as e:
+            return self._lookup_failed(e)
+        return self._lookup_result(row)
+
+    async def alookup(self, table: str, key: str) -> tuple[int | None, list[dict] | None]:
+        """lookup on the async engine."""
+        try:
+            async with async_engine.connect() as conn:
+                row = await conn.run_sync(self._select, table, key)
+        except Exception as e:
+            return self._lookup_failed(e)
+        return self._lookup_result(row)
+
+    def store(self, table: str, key: str, version: int, results: list[dict]) -> None:
+        """Cache results computed at a corpus version, pruning superseded entries periodically."""
+        try:
+            with engine.connect() as conn:
+                self._insert(conn, table, key, version, results)
+                conn.commit()
+        except Exception as e:
+            self._store_failed(e)
+
+    async def astore(self, table: str, key: str, version: int, results: list[dict]) -> None:
+        """store on the async engine."""
+        try:
+            async with async_engine.connect() as conn:
+                await conn.run_sync(self._insert, table, key, version, results)
+                await conn.commit()
+        except Exception as e:
+            self._store_failed(e)
+
+    def prune(self, conn) -> int:
+        """Delete entries from superseded corpus versions and the oldest beyond max_entries."""
+        stale = conn.execute(text("""
+            DELETE FROM retrieval_cache c
+            USING corpus_versions v
+            WHERE c.table_name = v.table_name AND c.corpus_version < v.version
+        """)).rowcount or 0
+        overflow = conn.execute(text("""
+            DELETE FROM retrieval_cache
+            WHERE cache_key IN (
+                SELECT cache_key FROM retrieval_cache
+                ORDER BY created_at DESC
+                OFFSET :max_entries
+            )
+        """), {"max_entries": self.max_entries}).rowcount or 0
+        if stale or overflow:
+            logger.info(f"Pruned retrieval cache: {stale} stale, {overflow} over capacity")
+        return stale + overflow
+
+    def table_stats(self) -> list[dict]:
+        """Corpus version and live cached entries per table."""
+        with engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT v.table_name, v.version,
+                       count(c.cache_key) AS entries
+                FROM corpus_versions v
+                LEFT JOIN retrieval_cache c
+                  ON c.table_name = v.table_name AND c.corpus_version = v.version
+                GROUP BY v.table_name, v.version
+                ORDER BY v.table_name
+            """)).fetchall()
+        return [dict(row._mapping) for row in rows]
+
+    def _select(self, conn, table: str, key: str):
+        return conn.execute(text("""
+            SELECT v.version, c.results
+            FROM corpus_versions v
+            LEFT JOIN retrieval_cache c
+              ON c.cache_key = :key AND c.corpus_version = v.version
+            WHERE v.table_name = :table
+        """), {"key": key, "table": table}).first()
+
+    def _lookup_result(self, row) -> tuple[int | None, list[dict] | None]:
+        if row is None:
+            return None, None
+        self._count("hits" if row.results is not None else "misses")
+        return row.version, row.results
+
+    def _lookup_failed(self, error: Exception) -> tuple[None, None]:
+        logger.warning(f"Retrieval cache lookup failed: {error}")
+        self._count("errors")
+        return None, None
+
+    def _insert(self, conn, table: str, key: str, version: int, results: list[dict]) -> None:
+        conn.execute(text("""
+            INSERT INTO retrieval_cache (cache_key, table_name, corpus_version, results, created_at)
+            VALUES (:key, :table, :version, CAST(:results AS jsonb), now())
+            ON CONFLICT (cache_key) DO UPDATE
+            SET corpus_version = excluded.corpus_version,
+                results = excluded.results,
+                created_at = excluded.created_at
+            WHERE retrieval_cache.corpus_version < excluded.corpus_version
+        """), {
+            "key": key,
+            "table": table,
+            "version": version,
+            "results": json.dumps(results, default=str),
+        })
+        writes = self._count("writes")
+        if writes % self.prune_every == 0:
+            self.prune(conn)
+
+    def _store_failed(self, error: Exception) -> None:
+        logger.warning(f"Retrieval cache write failed: {error}")
+        self._count("errors")
+
+    def _count(self, field: str) -> int:
+        with self._lock:
+            value = getattr(self._stats, field) + 1
+            setattr(self._stats, field, value)
+            return value
+
+
+retrieval_cache = ResultCache() if RETRIEVAL_CACHE else None
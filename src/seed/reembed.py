@@ -0,0 +1,420 @@
+"""Zero-downtime re-embedding into a shadow column, flipped in atomically when complete."""
+
+import time
+
+from psycopg.rows import dict_row
+from sqlalchemy import text
+
+from src.config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_DIMENSIONS,
+    EMBEDDING_MODEL,
+    REEMBED_BATCH_SIZE,
+    REEMBED_LOCK_TIMEOUT,
+    REEMBED_PROGRESS_SECONDS,
+    REEMBED_ROWS_PER_SECOND,
+)
+from src.db.models.base import engine
+from src.db.schema import VECTOR_INDEXES, build_vector_index, create_quantized_indexes, hnsw_options
+from src.embeddings import get_backend, get_embeddings_batch
+from src.embeddings.spec import CONFIGURED_EMBEDDING, EmbeddingSpec, invalidate_active_embedding, read_active_embedding
+from src.seed.bulk_load import stage_rows
+from src.seed.stream import INGEST_TABLES
+from src.seed.sync import sync_fields
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+SHADOW_COLUMN = "embedding_next"
+PREVIOUS_COLUMN = "embedding_prev"
+
+# A row whose text (or live embedding) changes mid-job gets its shadow vector
+# cleared, so the job re-embeds it instead of flipping in a stale vector.
+RESET_EMBEDDING_NEXT_FUNCTION = """
+    CREATE OR REPLACE FUNCTION reset_embedding_next() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.content_hash IS DISTINCT FROM OLD.content_hash
+           OR NEW.embedding IS DISTINCT FROM OLD.embedding THEN
+            NEW.embedding_next = NULL;
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+"""
+
+
+def shadow_index(table: str) -> str:
+    """Name of the index built on a table's shadow column."""
+    return f"{VECTOR_INDEXES[table]}_next"
+
+
+def throttle_delay(rows: int, elapsed: float, rows_per_second: float) -> float:
+    """Seconds to sleep after writing `rows` in `elapsed` seconds to stay at rows_per_second (0 = no cap)."""
+    if rows_per_second <= 0:
+        return 0.0
+    return max(0.0, rows / rows_per_second - elapsed)
+
+
+def job_spec(job) -> EmbeddingSpec:
+    """The embedding a job row targets."""
+    return (job.backend, job.model, job.dimensions)
+
+
+def load_jobs(conn) -> list:
+    """Re-embedding job rows, one per vector table."""
+    return conn.execute(text("SELECT * FROM reembed_jobs ORDER BY table_name")).fetchall()
+
+
+def index_is_valid(conn, index: str) -> bool:
+    """Whether an index exists and finished building (a failed CONCURRENTLY build leaves it invalid)."""
+    return bool(conn.execute(
+        text("SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:index)"), {"index": index}
+    ).scalar())
+
+
+def start_reembed(
+    backend: str = EMBEDDING_BACKEND,
+    model: str = EMBEDDING_MODEL,
+    dimensions: int = EMBEDDING_DIMENSIONS
+) -> list[dict]:
+    """
+    Start re-embedding every vector table into (backend, model, dimensions):
+    add an empty shadow column, the trigger that clears it when a row's text
+    changes, and a job row per table. Both tables are covered because their
+    queries share one embedding. Starting the same job again is a no-op.
+    """
+    spec = (backend, model, int(dimensions))
+    get_backend(backend)
+    with engine.connect() as conn:
+        jobs = load_jobs(conn)
+        if any(job.status == "flipped" for job in jobs):
+            raise ValueError("A flipped re-embedding hasn't been finished; run `finish` first")
+        if jobs:
+            if job_spec(jobs[0]) != spec:
+                raise ValueError(f"A re-embedding to {job_spec(jobs[0])} is in progress; abort it first")
+            return job_status()
+        if read_active_embedding(conn) == spec:
+            raise ValueError(f"The vector columns already hold {spec}")
+        conn.execute(text("SELECT set_config('lock_timeout', :timeout, true)"), {"timeout": REEMBED_LOCK_TIMEOUT})
+        conn.execute(text(RESET_EMBEDDING_NEXT_FUNCTION))
+        for table in VECTOR_INDEXES:
+            conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {SHADOW_COLUMN} vector({int(dimensions)})"))
+            conn.execute(text(f"""
+                CREATE TRIGGER {table}_reset_embedding_next
+                BEFORE UPDATE ON {table}
+                FOR EACH ROW EXECUTE FUNCTION reset_embedding_next()
+            """))
+            conn.execute(text("""
+                INSERT INTO reembed_jobs (table_name, backend, model, dimensions, status, rows_done, last_id)
+                VALUES (:table, :backend, :model, :dimensions, 'running', 0, 0)
+            """), {"table": table, "backend": backend, "model": model, "dimensions": int(dimensions)})
+        conn.commit()
+    logger.info(f"Started re-embedding {', '.join(VECTOR_INDEXES)} into {spec}")
+    return job_status()
+
+
+def pending_rows(cursor, table: str, after_id: int, limit: int) -> list[dict]:
+    """Rows past after_id, in id order, that don't have a shadow vector yet."""
+    cursor.execute(f"""
+        SELECT id, content_hash, {', '.join(sync_fields(table))}
+        FROM {table}
+        WHERE {SHADOW_COLUMN} IS NULL AND id > %s
+        ORDER BY id
+        LIMIT %s
+    """, (after_id, limit))
+    return cursor.fetchall()
+
+
+def embed_shadow(table: str, rows: list[dict], spec: EmbeddingSpec) -> list[dict]:
+    """Rows with their shadow vectors in the job's embedding."""
+    _, embedding_text = INGEST_TABLES[table]
+    embeddings = get_embeddings_batch([embedding_text(row) for row in rows], spec=spec)
+    return [{**row, SHADOW_COLUMN: embedding} for row, embedding in zip(rows, embeddings)]
+
+
+def store_shadow(cursor, table: str, rows: list[dict]) -> int:
+    """
+    Store embedded rows' shadow vectors in the cursor's transaction. Rows
+    whose text changed since they were read are skipped (the job comes back
+    for them). Shadow writes don't touch updated_at or bump the corpus
+    version: nothing searches see changes. Returns rows written.
+    """
+    # stage_rows reads tuples, whatever row factory the caller's cursor uses
+    with cursor.connection.cursor() as writer:
+        writer.execute("SELECT set_config('app.shadow_write', 'on', true)")
+        staging, _ = stage_rows(writer, table, ["id", "content_hash", SHADOW_COLUMN], rows)
+        writer.execute(f"""
+            UPDATE {table} t
+            SET {SHADOW_COLUMN} = s.{SHADOW_COLUMN}
+            FROM {staging} s
+            WHERE t.id = s.id AND t.content_hash IS NOT DISTINCT FROM s.content_hash
+        """)
+        written = writer.rowcount
+        writer.execute(f"DROP TABLE {staging}")
+        writer.execute("SELECT set_config('app.shadow_write', 'off', true)")
+    return written
+
+
+def reembed_table(
+    job,
+    batch_size: int = REEMBED_BATCH_SIZE,
+    rows_per_second: float = REEMBED_ROWS_PER_SECOND,
+    progress_seconds: float = REEMBED_PROGRESS_SECONDS
+) -> dict:
+    """
+    Fill a table's shadow column in id order, one committed batch at a time,
+    recording the last id so an interrupted job resumes there. Once no row
+    is missing a shadow vector, the shadow index is built concurrently and
+    the job is marked ready to flip.
+    """
+    table, spec = job.table_name, job_spec(job)
+    last_id = job.last_id
+    written = 0
+    started = last_progress = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        with conn.cursor(row_factory=dict_row) as cursor:
+            while True:
+                batch_started = time.perf_counter()
+                rows = pending_rows(cursor, table, last_id, batch_size)
+                if not rows:
+                    conn.rollback()
+                    if last_id == 0:
+                        break
+                    # Rows skipped because they changed mid-batch sit behind the cursor
+                    last_id = 0
+                    continue
+                count = store_shadow(cursor, table, embed_shadow(table, rows, spec))
+                last_id = rows[-1]["id"]
+                written += count
+                rate = written / (time.perf_counter() - started)
+                cursor.execute("""
+                    UPDATE reembed_jobs
+                    SET rows_done = rows_done + %s, last_id = %s, rows_per_second = %s,
+                        status = 'running', updated_at = now()
+                    WHERE table_name = %s
+                """, (count, last_id, round(rate, 1), table))
+                conn.commit()
+                now = time.perf_counter()
+                if now - last_progress >= progress_seconds:
+                    last_progress = now
+                    logger.info(f"Re-embedding {table}: {written} rows this run, up to id {last_id}, {rate:.0f} rows/s")
+                time.sleep(throttle_delay(len(rows), now - batch_started, rows_per_second))
+    except Exception:
+        raw.driver_connection.rollback()
+        raise
+    finally:
+        raw.close()
+    seconds = time.perf_counter() - started
+
+    index_build = None
+    with engine.connect() as conn:
+        built = index_is_valid(conn, shadow_index(table))
+    if not built:
+        index_build = build_vector_index(table, shadow_index(table), concurrently=True, column=SHADOW_COLUMN)
+    with engine.connect() as conn:
+        conn.execute(text(f"ANALYZE {table}"))
+        conn.execute(text(
+            "UPDATE reembed_jobs SET status = 'ready', updated_at = now() WHERE table_name = :table"
+        ), {"table": table})
+        conn.commit()
+    logger.info(f"Re-embedded {written} rows of {table} in {seconds:.1f}s; ready to flip")
+    return {
+        "table": table,
+        "rows": written,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(written / seconds, 1) if seconds else None,
+        "index_build": index_build,
+    }
+
+
+def run_reembed(
+    batch_size: int = REEMBED_BATCH_SIZE,
+    rows_per_second: float = REEMBED_ROWS_PER_SECOND,
+    progress_seconds: float = REEMBED_PROGRESS_SECONDS
+) -> list[dict]:
+    """Run (or resume) the started job on every table until each is ready to flip."""
+    with engine.connect() as conn:
+        jobs = load_jobs(conn)
+    if not jobs:
+        raise ValueError("No re-embedding job; run `start` first")
+    return [
+        reembed_table(job, batch_size, rows_per_second, progress_seconds)
+        for job in jobs if job.status != "flipped"
+    ]
+
+
+def flip_embeddings(catch_up: int = REEMBED_BATCH_SIZE, lock_timeout: str = REEMBED_LOCK_TIMEOUT) -> dict:
+    """
+    Atomically switch searches to the shadow vectors, in one transaction.
+
+    Up to catch_up rows inserted or changed since the job finished are
+    embedded first; with more, the flip is refused. Writes are then blocked
+    (SHARE lock) while those vectors are stored, for rows whose text is
+    still the one embedded; if any row is still missing a shadow vector
+    (it changed meanwhile), the flip is refused. The columns and indexes
+    are then renamed (embedding becomes
+    embedding_prev, embedding_next becomes embedding) under a brief ACCESS
+    EXCLUSIVE lock, the corpus versions are bumped so cached results
+    expire, and the semantic cache is resized if the dimensions changed.
+    Running processes pick the new embedding up within
+    EMBEDDING_SPEC_REFRESH_SECONDS.
+    """
+    with engine.connect() as conn:
+        jobs = load_jobs(conn)
+        previous = read_active_embedding(conn)
+    if not jobs:
+        raise ValueError("No re-embedding job; run `start` first")
+    not_ready = [job.table_name for job in jobs if job.status != "ready"]
+    if not_ready:
+        raise ValueError(f"Re-embedding of {', '.join(not_ready)} isn't ready; run the job to completion first")
+    spec = job_spec(jobs[0])
+    tables = [job.table_name for job in jobs]
+    caught_up = {}
+    started = time.perf_counter()
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        with conn.cursor(row_factory=dict_row) as cursor:
+            # Embed the stragglers before locking, so writes don't wait on the embedding API
+            stragglers = {}
+            for table in tables:
+                stragglers[table] = pending_rows(cursor, table, 0, catch_up + 1)
+                if len(stragglers[table]) > catch_up:
+                    raise ValueError(
+                        f"{table} has more than {catch_up} rows without a new embedding; run the job again"
+                    )
+            conn.rollback()
+            for table, rows in stragglers.items():
+                stragglers[table] = embed_shadow(table, rows, spec) if rows else []
+
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", (lock_timeout,))
+            cursor.execute(f"LOCK TABLE {', '.join(tables)} IN SHARE MODE")
+            for table, rows in stragglers.items():
+                caught_up[table] = store_shadow(cursor, table, rows) if rows else 0
+                if pending_rows(cursor, table, 0, 1):
+                    raise ValueError(f"{table} changed while the flip was embedding its last rows; flip again")
+            cursor.execute(f"LOCK TABLE {', '.join(tables)} IN ACCESS EXCLUSIVE MODE")
+            for table in tables:
+                index = VECTOR_INDEXES[table]
+                cursor.execute(f"DROP TRIGGER {table}_reset_embedding_next ON {table}")
+                cursor.execute(f"ALTER TABLE {table} RENAME COLUMN embedding TO {PREVIOUS_COLUMN}")
+                cursor.execute(f"ALTER TABLE {table} RENAME COLUMN {SHADOW_COLUMN} TO embedding")
+                cursor.execute(f"ALTER INDEX {index} RENAME TO {index}_prev")
+                cursor.execute(f"ALTER INDEX {shadow_index(table)} RENAME TO {index}")
+                for suffix in ("_halfvec", "_binary"):
+                    cursor.execute("SELECT to_regclass(%s) IS NOT NULL AS found", (index + suffix,))
+                    if cursor.fetchone()["found"]:
+                        # Expression indexes over the old column; finish_reembed recreates them
+                        cursor.execute(f"DROP INDEX {index}{suffix}")
+                        logger.warning(f"Dropped {index}{suffix}; quantized search is unavailable until `finish`")
+                cursor.execute("""
+                    UPDATE corpus_versions SET version = version + 1, updated_at = now()
+                    WHERE table_name = %s
+                """, (table,))
+            cursor.execute("DROP FUNCTION reset_embedding_next()")
+            if spec[2] != previous[2]:
+                # Cached answers were matched in the old embedding space
+                cursor.execute("TRUNCATE semantic_cache")
+                cursor.execute("DROP INDEX IF EXISTS idx_semantic_cache_embedding")
+                cursor.execute(f"ALTER TABLE semantic_cache ALTER COLUMN embedding TYPE vector({int(spec[2])})")
+                cursor.execute(
+                    f"CREATE INDEX idx_semantic_cache_embedding ON semantic_cache "
+                    f"USING hnsw (embedding vector_cosine_ops) {hnsw_options()}"
+                )
+            cursor.execute("""
+                UPDATE reembed_jobs SET status = 'flipped', flipped_at = now(), updated_at = now()
+            """)
+        conn.commit()
+    except Exception:
+        raw.driver_connection.rollback()
+        raise
+    finally:
+        raw.close()
+    invalidate_active_embedding()
+    seconds = time.perf_counter() - started
+    logger.info(
+        f"Flipped {', '.join(tables)} from {previous} to {spec} in {seconds:.2f}s; set "
+        f"EMBEDDING_BACKEND/EMBEDDING_MODEL/EMBEDDING_DIMENSIONS to match, then run `finish`"
+    )
+    return {"from": list(previous), "to": list(spec), "caught_up": caught_up, "seconds": round(seconds, 3)}
+
+
+def finish_reembed() -> dict:
+    """
+    Drop the previous vectors once the configuration names the flipped
+    embedding (until then the registry row is what keeps queries on it),
+    recreate the quantized indexes and clear the job.
+    """
+    with engine.connect() as conn:
+        jobs = load_jobs(conn)
+        if not jobs or any(job.status != "flipped" for job in jobs):
+            raise ValueError("No flipped re-embedding to finish; run `flip` first")
+        spec = job_spec(jobs[0])
+        if spec != CONFIGURED_EMBEDDING:
+            raise ValueError(
+                f"Configured embedding {CONFIGURED_EMBEDDING} isn't the flipped {spec}; update "
+                f"EMBEDDING_BACKEND/EMBEDDING_MODEL/EMBEDDING_DIMENSIONS before finishing"
+            )
+        conn.execute(text("SELECT set_config('lock_timeout', :timeout, true)"), {"timeout": REEMBED_LOCK_TIMEOUT})
+        for job in jobs:
+            conn.execute(text(f"ALTER TABLE {job.table_name} DROP COLUMN IF EXISTS {PREVIOUS_COLUMN}"))
+        conn.execute(text("DELETE FROM reembed_jobs"))
+        create_quantized_indexes(conn, spec[2])
+        conn.commit()
+    invalidate_active_embedding()
+    logger.info(f"Finished re-embedding into {spec}; previous vectors dropped")
+    return {"embedding": list(spec), "tables": [job.table_name for job in jobs]}
+
+
+def abort_reembed() -> dict:
+    """Drop an unflipped job's shadow columns, indexes and trigger; searches never saw it."""
+    with engine.connect() as conn:
+        jobs = load_jobs(conn)
+        if any(job.status == "flipped" for job in jobs):
+            raise ValueError("The re-embedding was already flipped; run `finish` instead")
+        conn.execute(text("SELECT set_config('lock_timeout', :timeout, true)"), {"timeout": REEMBED_LOCK_TIMEOUT})
+        for table in VECTOR_INDEXES:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {table}_reset_embedding_next ON {table}"))
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN IF EXISTS {SHADOW_COLUMN}"))
+        conn.execute(text("DROP FUNCTION IF EXISTS reset_embedding_next()"))
+        conn.execute(text("DELETE FROM reembed_jobs"))
+        conn.commit()
+    logger.info("Aborted re-embedding; shadow columns dropped")
+    return {"aborted": [job.table_name for job in jobs]}
+
+
+def job_status() -> list[dict]:
+    """Per table: target embedding, status, shadow coverage, throughput and estimated time left."""
+    report = []
+    with engine.connect() as conn:
+        for job in load_jobs(conn):
+            if job.status == "flipped":
+                total = covered = conn.execute(text(f"SELECT count(*) FROM {job.table_name}")).scalar()
+            else:
+                total, covered = conn.execute(text(
+                    f"SELECT count(*), count({SHADOW_COLUMN}) FROM {job.table_name}"
+                )).one()
+            remaining = total - covered
+            rate = job.rows_per_second
+            if not remaining:
+                eta = 0.0
+            else:
+                eta = round(remaining / rate, 1) if rate else None
+            report.append({
+                "table": job.table_name,
+                "embedding": list(job_spec(job)),
+                "status": job.status,
+                "rows": total,
+                "covered": covered,
+                "coverage": round(covered / total, 4) if total else 1.0,
+                "rows_done": job.rows_done,
+                "rows_per_second": rate,
+                "eta_seconds": eta,
+                "shadow_index": job.status == "flipped" or index_is_valid(conn, shadow_index(job.table_name)),
+                "started_at": job.started_at.isoformat() if job.started_at else None,
+                "updated_at": job.updated_at.isoformat() if job.updated_at else None,
+                "flipped_at": job.flipped_at.isoformat() if job.flipped_at else None,
+            })
+    return report
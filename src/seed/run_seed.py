@@ -1,10 +1,10 @@
-"""Seed database with clinical data using SQLAlchemy ORM."""
+"""Seed database with clinical data, syncing incrementally by natural key."""
 
-from src.db.models.base import get_session
-from src.db.models.organization import ClinicalOrganization
-from src.db.models.tool import ClinicalTool
-from src.embeddings.openai_embed import get_embeddings_batch
+from contextlib import nullcontext
+
+from src.db.schema import deferred_vector_indexes, recluster_vector_indexes
 from src.seed.clinical_data import CLINICAL_ORGANIZATIONS, CLINICAL_TOOLS
+from src.seed.sync import sync_table
 from src.logger import get_logger
 
 logger = get_logger(__name__)
@@ -20,75 +20,34 @@ def create_embedding_text_tool(tool: dict) -> str:
     return f"{tool['name']} - {tool['category']}. {tool['description']} {tool['problem_solved']}"
 
 
-def seed_organizations():
-    """Seed clinical organizations with embeddings."""
-    logger.info("Generating embeddings for organizations...")
-    texts = [create_embedding_text_org(org) for org in CLINICAL_ORGANIZATIONS]
-    
-    try:
-        embeddings = get_embeddings_batch(texts)
-    except Exception as e:
-        logger.exception(f"Failed to generate organization embeddings: {e}")
-        raise
-    
-    logger.info(f"Inserting {len(CLINICAL_ORGANIZATIONS)} organizations...")
-    try:
-        with get_session() as session:
-            for org, embedding in zip(CLINICAL_ORGANIZATIONS, embeddings):
-                record = ClinicalOrganization(
-                    name=org["name"],
-                    org_type=org["org_type"],
-                    specialty=org["specialty"],
-                    description=org["description"],
-                    city=org["city"],
-                    state=org["state"],
-                    services=org["services"],
-                    ai_use_cases=org["ai_use_cases"],
-                    embedding=embedding
-                )
-                session.add(record)
-        logger.info("Organizations seeded successfully.")
-    except Exception as e:
-        logger.exception(f"Failed to insert organizations: {e}")
-        raise
+def seed_organizations(reembed: bool = False) -> dict:
+    """Sync clinical organizations, embedding only new or changed texts."""
+    return sync_table(
+        "clinical_organizations", CLINICAL_ORGANIZATIONS, create_embedding_text_org, reembed=reembed
+    )
 
 
-def seed_tools():
-    """Seed clinical tools with embeddings."""
-    logger.info("Generating embeddings for clinical tools...")
-    texts = [create_embedding_text_tool(tool) for tool in CLINICAL_TOOLS]
-    
-    try:
-        embeddings = get_embeddings_batch(texts)
-    except Exception as e:
-        logger.exception(f"Failed to generate tool embeddings: {e}")
-        raise
-    
-    logger.info(f"Inserting {len(CLINICAL_TOOLS)} clinical tools...")
-    try:
-        with get_session() as session:
-            for tool, embedding in zip(CLINICAL_TOOLS, embeddings):
-                record = ClinicalTool(
-                    name=tool["name"],
-                    category=tool["category"],
-                    description=tool["description"],
-                    target_users=tool["target_users"],
-                    problem_solved=tool["problem_solved"],
-                    embedding=embedding
-                )
-                session.add(record)
-        logger.info("Clinical tools seeded successfully.")
-    except Exception as e:
-        logger.exception(f"Failed to insert clinical tools: {e}")
-        raise
+def seed_tools(reembed: bool = False) -> dict:
+    """Sync clinical tools, embedding only new or changed texts."""
+    return sync_table("clinical_tools", CLINICAL_TOOLS, create_embedding_text_tool, reembed=reembed)
 
 
-def run_seed():
-    """Run full seeding process."""
+def run_seed(reembed: bool = False, defer_indexes: bool = False) -> list[dict]:
+    """
+    Run full seeding process. Safe to re-run: rows are upserted by name,
+    only changed texts are re-embedded and rows gone from the source are
+    deleted. reembed=True recomputes every embedding (e.g. after switching
+    EMBEDDING_BACKEND). defer_indexes=True drops the embedding indexes for
+    the load and builds them afterwards, for large initial loads.
+    """
     logger.info("Starting seed process...")
-    seed_organizations()
-    seed_tools()
+    with deferred_vector_indexes() if defer_indexes else nullcontext():
+        reports = [seed_organizations(reembed), seed_tools(reembed)]
+    changed = any(r["inserted"] or r["updated"] or r["deleted"] for r in reports)
+    if changed and not defer_indexes:
+        recluster_vector_indexes()
     logger.info("Seeding complete!")
+    return reports
 
 
 if __name__ == "__main__":
@@ -0,0 +1,414 @@
+"""Streaming, resumable ingestion of JSONL/CSV catalog exports."""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import chain
+from typing import Callable, Iterable, Iterator
+
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_validator
+
+from src.config import (
+    INGEST_BATCH_SIZE,
+    INGEST_CONCURRENCY,
+    INGEST_PROGRESS_SECONDS,
+)
+from src.db.models.base import engine
+from src.db.schema import deferred_vector_indexes, recluster_vector_indexes
+from src.embeddings import get_embeddings_batch
+from src.seed.run_seed import create_embedding_text_org, create_embedding_text_tool
+from src.seed.sync import changed_rows, ingest_key, keyed_row, stored_hashes, sync_fields, upsert_rows
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+# Invalid records past this many are counted but not logged one by one
+INVALID_LOG_LIMIT = 20
+
+
+def _blank_to_none(value):
+    """Empty CSV cells are missing values."""
+    if isinstance(value, str) and not value.strip():
+        return None
+    return value
+
+
+def _parse_list(value):
+    """CSV cells hold lists as a JSON array or ';'-separated values."""
+    value = _blank_to_none(value)
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith("["):
+            return json.loads(value)
+        return [item.strip() for item in value.split(";") if item.strip()]
+    return value
+
+
+class CatalogRecord(BaseModel):
+    """Fields shared by every catalog record; unknown fields are ignored."""
+
+    model_config = ConfigDict(extra="ignore", str_strip_whitespace=True)
+
+    name: str = Field(..., min_length=1, max_length=255)
+    description: str = Field(..., min_length=1)
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def blank_to_none(cls, value):
+        return _blank_to_none(value)
+
+
+class OrganizationRecord(CatalogRecord):
+    """A clinical_organizations row as it arrives in an export."""
+
+    org_type: str = Field(..., min_length=1, max_length=50)
+    specialty: str | None = Field(default=None, max_length=100)
+    city: str | None = Field(default=None, max_length=100)
+    state: str | None = Field(default=None, max_length=50)
+    services: dict | None = None
+    ai_use_cases: list[str] | None = None
+
+    @field_validator("services", mode="before")
+    @classmethod
+    def parse_services(cls, value):
+        value = _blank_to_none(value)
+        return json.loads(value) if isinstance(value, str) else value
+
+    @field_validator("ai_use_cases", mode="before")
+    @classmethod
+    def parse_use_cases(cls, value):
+        return _parse_list(value)
+
+
+class ToolRecord(CatalogRecord):
+    """A clinical_tools row as it arrives in an export."""
+
+    category: str = Field(..., min_length=1, max_length=100)
+    target_users: list[str] | None = None
+    problem_solved: str | None = None
+
+    @field_validator("target_users", mode="before")
+    @classmethod
+    def parse_target_users(cls, value):
+        return _parse_list(value)
+
+
+# Record schema and embedding text per ingestible table
+INGEST_TABLES = {
+    "clinical_organizations": (OrganizationRecord, create_embedding_text_org),
+    "clinical_tools": (ToolRecord, create_embedding_text_tool),
+}
+
+
+def detect_format(path: str) -> str:
+    """Input format from a file's extension."""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix not in FORMATS:
+        raise ValueError(f"Can't tell the format of {path}; pass jsonl or csv explicitly")
+    return FORMATS[suffix]
+
+
+def file_fingerprint(path: str) -> str:
+    """Size and modification time, so a checkpoint is only resumed against the file it was taken on."""
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def read_jsonl(path: str, offset: int = 0) -> Iterator[tuple[int, dict | None]]:
+    """(byte offset after the record, record) per non-blank line; None for a line that isn't a JSON object."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        position = offset
+        for line in iter(f.readline, b""):
+            position += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield position, record if isinstance(record, dict) else None
+
+
+def read_csv(path: str, offset: int = 0) -> Iterator[tuple[int, dict | None]]:
+    """
+    (byte offset after the record, record) per CSV row, keyed by the header
+    row, which is re-read when resuming mid-file. Offsets stay exact across
+    quoted fields spanning lines because the reader pulls one line at a time.
+    """
+    with open(path, "rb") as f:
+        header = next(csv.reader([f.readline().decode("utf-8-sig")]), None)
+        if header is None:
+            return
+        f.seek(max(offset, f.tell()))
+        position = f.tell()
+
+        def lines():
+            nonlocal position
+            for line in iter(f.readline, b""):
+                position += len(line)
+                yield line.decode("utf-8")
+
+        for row in csv.reader(lines()):
+            if not any(cell.strip() for cell in row):
+                continue
+            yield position, dict(zip(header, row)) if len(row) == len(header) else None
+
+
+READERS = {"jsonl": read_jsonl, "csv": read_csv}
+
+
+def read_batches(
+    records: Iterable[tuple[int, dict | None]],
+    model: type[BaseModel],
+    batch_size: int
+) -> Iterator[tuple[int, list[dict], int]]:
+    """(byte offset after the batch, validated records, invalid count) per batch of input records."""
+    batch, invalid, logged, position = [], 0, 0, None
+    for position, record in records:
+        try:
+            if record is None:
+                raise ValueError("unparseable record")
+            batch.append(model.model_validate(record).model_dump())
+        except (ValidationError, ValueError) as e:
+            invalid += 1
+            if logged < INVALID_LOG_LIMIT:
+                logged += 1
+                logger.warning(f"Skipping invalid record ending at byte {position}: {e}")
+        if len(batch) + invalid >= batch_size:
+            yield position, batch, invalid
+            batch, invalid = [], 0
+    if batch or invalid:
+        yield position, batch, invalid
+
+
+def load_checkpoint(table: str, source: str, fingerprint: str) -> tuple[int, int]:
+    """(byte offset, records) to resume from; zeros when there's none or it belongs to another file."""
+    raw = engine.raw_connection()
+    try:
+        with raw.driver_connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT fingerprint, byte_offset, records FROM ingest_checkpoints "
+                "WHERE table_name = %s AND source = %s",
+                (table, source),
+            )
+            row = cursor.fetchone()
+        raw.driver_connection.rollback()
+    finally:
+        raw.close()
+    if row is None:
+        return 0, 0
+    if row[0] != fingerprint:
+        logger.warning(f"{source} changed since its checkpoint; ingesting from the start")
+        return 0, 0
+    return row[1], row[2]
+
+
+def save_checkpoint(cursor, table: str, source: str, fingerprint: str, offset: int, records: int) -> None:
+    """Record progress in the cursor's transaction, so it commits with the rows it covers."""
+    cursor.execute("""
+        INSERT INTO ingest_checkpoints (table_name, source, fingerprint, byte_offset, records, updated_at)
+        VALUES (%s, %s, %s, %s, %s, now())
+        ON CONFLICT (table_name, source) DO UPDATE SET
+            fingerprint = EXCLUDED.fingerprint,
+            byte_offset = EXCLUDED.byte_offset,
+            records = EXCLUDED.records,
+            updated_at = now()
+    """, (table, source, fingerprint, offset, records))
+
+
+def key_batch(
+    table: str,
+    records: list[dict],
+    embedding_text: Callable[[dict], str],
+    key: Callable[[dict], str]
+) -> tuple[dict[str, dict], dict[str, str]]:
+    """Keyed, hashed rows and embedding texts by source key; a key repeated within the batch keeps its last record."""
+    fields = sync_fields(table)
+    rows, texts = {}, {}
+    for record in records:
+        source_key = key(record)
+        texts[source_key] = embedding_text(record)
+        rows[source_key] = keyed_row(record, fields, source_key, texts[source_key])
+    return rows, texts
+
+
+def prepare_batch(
+    table: str,
+    rows: dict[str, dict],
+    texts: dict[str, str],
+    reembed: bool,
+    in_flight: dict[str, tuple] | None = None
+) -> dict:
+    """
+    Compare a keyed batch with the stored hashes and embed only new or
+    changed texts. in_flight holds the (content_hash, record_hash) that
+    earlier, not yet committed batches will write for some of its keys;
+    those keys are compared against that instead of the table, and aren't
+    embedded twice by reembed.
+    """
+    in_flight = in_flight or {}
+    raw = engine.raw_connection()
+    try:
+        with raw.driver_connection.cursor() as cursor:
+            stored, _ = stored_hashes(cursor, table, list(rows))
+        raw.driver_connection.rollback()
+    finally:
+        raw.close()
+
+    to_embed, metadata_only = changed_rows(
+        (row for source_key, row in rows.items() if source_key not in in_flight), stored, reembed
+    )
+    repeated_embed, repeated_metadata = changed_rows(
+        (row for source_key, row in rows.items() if source_key in in_flight), in_flight
+    )
+    to_embed += repeated_embed
+    metadata_only += repeated_metadata
+    stored.update(in_flight)
+    if to_embed:
+        embeddings = get_embeddings_batch([texts[row["source_key"]] for row in to_embed])
+        to_embed = [{**row, "embedding": embedding} for row, embedding in zip(to_embed, embeddings)]
+    inserted = sum(1 for row in to_embed if row["source_key"] not in stored)
+    return {
+        "rows": chain(to_embed, metadata_only),
+        "changed": len(to_embed) + len(metadata_only),
+        "inserted": inserted,
+        "updated": len(to_embed) - inserted + len(metadata_only),
+        "embedded": len(to_embed),
+        "unchanged": len(rows) - len(to_embed) - len(metadata_only),
+        "keys": list(rows),
+    }
+
+
+def ingest_file(
+    table: str,
+    path: str,
+    input_format: str | None = None,
+    key: Callable[[dict], str] = lambda record: record["name"],
+    batch_size: int = INGEST_BATCH_SIZE,
+    concurrency: int = INGEST_CONCURRENCY,
+    restart: bool = False,
+    reembed: bool = False,
+    defer_indexes: bool = False,
+    progress_seconds: float = INGEST_PROGRESS_SECONDS,
+    namespace: str | None = None
+) -> dict:
+    """
+    Stream a JSONL or CSV export into a vector table.
+
+    Records are read lazily and validated; invalid ones are counted and
+    skipped. Up to `concurrency` batches are embedded ahead of the writer,
+    which upserts each batch by source key (embedding only new or changed
+    texts) and commits it together with the byte offset it reached, so
+    memory stays bounded by the batches in flight and a crashed run resumes
+    where its last commit left off. A key already in an uncommitted batch
+    is compared with that batch's record rather than the table, so it isn't
+    embedded or counted twice. restart=True ignores the checkpoint.
+    Rows missing from the export aren't deleted: exports can be partial.
+    Source keys are namespaced (ingest:<namespace>:<key>, the namespace
+    defaulting to the file name), so ingested rows never collide with the
+    seed's rows and its sync doesn't delete them; exports of one catalog
+    under changing file names should share a namespace.
+    defer_indexes=True drops the table's embedding index for the load and
+    builds it afterwards (see deferred_vector_indexes).
+    """
+    model, embedding_text = INGEST_TABLES[table]
+    namespace = namespace or os.path.basename(path)
+    input_format = input_format or detect_format(path)
+    source = os.path.abspath(path)
+    fingerprint = file_fingerprint(path)
+    size = os.path.getsize(path)
+    offset, records = (0, 0) if restart else load_checkpoint(table, source, fingerprint)
+    if offset:
+        logger.info(f"Resuming {source} at byte {offset} ({records} records already ingested)")
+
+    totals = dict.fromkeys(("valid", "invalid", "duplicates", "inserted", "updated", "embedded", "unchanged"), 0)
+    started = last_progress = time.perf_counter()
+    start_offset, start_records = offset, records
+    batches = read_batches(READERS[input_format](path, offset), model, batch_size)
+
+    with deferred_vector_indexes([table]) if defer_indexes else nullcontext([]) as index_builds:
+        raw = engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                pending = deque()
+                # Hashes of keys in uncommitted batches: source_key -> (batch number, hashes) of the last one
+                in_flight = {}
+
+                def write_next():
+                    nonlocal offset, records, last_progress
+                    number, batch_offset, batch_records, invalid, duplicates, future = pending.popleft()
+                    prepared = future.result()
+                    with conn.cursor() as cursor:
+                        if prepared["changed"]:
+                            upsert_rows(cursor, table, prepared["rows"])
+                        records += batch_records + invalid
+                        save_checkpoint(cursor, table, source, fingerprint, batch_offset, records)
+                    conn.commit()
+                    for source_key in prepared["keys"]:
+                        if in_flight[source_key][0] == number:
+                            del in_flight[source_key]
+                    offset = batch_offset
+                    totals["valid"] += batch_records
+                    totals["invalid"] += invalid
+                    totals["duplicates"] += duplicates
+                    for name in ("inserted", "updated", "embedded", "unchanged"):
+                        totals[name] += prepared[name]
+                    now = time.perf_counter()
+                    if now - last_progress >= progress_seconds:
+                        last_progress = now
+                        rate = (records - start_records) / (now - started)
+                        logger.info(
+                            f"Ingesting {table}: {records} records, {offset / size:.1%} of {source}, "
+                            f"{rate:.0f} records/s, {totals['embedded']} embedded"
+                        )
+
+                for number, (batch_offset, batch, invalid) in enumerate(batches):
+                    rows, texts = key_batch(
+                        table, batch, embedding_text, lambda record: ingest_key(namespace, key(record))
+                    )
+                    earlier = {source_key: in_flight[source_key][1] for source_key in rows if source_key in in_flight}
+                    future = executor.submit(prepare_batch, table, rows, texts, reembed, earlier)
+                    for source_key, row in rows.items():
+                        in_flight[source_key] = (number, (row["content_hash"], row["record_hash"]))
+                    pending.append((number, batch_offset, len(batch), invalid, len(batch) - len(rows), future))
+                    if len(pending) >= concurrency:
+                        write_next()
+                while pending:
+                    write_next()
+        except Exception:
+            raw.driver_connection.rollback()
+            raise
+        finally:
+            raw.close()
+        seconds = time.perf_counter() - started
+
+    ingested = records - start_records
+    report = {
+        "table": table,
+        "source": source,
+        "format": input_format,
+        "resumed_from": start_offset,
+        "offset": offset,
+        "bytes": size,
+        "records": ingested,
+        **totals,
+        "seconds": round(seconds, 3),
+        "records_per_second": round(ingested / seconds, 1) if seconds else None,
+        "index_builds": index_builds,
+    }
+    logger.info(
+        f"Ingested {ingested} records into {table} in {seconds:.1f}s: {totals['inserted']} inserted, "
+        f"{totals['updated']} updated ({totals['embedded']} embedded), {totals['unchanged']} unchanged, "
+        f"{totals['invalid']} invalid"
+    )
+    if (totals["inserted"] or totals["updated"]) and not defer_indexes:
+        recluster_vector_indexes(tables=[table])
+    return report
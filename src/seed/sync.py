@@ -0,0 +1,176 @@
+"""Incremental, idempotent sync of a source catalog into a vector table."""
+
+import hashlib
+import json
+import time
+from datetime import datetime
+from itertools import chain
+from typing import Callable, Iterable
+
+from src.db.models.base import engine
+from src.seed.bulk_load import BULK_COLUMNS, embed_rows, stage_rows
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+KEY_COLUMNS = ["source_key", "content_hash", "record_hash"]
+SOURCE_KEY_LENGTH = 255
+# Rows streamed in by ingest_file carry keys under this prefix; the seed's sync doesn't own them
+INGEST_KEY_PREFIX = "ingest:"
+
+
+def content_hash(text: str) -> str:
+    """Hash of a record's embedding text; the embedding is recomputed only when it changes."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def record_hash(record: dict, columns: list[str]) -> str:
+    """Hash of every synced field, so rows that didn't change at all aren't written."""
+    payload = json.dumps({column: record.get(column) for column in columns}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sync_fields(table: str) -> list[str]:
+    """Source fields synced into a table (everything loaded except embedding and created_at)."""
+    return [column for column in BULK_COLUMNS[table] if column not in ("embedding", "created_at")]
+
+
+def keyed_row(record: dict, fields: list[str], source_key: str, text: str) -> dict:
+    """A record's synced fields with its source key and hashes."""
+    return {
+        **{field: record.get(field) for field in fields},
+        "source_key": source_key,
+        "content_hash": content_hash(text),
+        "record_hash": record_hash(record, fields),
+    }
+
+
+def ingest_key(namespace: str, key: str) -> str:
+    """Source key of an ingested record, namespaced per source; hashed when too long for the column."""
+    source_key = f"{INGEST_KEY_PREFIX}{namespace}:{key}"
+    if len(source_key) > SOURCE_KEY_LENGTH:
+        source_key = f"{INGEST_KEY_PREFIX}{hashlib.sha256(source_key.encode('utf-8')).hexdigest()}"
+    return source_key
+
+
+def stored_hashes(cursor, table: str, keys: list[str] | None = None) -> tuple[dict[str, tuple], int]:
+    """(content_hash, record_hash) per stored source key, for some keys or all, and the unkeyed row count."""
+    if keys is None:
+        cursor.execute(f"SELECT source_key, content_hash, record_hash FROM {table}")
+    else:
+        cursor.execute(
+            f"SELECT source_key, content_hash, record_hash FROM {table} WHERE source_key = ANY(%s)", (keys,)
+        )
+    stored, unkeyed = {}, 0
+    for source_key, stored_content, stored_record in cursor.fetchall():
+        if source_key is None:
+            unkeyed += 1
+        else:
+            stored[source_key] = (stored_content, stored_record)
+    return stored, unkeyed
+
+
+def changed_rows(rows: Iterable[dict], stored: dict[str, tuple], reembed: bool = False) -> tuple[list, list]:
+    """Split rows into (needing an embedding, changed outside the embedding text); unchanged rows drop out."""
+    to_embed, metadata_only = [], []
+    for row in rows:
+        previous = stored.get(row["source_key"])
+        if reembed or previous is None or previous[0] != row["content_hash"]:
+            to_embed.append(row)
+        elif previous[1] != row["record_hash"]:
+            metadata_only.append({**row, "embedding": None})
+    return to_embed, metadata_only
+
+
+def upsert_sql(table: str, staging: str, columns: list[str]) -> str:
+    """Move staged rows into the table by source_key; a NULL staged embedding keeps the stored one."""
+    updates = [f"{column} = EXCLUDED.{column}" for column in columns if column not in ("embedding", "created_at")]
+    updates.append(f"embedding = COALESCE(EXCLUDED.embedding, {table}.embedding)")
+    return f"""
+        INSERT INTO {table} ({', '.join(columns)})
+        SELECT {', '.join(columns)} FROM {staging}
+        ON CONFLICT (source_key) DO UPDATE SET {', '.join(updates)}
+    """
+
+
+def upsert_rows(cursor, table: str, rows: Iterable[dict]) -> None:
+    """Stage keyed rows with binary COPY and upsert them in the cursor's transaction."""
+    columns = sync_fields(table) + KEY_COLUMNS + ["embedding", "created_at"]
+    staging, _ = stage_rows(cursor, table, columns, rows, {"created_at": datetime.utcnow()})
+    cursor.execute(upsert_sql(table, staging, columns))
+
+
+def sync_table(
+    table: str,
+    records: Iterable[dict],
+    embedding_text: Callable[[dict], str],
+    key: Callable[[dict], str] = lambda record: record["name"],
+    reembed: bool = False,
+    batch_size: int = 1000
+) -> dict:
+    """
+    Make a table match a source catalog, keyed by each record's natural key.
+
+    New records and records whose embedding text changed are embedded and
+    upserted; records where only other fields changed are upserted keeping
+    their embedding; unchanged records aren't touched; rows whose key
+    vanished from the source, and unkeyed rows from earlier non-incremental
+    seeds, are deleted; rows ingested from exports (keys under
+    INGEST_KEY_PREFIX) belong to their own sources and are left alone.
+    Embedding cost follows the diff, not the catalog (reembed=True embeds
+    everything). All writes share one transaction, and
+    a sync with nothing to change writes nothing, so the corpus version and
+    the caches keyed on it survive a no-op nightly run.
+    """
+    started = time.perf_counter()
+    fields = sync_fields(table)
+    rows, texts = {}, {}
+    for record in records:
+        source_key = key(record)
+        if source_key in rows:
+            raise ValueError(f"Duplicate source key '{source_key}' for {table}")
+        texts[source_key] = embedding_text(record)
+        rows[source_key] = keyed_row(record, fields, source_key, texts[source_key])
+
+    raw = engine.raw_connection()
+    try:
+        conn = raw.driver_connection
+        with conn.cursor() as cursor:
+            stored, unkeyed = stored_hashes(cursor, table)
+            to_embed, metadata_only = changed_rows(rows.values(), stored, reembed)
+            vanished = [
+                source_key for source_key in stored
+                if source_key not in rows and not source_key.startswith(INGEST_KEY_PREFIX)
+            ]
+            if to_embed or metadata_only:
+                embedded = embed_rows(to_embed, lambda row: texts[row["source_key"]], batch_size)
+                upsert_rows(cursor, table, chain(embedded, metadata_only))
+            deleted = 0
+            if vanished or unkeyed:
+                cursor.execute(
+                    f"DELETE FROM {table} WHERE source_key IS NULL OR source_key = ANY(%s)", (vanished,)
+                )
+                deleted = cursor.rowcount
+        conn.commit()
+    except Exception:
+        raw.driver_connection.rollback()
+        raise
+    finally:
+        raw.close()
+
+    inserted = sum(1 for row in to_embed if row["source_key"] not in stored)
+    report = {
+        "table": table,
+        "source_rows": len(rows),
+        "inserted": inserted,
+        "updated": len(to_embed) - inserted + len(metadata_only),
+        "embedded": len(to_embed),
+        "unchanged": len(rows) - len(to_embed) - len(metadata_only),
+        "deleted": deleted,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info(
+        f"Synced {table}: {report['inserted']} inserted, {report['updated']} updated "
+        f"({report['embedded']} embedded), {report['unchanged']} unchanged, {report['deleted']} deleted"
+    )
+    return report
@@ -76,6 +76,9 @@ class MockToolsRetriever(BaseRetriever):
     
     def search(self, query: str, limit: int = 5) -> list[dict]:
         return self.data[:limit]
+    
+    def search_by_vector(self, embedding: list[float], limit: int = 5) -> list[dict]:
+        return self.data[:limit]
 
 
 class MockOrgsRetriever(BaseRetriever):
@@ -86,3 +89,19 @@ class MockOrgsRetriever(BaseRetriever):
     
     def search(self, query: str, limit: int = 5) -> list[dict]:
         return self.data[:limit]
+    
+    def search_by_vector(self, embedding: list[float], limit: int = 5) -> list[dict]:
+        return self.data[:limit]
+
+
+class MockCombinedRetriever:
+    """Mock combined retriever - records calls, no DB connection needed."""
+    
+    def __init__(self, tools: list[dict] = None, orgs: list[dict] = None):
+        self.tools = tools if tools is not None else MOCK_TOOLS
+        self.orgs = orgs if orgs is not None else MOCK_ORGS
+        self.calls = []
+    
+    def search(self, query: str, limit: int = 5) -> dict[str, list[dict]]:
+        self.calls.append(query)
+        return {"tools": self.tools[:limit], "orgs": self.orgs[:limit]}
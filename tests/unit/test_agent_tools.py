@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+from src.agents import tools
+from src.config import QUERY_SEARCH_PROFILE, SEARCH_PROFILES
+from src.retrievers import pgvector_retriever
+from tests.mocks.mock_embeddings import fake_embedding
+
+EF_SEARCH = "SELECT set_config('hnsw.ef_search', :ef, true)"
+
+
+class RecordingConnection:
+
+    def __init__(self):
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+        return iter([])
+
+
+def test_tools_search_with_the_query_profile_ef_search(monkeypatch):
+    conn = RecordingConnection()
+    monkeypatch.setattr(pgvector_retriever, "engine", SimpleNamespace(connect=lambda: conn))
+    monkeypatch.setattr(tools, "get_embedding", fake_embedding)
+    monkeypatch.setattr(tools, "get_embeddings_batch", lambda texts: [fake_embedding(t) for t in texts])
+    monkeypatch.setattr(tools, "retrieval_cache", None)
+    ef_search = str(SEARCH_PROFILES[QUERY_SEARCH_PROFILE]["ef_search"])
+
+    assert tools.search_clinical_tools.invoke({"query": "ambient scribe"}) == []
+    assert tools.search_healthcare_orgs_many.invoke({"queries": ["sepsis", "imaging"]}) == {
+        "sepsis": [], "imaging": []
+    }
+    ef_settings = [params for sql, params in conn.executed if sql == EF_SEARCH]
+    assert ef_settings == [{"ef": ef_search}, {"ef": ef_search}]
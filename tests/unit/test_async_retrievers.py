@@ -0,0 +1,85 @@
+import asyncio
+
+from src.embeddings.context import embedding_scope
+from src.retrievers import ToolsRetriever
+from src.retrievers.base import BaseRetriever
+from src.retrievers.result_cache import ResultCache
+
+
+class FakeAsyncResultCache(ResultCache):
+    """ResultCache whose async round trips are a dict; the sync ones must not be used."""
+
+    def __init__(self, version=3):
+        super().__init__()
+        self.version = version
+        self.entries = {}
+
+    def lookup(self, table, key):
+        raise AssertionError("asearch must use alookup")
+
+    async def alookup(self, table, key):
+        return self.version, self.entries.get((key, self.version))
+
+    async def astore(self, table, key, version, results):
+        self.entries[(key, version)] = results
+
+
+class StubAsyncToolsRetriever(ToolsRetriever):
+    """Records embeddings and async searches instead of querying Postgres."""
+
+    def __init__(self, **kwargs):
+        self.embedded, self.searches = [], []
+        super().__init__(embed_fn=self._embed, **kwargs)
+
+    def _embed(self, text):
+        self.embedded.append(text)
+        return [1.0, 0.0]
+
+    def search_by_vector(self, *args, **kwargs):
+        raise AssertionError("asearch must not use the sync engine")
+
+    async def asearch_by_vector(self, embedding, limit=5, query=None, filters=None, ef_search=None):
+        self.searches.append((query, limit, filters))
+        return [{"id": len(self.searches), "similarity": 1.0}]
+
+
+class EchoRetriever(BaseRetriever):
+    """Sync-only retriever relying on the default asearch."""
+
+    def search_by_vector(self, embedding, limit=5):
+        return [{"embedding": embedding, "limit": limit}]
+
+
+class TestAsearch:
+
+    def test_uses_async_search_path(self):
+        retriever = StubAsyncToolsRetriever()
+        results = asyncio.run(retriever.asearch("sepsis", limit=3, filters={"category": "Diagnostics"}))
+        assert results == [{"id": 1, "similarity": 1.0}]
+        assert retriever.searches == [("sepsis", 3, {"category": "Diagnostics"})]
+
+    def test_repeat_search_hits_async_cache(self):
+        retriever = StubAsyncToolsRetriever(result_cache=FakeAsyncResultCache())
+
+        async def run():
+            return [await retriever.asearch("sepsis"), await retriever.asearch("sepsis")]
+
+        first, second = asyncio.run(run())
+        assert first == second
+        assert retriever.embedded == ["sepsis"]
+        assert len(retriever.searches) == 1
+
+    def test_worker_thread_embedding_reuses_callers_scope(self):
+        retriever = StubAsyncToolsRetriever()
+
+        async def run():
+            with embedding_scope():
+                retriever.embed_query("sepsis")
+                await retriever.asearch("sepsis")
+
+        asyncio.run(run())
+        assert retriever.embedded == ["sepsis"]
+
+    def test_default_asearch_runs_sync_search(self):
+        retriever = EchoRetriever(embed_fn=lambda text: [float(len(text))])
+        assert asyncio.run(retriever.asearch("abc", limit=2)) == [{"embedding": [3.0], "limit": 2}]
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from src.benchmark.dimensions import dimension_report, shorten
+from src.benchmark.metrics import exact_top_k, latency_summary, recall_at_k
+
+
+@pytest.fixture
+def corpus():
+    return np.random.default_rng(0).normal(size=(200, 64)).astype(np.float32)
+
+
+class TestMetrics:
+
+    def test_recall_at_k(self):
+        assert recall_at_k([[1, 2, 3]], [[1, 2, 4]], k=3) == pytest.approx(2 / 3)
+        assert recall_at_k([[1, 2]], [[1, 2]], k=2) == 1.0
+
+    def test_exact_top_k_orders_best_first(self, corpus):
+        top = exact_top_k(corpus, corpus[:3], k=5)
+        assert top.shape == (3, 5)
+        assert top[:, 0].tolist() == [0, 1, 2]
+
+    def test_latency_summary(self):
+        summary = latency_summary([1.0] * 98 + [50.0, 100.0])
+        assert summary["count"] == 100
+        assert summary["p50_ms"] == 1.0
+        assert summary["max_ms"] == 100.0
+
+
+class TestDimensionReport:
+
+    def test_shorten_returns_unit_vectors(self, corpus):
+        short = shorten(corpus, 16)
+        assert short.shape == (200, 16)
+        assert np.allclose(np.linalg.norm(short, axis=1), 1.0, atol=1e-5)
+
+    def test_full_width_has_perfect_recall(self, corpus):
+        report = dimension_report(corpus, corpus[:20], [16, 64], k=5)
+        assert [r["dimensions"] for r in report] == [16, 64]
+        assert report[-1]["recall@5"] == 1.0
+        assert report[0]["relative_size"] == 0.25
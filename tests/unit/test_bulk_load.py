@@ -0,0 +1,54 @@
+import numpy as np
+from pgvector import Vector
+
+from src.benchmark.ingest import bench_model
+from src.db.models import ClinicalTool
+from src.seed import bulk_load
+from src.seed.bulk_load import copy_value, embed_rows, vector_binary
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+class TestVectorBinary:
+
+    def test_list_matches_pgvector_binary_format(self):
+        embedding = [0.25, -1.5, 3.0]
+        assert vector_binary(embedding) == Vector(embedding).to_binary()
+
+    def test_array_matches_list(self):
+        embedding = fake_embedding("sepsis alerts")
+        assert vector_binary(np.asarray(embedding, dtype=np.float32)) == vector_binary(embedding)
+
+
+class TestCopyValue:
+
+    def test_encodes_vector_columns(self):
+        assert copy_value([1.0, 2.0], "bytea") == Vector([1.0, 2.0]).to_binary()
+
+    def test_passes_other_values_through(self):
+        services = {"telehealth": True}
+        assert copy_value(services, "json") is services
+        assert copy_value(["nurses"], "text[]") == ["nurses"]
+        assert copy_value(None, "bytea") is None
+
+
+def test_embed_rows_batches_lazily(monkeypatch):
+    batches = []
+
+    def embed_batch(texts):
+        batches.append(len(texts))
+        return [fake_embedding(t) for t in texts]
+
+    monkeypatch.setattr(bulk_load, "get_embeddings_batch", embed_batch)
+    records = ({"name": f"tool {i}"} for i in range(5))
+    rows = embed_rows(records, lambda record: record["name"], batch_size=2)
+    first = next(rows)
+    assert batches == [2]
+    assert first == {"name": "tool 0", "embedding": fake_embedding("tool 0")}
+    assert len(list(rows)) == 4
+    assert batches == [2, 2, 1]
+
+
+def test_bench_model_maps_bench_table():
+    model = bench_model(ClinicalTool)
+    assert model.__table__.name == "bench_clinical_tools"
+    assert ClinicalTool.__table__.name == "clinical_tools"
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.embeddings.batcher import EmbeddingBatcher, Histogram
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+class RecordingBatchEmbedder:
+    """Batch embedder that records the batches it receives."""
+
+    def __init__(self):
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        with self._lock:
+            self.batches.append(list(texts))
+        return [fake_embedding(t) for t in texts]
+
+
+class TestHistogram:
+
+    def test_cumulative_buckets(self):
+        hist = Histogram([1, 5, 10])
+        for value in (0.5, 3, 3, 7, 50):
+            hist.observe(value)
+
+        snapshot = hist.snapshot()
+        assert snapshot["buckets"] == {"1": 1, "5": 3, "10": 4, "+Inf": 5}
+        assert snapshot["count"] == 5
+
+
+class TestEmbeddingBatcher:
+
+    def test_concurrent_requests_are_coalesced(self):
+        embedder = RecordingBatchEmbedder()
+        batcher = EmbeddingBatcher(embedder, max_batch_size=64, max_wait_ms=50)
+        texts = [f"query {i}" for i in range(20)]
+
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            results = list(pool.map(batcher, texts))
+        batcher.close()
+
+        assert results == [fake_embedding(t) for t in texts]
+        assert len(embedder.batches) < len(texts)
+        assert batcher.stats()["batch_size"]["count"] == len(embedder.batches)
+
+    def test_respects_max_batch_size(self):
+        embedder = RecordingBatchEmbedder()
+        batcher = EmbeddingBatcher(embedder, max_batch_size=4, max_wait_ms=50)
+
+        results = batcher.embed_many([f"t{i}" for i in range(10)])
+        batcher.close()
+
+        assert len(results) == 10
+        assert max(len(b) for b in embedder.batches) <= 4
+
+    def test_duplicate_texts_embedded_once(self):
+        embedder = RecordingBatchEmbedder()
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=50)
+
+        results = batcher.embed_many(["same", "same", "other"])
+        batcher.close()
+
+        assert results[0] == results[1] == fake_embedding("same")
+        assert sorted(embedder.batches[0]) == ["other", "same"]
+
+    def test_errors_propagate_to_every_caller(self):
+        def failing(texts):
+            raise RuntimeError("rate limited")
+
+        batcher = EmbeddingBatcher(failing, max_wait_ms=1)
+        future = batcher.submit("query")
+
+        with pytest.raises(RuntimeError, match="rate limited"):
+            future.result(timeout=5)
+        batcher.close()
+
+    def test_asyncio_callers(self):
+        embedder = RecordingBatchEmbedder()
+        batcher = EmbeddingBatcher(embedder, max_wait_ms=50)
+
+        async def run():
+            return await asyncio.gather(*(batcher.aembed(f"q{i}") for i in range(8)))
+
+        results = asyncio.run(run())
+        batcher.close()
+
+        assert results == [fake_embedding(f"q{i}") for i in range(8)]
+        assert len(embedder.batches) == 1
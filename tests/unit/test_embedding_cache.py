@@ -0,0 +1,100 @@
+from src.embeddings.cache import EmbeddingCache, normalize_text
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+class CountingEmbedder:
+    """Batch embedder that records every text it is asked to embed."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts: list[str]) -> list[list[float]]:
+        self.calls.append(list(texts))
+        return [fake_embedding(t) for t in texts]
+
+
+class DictStore:
+    """In-memory stand-in for the persistent tier."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get_many(self, keys):
+        return {k: self.data[k] for k in keys if k in self.data}
+
+    def put_many(self, entries, model, dimensions):
+        self.data.update(entries)
+        return 0
+
+
+class TestNormalizeText:
+
+    def test_collapses_whitespace(self):
+        assert normalize_text("  reduce   documentation\nburden ") == "reduce documentation burden"
+
+
+class TestEmbeddingCache:
+
+    def test_repeated_text_skips_compute(self):
+        embedder = CountingEmbedder()
+        cache = EmbeddingCache(model="m", dimensions=1536)
+
+        first = cache.get_many(["drug interactions"], embedder)
+        second = cache.get_many(["drug interactions"], embedder)
+
+        assert first == second
+        assert len(embedder.calls) == 1
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_batch_computes_only_misses_once(self):
+        embedder = CountingEmbedder()
+        cache = EmbeddingCache(model="m", dimensions=1536)
+        cache.get_many(["a"], embedder)
+
+        results = cache.get_many(["a", "b", "b", "c"], embedder)
+
+        assert embedder.calls[-1] == ["b", "c"]
+        assert results[1] == results[2] == fake_embedding("b")
+
+    def test_key_depends_on_model_and_dimensions(self):
+        a = EmbeddingCache(model="m1", dimensions=1536)
+        b = EmbeddingCache(model="m2", dimensions=1536)
+        c = EmbeddingCache(model="m1", dimensions=512)
+        assert len({a.key("text"), b.key("text"), c.key("text")}) == 3
+
+    def test_lru_evicts_least_recently_used(self):
+        embedder = CountingEmbedder()
+        cache = EmbeddingCache(model="m", dimensions=1536, max_entries=2)
+        cache.get_many(["a", "b"], embedder)
+        cache.get_many(["a"], embedder)
+        cache.get_many(["c"], embedder)
+
+        cache.get_many(["a"], embedder)
+        assert len(embedder.calls) == 2
+        assert cache.stats.evictions == 1
+        assert cache.stats.size == 2
+
+    def test_persistent_tier_serves_after_clear(self):
+        embedder = CountingEmbedder()
+        cache = EmbeddingCache(model="m", dimensions=1536, store=DictStore())
+        cache.get_many(["a"], embedder)
+        cache.clear()
+
+        cache.get_many(["a"], embedder)
+
+        assert len(embedder.calls) == 1
+        assert cache.stats.persistent_hits == 1
+
+    def test_store_failure_falls_back_to_compute(self):
+        class BrokenStore:
+            def get_many(self, keys):
+                raise ConnectionError("db down")
+
+            def put_many(self, entries, model, dimensions):
+                raise ConnectionError("db down")
+
+        embedder = CountingEmbedder()
+        cache = EmbeddingCache(model="m", dimensions=1536, store=BrokenStore())
+
+        assert cache.get_many(["a"], embedder) == [fake_embedding("a")]
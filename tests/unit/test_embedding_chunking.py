@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from src.embeddings.chunking import chunk_ranges, embed_in_chunks, estimate_tokens
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+def embed_all(texts: list[str]) -> list[list[float]]:
+    return [fake_embedding(t) for t in texts]
+
+
+class TestChunkRanges:
+
+    def test_bounded_by_item_count(self):
+        ranges = chunk_ranges(["a"] * 10, max_items=4, max_tokens=10_000)
+        assert ranges == [(0, 4), (4, 8), (8, 10)]
+
+    def test_bounded_by_token_budget(self):
+        texts = ["x" * 300] * 6
+        per_text = estimate_tokens(texts[0])
+        ranges = chunk_ranges(texts, max_items=100, max_tokens=per_text * 2)
+        assert all(end - start <= 2 for start, end in ranges)
+        assert ranges[-1][1] == 6
+
+    def test_oversized_text_gets_own_chunk(self):
+        ranges = chunk_ranges(["short", "y" * 3000, "short"], max_items=100, max_tokens=50)
+        assert ranges == [(0, 1), (1, 2), (2, 3)]
+
+    def test_empty_input(self):
+        assert chunk_ranges([], max_items=10, max_tokens=10) == []
+
+
+class TestEmbedInChunks:
+
+    def test_preserves_order_across_chunks(self):
+        texts = [f"text {i}" for i in range(25)]
+        result = embed_in_chunks(texts, embed_all, max_items=4, max_tokens=10_000, concurrency=3)
+        assert result == embed_all(texts)
+
+    def test_retries_failed_chunk(self):
+        attempts = {"count": 0}
+        lock = threading.Lock()
+
+        def flaky(texts):
+            with lock:
+                attempts["count"] += 1
+                fail = attempts["count"] == 1
+            if fail:
+                raise ConnectionError("transient")
+            return embed_all(texts)
+
+        texts = [f"t{i}" for i in range(6)]
+        result = embed_in_chunks(
+            texts, flaky, max_items=2, max_tokens=10_000,
+            backoff_seconds=0, retry_on=(ConnectionError,)
+        )
+        assert result == embed_all(texts)
+        assert attempts["count"] == 4
+
+    def test_non_retryable_error_raises(self):
+        def broken(texts):
+            raise ValueError("bad input")
+
+        with pytest.raises(ValueError):
+            embed_in_chunks(
+                ["a", "b"], broken, max_items=1, max_tokens=100,
+                backoff_seconds=0, retry_on=(ConnectionError,)
+            )
+
+    def test_gives_up_after_max_retries(self):
+        calls = {"count": 0}
+
+        def always_fails(texts):
+            calls["count"] += 1
+            raise ConnectionError("down")
+
+        with pytest.raises(ConnectionError):
+            embed_in_chunks(
+                ["a"], always_fails, max_items=1, max_tokens=100,
+                max_retries=2, backoff_seconds=0, retry_on=(ConnectionError,)
+            )
+        assert calls["count"] == 3
@@ -0,0 +1,77 @@
+from src.agents.state import AgentState
+from src.agents.workflow_advisor import WorkflowAdvisorAgent
+from src.embeddings.context import embedding_scope
+from src.retrievers.base import BaseRetriever
+from tests.conftest import FakeLLM
+from tests.mocks.mock_db import MOCK_TOOLS, MOCK_ORGS
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+class CountingEmbedding:
+    """Embedding function that counts calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, text: str) -> list[float]:
+        self.calls += 1
+        return fake_embedding(text)
+
+
+class VectorRetriever(BaseRetriever):
+    """Retriever that goes through BaseRetriever.search and records vectors."""
+
+    def __init__(self, embed_fn, data):
+        super().__init__(embed_fn)
+        self.data = data
+        self.vectors = []
+
+    def search_by_vector(self, embedding, limit=5):
+        self.vectors.append(embedding)
+        return self.data[:limit]
+
+
+class TestEmbeddingScope:
+
+    def test_without_scope_each_retriever_embeds(self):
+        embed = CountingEmbedding()
+        agent = WorkflowAdvisorAgent(
+            tools_retriever=VectorRetriever(embed, MOCK_TOOLS),
+            orgs_retriever=VectorRetriever(embed, MOCK_ORGS),
+            llm=FakeLLM()
+        )
+        agent.run(AgentState(query="reduce burnout"))
+        assert embed.calls == 2
+
+    def test_scope_embeds_query_once(self):
+        embed = CountingEmbedding()
+        tools = VectorRetriever(embed, MOCK_TOOLS)
+        orgs = VectorRetriever(embed, MOCK_ORGS)
+        agent = WorkflowAdvisorAgent(tools_retriever=tools, orgs_retriever=orgs, llm=FakeLLM())
+
+        with embedding_scope():
+            agent.run(AgentState(query="reduce burnout"))
+
+        assert embed.calls == 1
+        assert tools.vectors[0] == orgs.vectors[0] == fake_embedding("reduce burnout")
+
+    def test_scope_does_not_leak(self):
+        embed = CountingEmbedding()
+        retriever = VectorRetriever(embed, MOCK_TOOLS)
+
+        with embedding_scope():
+            retriever.search("query")
+        with embedding_scope():
+            retriever.search("query")
+
+        assert embed.calls == 2
+
+    def test_distinct_embedding_functions_not_shared(self):
+        first, second = CountingEmbedding(), CountingEmbedding()
+
+        with embedding_scope():
+            VectorRetriever(first, MOCK_TOOLS).search("query")
+            VectorRetriever(second, MOCK_ORGS).search("query")
+
+        assert first.calls == 1
+        assert second.calls == 1
@@ -0,0 +1,23 @@
+from src.benchmark.hnsw_tuning import recommend_ef_search
+from src.db.schema import hnsw_options
+
+
+def point(ef, recall):
+    return {"ef_search": ef, "recall@5": recall}
+
+
+class TestRecommendEfSearch:
+
+    def test_smallest_value_reaching_target(self):
+        curve = [point(100, 1.0), point(10, 0.8), point(40, 0.96)]
+        assert recommend_ef_search(curve, target_recall=0.95, k=5) == 40
+
+    def test_falls_back_to_largest_value(self):
+        curve = [point(10, 0.5), point(40, 0.7)]
+        assert recommend_ef_search(curve, target_recall=0.99, k=5) == 40
+
+
+class TestHnswOptions:
+
+    def test_with_clause(self):
+        assert hnsw_options(24, 128) == "WITH (m = 24, ef_construction = 128)"
@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.embeddings.local_embed import LocalEmbedder, embed_texts
+
+
+def cosine(a, b) -> float:
+    return float(np.dot(a, b))
+
+
+class TestLocalEmbedder:
+
+    def test_returns_configured_dimensions(self):
+        embedder = LocalEmbedder(dimensions=256, workers=1)
+        assert embedder.embed_batch(["test text"]).shape == (1, 256)
+
+    def test_vectors_are_unit_length(self):
+        matrix = embed_texts(["documentation burden", "drug interactions"], 512)
+        assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0, atol=1e-5)
+
+    def test_deterministic(self):
+        first = embed_texts(["same text"], 512)
+        second = embed_texts(["same text"], 512)
+        assert np.array_equal(first, second)
+
+    def test_related_text_scores_higher(self):
+        query, related, unrelated = embed_texts([
+            "reduce physician documentation burden",
+            "ambient documentation for physicians",
+            "cardiac surgery scheduling",
+        ], 1536)
+        assert cosine(query, related) > cosine(query, unrelated)
+
+    def test_empty_text_is_not_zero_vector(self):
+        matrix = embed_texts([""], 128)
+        assert np.linalg.norm(matrix[0]) == pytest.approx(1.0)
+
+    def test_parallel_batch_matches_inline(self):
+        texts = [f"clinical tool number {i}" for i in range(40)]
+        parallel = LocalEmbedder(dimensions=256, workers=2, parallel_threshold=10)
+        try:
+            result = parallel.embed_batch(texts)
+        finally:
+            parallel.close()
+        assert np.allclose(result, embed_texts(texts, 256))
@@ -0,0 +1,178 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from src.retrievers import MemoryRetriever, OrgsRetriever, memory_retriever
+from src.retrievers.filters import matches_filters
+from src.retrievers.memory_retriever import MemoryVectorIndex, top_k
+
+COLUMNS = ["id", "name", "state", "ai_use_cases"]
+
+ROWS = [
+    {"id": 1, "name": "a", "state": "Ohio", "ai_use_cases": ["triage"]},
+    {"id": 2, "name": "b", "state": "Texas", "ai_use_cases": ["risk_prediction"]},
+    {"id": 3, "name": "c", "state": "Ohio", "ai_use_cases": ["risk_prediction", "imaging"]},
+]
+
+MATRIX = np.array([[1, 0, 0], [0.8, 0.6, 0], [0, 0, 1]], dtype=np.float32)
+
+
+def published_index(tmp_path) -> MemoryVectorIndex:
+    index = MemoryVectorIndex("orgs", COLUMNS, dimensions=3, directory=str(tmp_path))
+    index.publish(ROWS, MATRIX, watermark="2026-10-17T00:00:00+00:00")
+    index.checked_at = float("inf")
+    return index
+
+
+def retriever(index: MemoryVectorIndex, **kwargs) -> MemoryRetriever:
+    return MemoryRetriever(
+        embed_fn=None, source=OrgsRetriever, refresh_seconds=float("inf"), index=index, **kwargs
+    )
+
+
+class TestTopK:
+
+    def test_best_first(self):
+        assert top_k(np.array([0.1, 0.9, 0.5, 0.7]), 3).tolist() == [1, 3, 2]
+
+    def test_k_larger_than_scores(self):
+        assert top_k(np.array([0.2, 0.4]), 5).tolist() == [1, 0]
+
+
+class TestMatchesFilters:
+
+    def test_equality_and_overlap(self):
+        filters = {"state": ["Ohio"], "ai_use_cases": ["risk_prediction"]}
+        assert [matches_filters(row, filters, OrgsRetriever.filterable) for row in ROWS] == [
+            False, False, True
+        ]
+
+
+class TestMemoryVectorIndex:
+
+    def test_publish_maps_matrix_read_only(self, tmp_path):
+        index = published_index(tmp_path)
+        assert index.generation == 1
+        assert isinstance(index.snapshot[1], np.memmap)
+
+    def test_other_instance_maps_published_generation(self, tmp_path):
+        writer = published_index(tmp_path)
+        reader = MemoryVectorIndex("orgs", COLUMNS, dimensions=3, directory=str(tmp_path))
+        assert reader.load()
+
+        writer.publish(ROWS[:2], MATRIX[:2], watermark="2026-10-17T00:01:00+00:00")
+
+        assert reader.load()
+        assert reader.generation == 2
+        assert [row["id"] for row in reader.rows] == [1, 2]
+
+    def test_old_generations_are_removed(self, tmp_path):
+        index = published_index(tmp_path)
+        for _ in range(3):
+            index.publish(ROWS, MATRIX, watermark=None)
+        assert sorted(p.name for p in tmp_path.glob("*.npy")) == ["orgs.3.3.npy", "orgs.3.4.npy"]
+
+
+class TestMemoryRetriever:
+
+    def test_exact_cosine_ranking(self, tmp_path):
+        results = retriever(published_index(tmp_path)).search_by_vector([2, 0, 0], limit=2)
+        assert [row["id"] for row in results] == [1, 2]
+        assert results[0]["similarity"] == 1.0
+        assert abs(results[1]["similarity"] - 0.8) < 1e-6
+
+    def test_filters_restrict_candidates(self, tmp_path):
+        results = retriever(published_index(tmp_path)).search_by_vector(
+            [1, 0, 0], limit=5, filters={"state": "Ohio"}
+        )
+        assert [row["id"] for row in results] == [1, 3]
+
+    def test_search_many_embeds_once_and_keeps_query_order(self, tmp_path):
+        calls = []
+
+        def embed_batch(texts):
+            calls.append(texts)
+            return [{"x": [1, 0, 0], "z": [0, 0, 1]}[t] for t in texts]
+
+        results = retriever(published_index(tmp_path), embed_batch_fn=embed_batch).search_many(
+            ["z", "x"], limit=1
+        )
+        assert calls == [["z", "x"]]
+        assert [[row["id"] for row in rows] for rows in results] == [[3], [1]]
+
+    def test_mmr_trades_near_duplicate_for_diverse_row(self, tmp_path):
+        index = published_index(tmp_path)
+        assert [row["id"] for row in retriever(index).search_by_vector([1, 0.2, 0.5], limit=2)] == [1, 2]
+        results = retriever(index, mmr_lambda=0.5).search_by_vector([1, 0.2, 0.5], limit=2)
+        assert [row["id"] for row in results] == [1, 3]
+        assert "candidate_embedding" not in results[0]
+
+
+class FakeTableConnection:
+    """Serves the refresh queries from rows with the same updated_at watermark."""
+
+    def __init__(self, vectors: list[list[float]]):
+        self.vectors = vectors
+
+    def execution_options(self, **options):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if "row_count" in sql:
+            state = SimpleNamespace(row_count=len(ROWS), watermark=WATERMARK)
+            return SimpleNamespace(one=lambda: state)
+        rows = [
+            SimpleNamespace(**row, embedding=str(vector)) for row, vector in zip(ROWS, self.vectors)
+        ]
+        return SimpleNamespace(fetchall=lambda: rows)
+
+
+WATERMARK = datetime(2026, 10, 17, tzinfo=timezone.utc)
+
+
+def test_reembedding_flip_reloads_unchanged_rows(tmp_path, monkeypatch):
+    # A flip swaps every vector without touching updated_at or the row count
+    active = {"spec": ("openai", "text-embedding-3-small", 3)}
+    table = {"conn": FakeTableConnection(MATRIX.tolist())}
+    monkeypatch.setattr(memory_retriever, "engine", SimpleNamespace(connect=lambda: table["conn"]))
+    monkeypatch.setattr(memory_retriever, "read_active_embedding", lambda conn: active["spec"])
+    index = MemoryVectorIndex("orgs", COLUMNS, dimensions=3, directory=str(tmp_path))
+    assert index.refresh()
+    assert not index.refresh()
+
+    active["spec"] = ("local", "hashing", 2)
+    table["conn"] = FakeTableConnection([[1, 0], [0, 1], [1, 1]])
+    assert index.refresh()
+    assert index.embedding == ["local", "hashing", 2]
+    assert index.snapshot[1].shape == (3, 2)
+
+
+def test_flip_reloads_before_the_refresh_interval(tmp_path, monkeypatch):
+    old, new = ("openai", "text-embedding-3-small", 3), ("local", "hashing", 2)
+    table = {"conn": FakeTableConnection(MATRIX.tolist())}
+    monkeypatch.setattr(memory_retriever, "engine", SimpleNamespace(connect=lambda: table["conn"]))
+    monkeypatch.setattr(memory_retriever, "read_active_embedding", lambda conn: new)
+    monkeypatch.setattr(memory_retriever, "active_embedding", lambda: new)
+    index = MemoryVectorIndex("orgs", COLUMNS, dimensions=3, directory=str(tmp_path))
+    index.publish(ROWS, MATRIX, watermark=WATERMARK.isoformat(), embedding=list(old))
+    index.checked_at = float("inf")
+
+    table["conn"] = FakeTableConnection([[1, 0], [0, 1], [1, 1]])
+    results = retriever(index).search_by_vector([0, 1], limit=1)
+    assert index.embedding == list(new)
+    assert results[0]["id"] == 2
+
+
+def test_query_width_must_match_the_index(tmp_path):
+    index = published_index(tmp_path)
+    with pytest.raises(ValueError, match="2 dimensions"):
+        index.search(np.array([1, 0], dtype=np.float32), limit=1)
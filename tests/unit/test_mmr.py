@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from pgvector import Vector
+
+from src.retrievers import OrgsRetriever
+from src.retrievers.mmr import diversify, embedding_array, mmr_select
+
+# Rows 0 and 1 are near-duplicates close to the query; row 2 is less relevant but different
+CANDIDATES = np.array([[1.0, 0.0, 0.0], [0.98, 0.2, 0.0], [0.6, 0.0, 0.8]], dtype=np.float32)
+QUERY = np.array([1.0, 0.1, 0.3], dtype=np.float32)
+
+
+class TestMmrSelect:
+
+    def test_lambda_one_is_relevance_order(self):
+        assert mmr_select(QUERY, CANDIDATES, 3, 1.0) == [0, 1, 2]
+
+    def test_lower_lambda_skips_near_duplicate(self):
+        assert mmr_select(QUERY, CANDIDATES, 2, 0.5) == [0, 2]
+
+    def test_k_larger_than_pool_and_empty_pool(self):
+        assert sorted(mmr_select(QUERY, CANDIDATES, 10, 0.5)) == [0, 1, 2]
+        assert mmr_select(QUERY, np.empty((0, 3), dtype=np.float32), 5, 0.5) == []
+
+
+class TestDiversify:
+
+    def test_keeps_rows_and_drops_candidate_embeddings(self):
+        rows = [
+            {"id": i, "similarity": 0.0, "candidate_embedding": Vector(v.tolist()).to_binary()}
+            for i, v in enumerate(CANDIDATES)
+        ]
+        assert diversify(QUERY.tolist(), rows, 2, 0.5) == [
+            {"id": 0, "similarity": 0.0},
+            {"id": 2, "similarity": 0.0},
+        ]
+
+    def test_hybrid_rows_use_fused_score_as_relevance(self):
+        # Row 2 matches the query text, so fusion ranks it above the near-duplicate pair
+        rows = [
+            {"id": i, "rrf_score": score, "candidate_embedding": Vector(v.tolist()).to_binary()}
+            for i, (v, score) in enumerate(zip(CANDIDATES, [0.02, 0.016, 0.032]))
+        ]
+        assert [row["id"] for row in diversify(QUERY.tolist(), rows, 2, 1.0)] == [2, 0]
+
+    def test_embedding_formats(self):
+        expected = [1.0, 0.5]
+        for value in (Vector(expected).to_binary(), Vector(expected), "[1,0.5]", expected):
+            assert embedding_array(value).tolist() == expected
+
+
+class TestPgVectorMmr:
+
+    def test_fetches_pool_with_binary_embeddings(self):
+        retriever = OrgsRetriever(embed_fn=None, mmr_lambda=0.7, mmr_fetch_k=20)
+        assert "vector_send(embedding) AS candidate_embedding" in retriever.sql
+        assert retriever.fetch_count(5) == 20
+        assert retriever.fetch_count(50) == 50
+        assert "vector_send" not in OrgsRetriever(embed_fn=None).sql
+
+    def test_settings_are_part_of_cache_key(self):
+        plain = OrgsRetriever(embed_fn=None).cache_settings(5)
+        assert plain != OrgsRetriever(embed_fn=None, mmr_lambda=0.7).cache_settings(5)
+
+    def test_rejects_lambda_outside_unit_interval(self):
+        with pytest.raises(ValueError):
+            OrgsRetriever(embed_fn=None, mmr_lambda=1.5)
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+
+from src.retrievers import OrgsRetriever, ToolsRetriever
+from src.retrievers.pgvector_retriever import (
+    build_batched_sql,
+    build_hybrid_sql,
+    build_search_sql,
+    query_vector,
+    set_ef_search,
+    vector_literal,
+)
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+class TestBuildSearchSql:
+
+    def test_full_precision_orders_by_cosine_distance(self):
+        sql = build_search_sql("clinical_tools", ["id", "name"])
+        assert "FROM clinical_tools" in sql
+        assert "ORDER BY embedding <=> CAST(:vec AS vector)" in sql
+        assert ":candidates" not in sql
+
+    def test_halfvec_candidates_are_reranked_exactly(self):
+        sql = build_search_sql("clinical_tools", ["id"], quantization="halfvec", dimensions=512)
+        assert "embedding::halfvec(512) <=> CAST(:vec AS halfvec(512))" in sql
+        assert "LIMIT :candidates" in sql
+        assert sql.rstrip().endswith("LIMIT :limit")
+        assert sql.index(":candidates") < sql.rindex("ORDER BY embedding <=> CAST(:vec AS vector)")
+
+    def test_binary_uses_hamming_over_quantized_bits(self):
+        sql = build_search_sql("clinical_organizations", ["id"], quantization="binary", dimensions=256)
+        assert "binary_quantize(embedding)::bit(256) <~> binary_quantize(" in sql
+
+
+class TestBuildHybridSql:
+
+    def test_fuses_vector_and_text_candidates_with_rrf(self):
+        sql = build_hybrid_sql("clinical_tools", ["id", "name"], rrf_k=60)
+        assert "search_vector @@ q" in sql
+        assert "ORDER BY embedding <=> CAST(:vec AS vector)" in sql
+        assert "1.0 / (60 + rank)" in sql
+        assert "UNION ALL" in sql
+        assert sql.count("LIMIT :candidates") == 2
+
+    def test_quantized_vector_branch(self):
+        sql = build_hybrid_sql("clinical_tools", ["id"], quantization="halfvec", dimensions=512)
+        assert "embedding::halfvec(512)" in sql
+
+
+class TestBuildBatchedSql:
+
+    def test_lateral_search_per_query_vector(self):
+        sql = build_batched_sql(build_search_sql("clinical_tools", ["id", "name"]))
+        assert "unnest(CAST(:vecs AS vector[]), CAST(:queries AS text[]))" in sql
+        assert "CROSS JOIN LATERAL" in sql
+        assert "CAST(q.vec AS vector)" in sql
+        assert ":vec)" not in sql
+
+    def test_hybrid_binds_query_text_per_row(self):
+        sql = build_batched_sql(
+            build_hybrid_sql("clinical_tools", ["id", "name"]), "r.rrf_score DESC, r.similarity DESC"
+        )
+        assert "plainto_tsquery('english', q.query)" in sql
+        assert ":vecs" in sql and ":queries" in sql
+        assert sql.rstrip().endswith("ORDER BY q.query_index, r.rrf_score DESC, r.similarity DESC")
+
+    def test_vector_literal(self):
+        assert vector_literal([1, 0.5, -2]) == "[1.0,0.5,-2.0]"
+
+    def test_query_vector_is_float32(self):
+        vec = query_vector([1, 0.5, -2])
+        assert vec.dtype == np.float32
+        assert vec.tolist() == [1.0, 0.5, -2.0]
+
+
+class TestPgVectorRetriever:
+
+    def test_subclasses_define_table_and_columns(self):
+        tools = ToolsRetriever(embed_fn=fake_embedding)
+        orgs = OrgsRetriever(embed_fn=fake_embedding)
+        assert tools.table == "clinical_tools"
+        assert "problem_solved" in tools.columns
+        assert orgs.table == "clinical_organizations"
+        assert "ai_use_cases" in orgs.columns
+
+    def test_rejects_unknown_quantization(self):
+        with pytest.raises(ValueError):
+            ToolsRetriever(embed_fn=fake_embedding, quantization="int8")
+
+    def test_rejects_unknown_search_mode(self):
+        with pytest.raises(ValueError):
+            OrgsRetriever(embed_fn=fake_embedding, search_mode="keyword")
+
+    def test_candidate_count(self):
+        assert ToolsRetriever(embed_fn=fake_embedding).candidate_count(5) is None
+        hybrid = ToolsRetriever(embed_fn=fake_embedding, search_mode="hybrid", hybrid_candidates=40)
+        assert hybrid.candidate_count(5) == 40
+        assert hybrid.candidate_count(100) == 100
+
+    def test_effective_ef_search_covers_candidate_pass(self):
+        assert ToolsRetriever(embed_fn=fake_embedding).effective_ef_search(5) is None
+        assert ToolsRetriever(embed_fn=fake_embedding, ef_search=200).effective_ef_search(5) == 200
+        hybrid = ToolsRetriever(embed_fn=fake_embedding, search_mode="hybrid", hybrid_candidates=80)
+        assert hybrid.effective_ef_search(5) == 80
+        assert hybrid.effective_ef_search(5, ef_search=400) == 400
+
+
+class RecordingConnection:
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+
+
+class TestSetEfSearch:
+
+    def test_sets_even_pgvectors_default(self):
+        # A server or role may configure another hnsw.ef_search
+        conn = RecordingConnection()
+        set_ef_search(conn, 40)
+        assert conn.executed == [("SELECT set_config('hnsw.ef_search', :ef, true)", {"ef": "40"})]
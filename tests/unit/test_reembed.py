@@ -0,0 +1,188 @@
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy.exc import DataError, OperationalError
+
+from src.db.schema import vector_index_sql
+from src.embeddings import get_embeddings_batch, spec
+from src.embeddings.context import embedding_scope
+from src.retrievers import CombinedRetriever, OrgsRetriever, ToolsRetriever
+from src.retrievers import pgvector_retriever
+from src.seed.reembed import SHADOW_COLUMN, shadow_index, throttle_delay
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+class TestThrottleDelay:
+
+    def test_sleeps_off_the_rest_of_the_batch_budget(self):
+        assert throttle_delay(500, 2.0, 100) == pytest.approx(3.0)
+
+    def test_no_sleep_when_slower_than_the_cap(self):
+        assert throttle_delay(500, 8.0, 100) == 0.0
+
+    def test_unthrottled(self):
+        assert throttle_delay(500, 0.1, 0) == 0.0
+
+
+class TestShadowIndex:
+
+    def test_name(self):
+        assert shadow_index("clinical_tools") == "idx_tool_embedding_next"
+
+    def test_sql_indexes_the_shadow_column(self):
+        sql = vector_index_sql(
+            "clinical_tools", shadow_index("clinical_tools"), "hnsw", concurrently=True, column=SHADOW_COLUMN
+        )
+        assert sql.startswith("CREATE INDEX CONCURRENTLY idx_tool_embedding_next ON clinical_tools")
+        assert "hnsw (embedding_next vector_cosine_ops)" in sql
+
+
+class FakeEngine:
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.connects = 0
+
+    @contextmanager
+    def connect(self):
+        self.connects += 1
+        if self.fail:
+            raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+        yield None
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Point active_embedding at a settable stored spec and a fake engine."""
+    stored = {"spec": spec.CONFIGURED_EMBEDDING}
+    engine = FakeEngine()
+    monkeypatch.setattr(spec, "engine", engine)
+    monkeypatch.setattr(spec, "read_active_embedding", lambda conn: stored["spec"])
+    spec.invalidate_active_embedding()
+    yield stored, engine
+    spec.invalidate_active_embedding()
+
+
+class TestActiveEmbedding:
+
+    def test_cached_within_max_age(self, registry):
+        stored, engine = registry
+        assert spec.active_embedding(max_age=60) == spec.CONFIGURED_EMBEDDING
+        stored["spec"] = ("local", "hashing", 64)
+        assert spec.active_embedding(max_age=60) == spec.CONFIGURED_EMBEDDING
+        assert engine.connects == 1
+
+    def test_flip_seen_after_invalidation(self, registry):
+        stored, _ = registry
+        spec.active_embedding(max_age=60)
+        stored["spec"] = ("local", "hashing", 64)
+        spec.invalidate_active_embedding()
+        assert spec.active_embedding(max_age=60) == ("local", "hashing", 64)
+
+    def test_keeps_last_spec_when_registry_unreadable(self, registry):
+        stored, engine = registry
+        stored["spec"] = ("local", "hashing", 64)
+        spec.active_embedding(max_age=0)
+        engine.fail = True
+        assert spec.active_embedding(max_age=0) == ("local", "hashing", 64)
+
+
+class TestEmbeddingSpecDispatch:
+
+    def test_batch_in_requested_spec(self):
+        embeddings = get_embeddings_batch(["triage chatbot", "sepsis alerts"], spec=("local", "hashing", 64))
+        assert [len(e) for e in embeddings] == [64, 64]
+
+
+def dimension_error(message: str = "different vector dimensions 384 and 1536") -> DataError:
+    return DataError("SELECT ...", {}, Exception(message))
+
+
+class TestStaleQueryEmbedding:
+
+    @pytest.fixture
+    def retriever(self, monkeypatch):
+        invalidations = []
+        monkeypatch.setattr(pgvector_retriever, "invalidate_active_embedding", lambda: invalidations.append(1))
+        embedded = []
+        retriever = ToolsRetriever(embed_fn=lambda text: embedded.append(text) or fake_embedding(text))
+        retriever.result_cache = None
+        return retriever, embedded, invalidations
+
+    def test_reembeds_and_retries_once_after_a_flip(self, retriever, monkeypatch):
+        retriever, embedded, invalidations = retriever
+        errors = [dimension_error()]
+
+        def search_by_vector(embedding, **kwargs):
+            if errors:
+                raise errors.pop()
+            return [{"name": "Scribe"}]
+
+        monkeypatch.setattr(retriever, "search_by_vector", search_by_vector)
+        with embedding_scope():
+            assert retriever.search("ambient scribe") == [{"name": "Scribe"}]
+        assert embedded == ["ambient scribe", "ambient scribe"]
+        assert invalidations == [1]
+
+    def test_matches_a_cast_to_the_old_width(self):
+        assert pgvector_retriever.stale_query_embedding(dimension_error("expected 1536 dimensions, not 384"))
+
+    def test_other_data_errors_propagate(self, retriever, monkeypatch):
+        retriever, embedded, invalidations = retriever
+
+        def search_by_vector(embedding, **kwargs):
+            raise dimension_error("invalid input syntax")
+
+        monkeypatch.setattr(retriever, "search_by_vector", search_by_vector)
+        with pytest.raises(DataError):
+            retriever.search("ambient scribe")
+        assert invalidations == []
+
+
+def test_quantized_statements_follow_the_active_dimensions(monkeypatch):
+    active = {"spec": ("openai", "text-embedding-3-small", 1536)}
+    monkeypatch.setattr(pgvector_retriever, "active_embedding", lambda: active["spec"])
+    retriever = ToolsRetriever(embed_fn=fake_embedding, quantization="halfvec")
+    assert "halfvec(1536)" in str(retriever._statement())
+    active["spec"] = ("local", "hashing", 384)
+    assert "halfvec(384)" in str(retriever._statement())
+    assert "halfvec(1536)" not in str(retriever._statement())
+
+
+class TestCombinedRetrieverFlip:
+
+    @pytest.fixture
+    def combined(self, monkeypatch):
+        active = {"spec": ("openai", "text-embedding-3-small", 1536)}
+        monkeypatch.setattr(pgvector_retriever, "active_embedding", lambda: active["spec"])
+        monkeypatch.setattr(pgvector_retriever, "invalidate_active_embedding", lambda: None)
+        embedded = []
+        combined = CombinedRetriever(
+            embed_fn=lambda text: embedded.append(text) or fake_embedding(text),
+            retrievers={
+                "tools": ToolsRetriever(embed_fn=fake_embedding, quantization="halfvec"),
+                "orgs": OrgsRetriever(embed_fn=fake_embedding, quantization="halfvec"),
+            }
+        )
+        return combined, active, embedded
+
+    def test_statement_follows_the_active_dimensions(self, combined):
+        combined, active, _ = combined
+        assert "halfvec(1536)" in str(combined._statement())
+        active["spec"] = ("local", "hashing", 384)
+        assert "halfvec(384)" in str(combined._statement())
+        assert "halfvec(1536)" not in str(combined._statement())
+
+    def test_reembeds_and_retries_once_after_a_flip(self, combined, monkeypatch):
+        combined, _, embedded = combined
+        errors = [dimension_error()]
+
+        def search_by_vector(embedding, **kwargs):
+            if errors:
+                raise errors.pop()
+            return {"tools": [{"name": "Scribe"}], "orgs": []}
+
+        monkeypatch.setattr(combined, "search_by_vector", search_by_vector)
+        with embedding_scope():
+            assert combined.search("ambient scribe")["tools"] == [{"name": "Scribe"}]
+        assert embedded == ["ambient scribe", "ambient scribe"]
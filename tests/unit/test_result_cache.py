@@ -0,0 +1,86 @@
+from src.retrievers import ToolsRetriever
+from src.retrievers.result_cache import ResultCache, ResultCacheStats
+
+SETTINGS = {"search_mode": "vector", "ef_search": None}
+
+
+class FakeResultCache(ResultCache):
+    """ResultCache with the Postgres round trips replaced by a dict."""
+
+    def __init__(self, version=3):
+        super().__init__()
+        self.version = version
+        self.entries = {}
+
+    def lookup(self, table, key):
+        return self.version, self.entries.get((key, self.version))
+
+    def store(self, table, key, version, results):
+        self.entries[(key, version)] = results
+
+
+class StubToolsRetriever(ToolsRetriever):
+    """Counts embeddings and searches instead of querying Postgres."""
+
+    def __init__(self, **kwargs):
+        self.embedded, self.searches = [], 0
+        super().__init__(embed_fn=self._embed, **kwargs)
+
+    def _embed(self, text):
+        self.embedded.append(text)
+        return [1.0, 0.0]
+
+    def search_by_vector(self, embedding, limit=5, query=None, filters=None, ef_search=None):
+        self.searches += 1
+        return [{"id": self.searches, "similarity": 1.0}]
+
+
+class TestResultCacheKey:
+
+    def test_whitespace_insensitive(self):
+        cache = ResultCache()
+        assert cache.key("t", SETTINGS, "drug  interactions ", 5, {}) == cache.key(
+            "t", SETTINGS, "drug interactions", 5, {}
+        )
+
+    def test_limit_filters_and_settings_change_the_key(self):
+        cache = ResultCache()
+        base = cache.key("t", SETTINGS, "q", 5, {})
+        assert base != cache.key("t", SETTINGS, "q", 10, {})
+        assert base != cache.key("t", SETTINGS, "q", 5, {"category": ["Documentation"]})
+        assert base != cache.key("t", {**SETTINGS, "ef_search": 200}, "q", 5, {})
+        assert base != cache.key("other", SETTINGS, "q", 5, {})
+
+
+class TestResultCacheStats:
+
+    def test_hit_rate(self):
+        assert ResultCacheStats(hits=3, misses=1).to_dict()["hit_rate"] == 0.75
+        assert ResultCacheStats().hit_rate == 0.0
+
+
+class TestCachedSearch:
+
+    def test_repeat_search_skips_embedding_and_sql(self):
+        retriever = StubToolsRetriever(result_cache=FakeResultCache())
+        first = retriever.search("drug interactions", limit=3)
+        second = retriever.search("drug interactions", limit=3)
+        assert first == second
+        assert retriever.embedded == ["drug interactions"]
+        assert retriever.searches == 1
+
+    def test_new_corpus_version_misses(self):
+        cache = FakeResultCache(version=1)
+        retriever = StubToolsRetriever(result_cache=cache)
+        retriever.search("drug interactions")
+        cache.version = 2
+        retriever.search("drug interactions")
+        assert retriever.searches == 2
+
+    def test_unavailable_cache_falls_through_without_storing(self):
+        cache = FakeResultCache(version=None)
+        retriever = StubToolsRetriever(result_cache=cache)
+        retriever.search("drug interactions")
+        retriever.search("drug interactions")
+        assert retriever.searches == 2
+        assert cache.entries == {}
@@ -0,0 +1,57 @@
+import pytest
+
+from src.retrievers import OrgsRetriever
+from src.retrievers.filters import build_filter_clause, normalize_filters
+from src.retrievers.pgvector_retriever import build_prefiltered_sql, build_search_sql
+from tests.mocks.mock_embeddings import fake_embedding
+
+ORG_FILTERS = OrgsRetriever.filterable
+
+
+class TestNormalizeFilters:
+
+    def test_wraps_scalars_and_drops_empty_values(self):
+        filters = normalize_filters(
+            {"state": "Ohio", "org_type": None, "specialty": "", "ai_use_cases": ["triage"]},
+            ORG_FILTERS
+        )
+        assert filters == {"state": ["Ohio"], "ai_use_cases": ["triage"]}
+
+    def test_rejects_unknown_fields(self):
+        with pytest.raises(ValueError):
+            normalize_filters({"city": "Boston"}, ORG_FILTERS)
+
+
+class TestBuildFilterClause:
+
+    def test_equality_and_array_overlap(self):
+        where, params = build_filter_clause(
+            {"state": ["Ohio", "Texas"], "ai_use_cases": ["triage"]}, ORG_FILTERS
+        )
+        assert where == (
+            "ai_use_cases && CAST(:filter_ai_use_cases AS text[]) "
+            "AND state = ANY(CAST(:filter_state AS text[]))"
+        )
+        assert params == {"filter_ai_use_cases": ["triage"], "filter_state": ["Ohio", "Texas"]}
+
+
+class TestFilteredSql:
+
+    def test_iterative_path_filters_inside_index_scan(self):
+        sql = build_search_sql("clinical_organizations", ["id"], where="state = 'Ohio'")
+        assert "WHERE state = 'Ohio'" in sql
+        assert sql.rstrip().endswith("LIMIT :limit")
+
+    def test_exact_path_materializes_filtered_rows(self):
+        sql = build_prefiltered_sql("clinical_organizations", ["id"], "state = 'Ohio'")
+        assert "AS MATERIALIZED" in sql
+        assert "WHERE state = 'Ohio'" in sql
+
+    def test_retriever_builds_statement_per_strategy(self):
+        retriever = OrgsRetriever(embed_fn=fake_embedding)
+        assert "MATERIALIZED" in retriever.build_sql("state = 'Ohio'", "exact")
+        assert "MATERIALIZED" not in retriever.build_sql("state = 'Ohio'", "iterative")
+
+    def test_rejects_unknown_filter_strategy(self):
+        with pytest.raises(ValueError):
+            OrgsRetriever(embed_fn=fake_embedding, filter_strategy="post")
@@ -1,5 +1,6 @@
 import pytest
 
+from src.retrievers.base import BaseRetriever
 from tests.mocks.mock_embeddings import fake_embedding
 from tests.mocks.mock_db import MockToolsRetriever, MockOrgsRetriever, MOCK_TOOLS, MOCK_ORGS
 
@@ -74,3 +75,29 @@ class TestMockOrgsRetriever:
         assert "specialty" in result
         assert "ai_use_cases" in result
         assert "similarity" in result
+
+
+class EchoRetriever(BaseRetriever):
+    """Returns the first embedding component so results can be traced to queries."""
+    
+    def search_by_vector(self, embedding: list[float], limit: int = 5) -> list[dict]:
+        return [{"first": embedding[0]}][:limit]
+
+
+class TestBaseRetrieverSearchMany:
+    
+    def test_falls_back_to_per_query_embedding(self):
+        retriever = EchoRetriever(embed_fn=fake_embedding)
+        results = retriever.search_many(["a", "b"])
+        assert results == [[{"first": fake_embedding("a")[0]}], [{"first": fake_embedding("b")[0]}]]
+    
+    def test_uses_batch_embedding_when_set(self):
+        calls = []
+        
+        def embed_batch(texts):
+            calls.append(texts)
+            return [[float(len(t))] for t in texts]
+        
+        retriever = EchoRetriever(embed_fn=fake_embedding, embed_batch_fn=embed_batch)
+        assert retriever.search_many(["a", "bbb"]) == [[{"first": 1.0}], [{"first": 3.0}]]
+        assert calls == [["a", "bbb"]]
@@ -0,0 +1,89 @@
+import numpy as np
+
+from src.benchmark import scale
+from src.benchmark.metrics import exact_top_k
+from src.benchmark.scale import TopK, bench_retriever, load_corpus
+from src.benchmark.synthetic import CORPORA, synthetic_queries, synthetic_rows
+from src.embeddings.local_embed import LocalEmbedder
+from src.retrievers import ToolsRetriever
+
+
+class TestTopK:
+
+    def test_chunked_updates_match_exact_search(self):
+        rng = np.random.default_rng(0)
+        corpus, queries = rng.normal(size=(230, 8)), rng.normal(size=(6, 8))
+        truth = TopK(queries, k=5)
+        for start in range(0, len(corpus), 50):
+            truth.update(list(range(start, min(start + 50, len(corpus)))), corpus[start:start + 50])
+        assert truth.result() == exact_top_k(corpus, queries, 5).tolist()
+
+    def test_fewer_rows_than_k(self):
+        truth = TopK(np.array([[1.0, 0.0]]), k=5)
+        truth.update([7, 8], np.array([[0.0, 1.0], [1.0, 0.0]]))
+        assert truth.result() == [[8, 7]]
+
+
+class TestSyntheticCorpus:
+
+    def test_rows_are_deterministic_and_independent_of_chunking(self):
+        whole = [row for chunk in synthetic_rows("clinical_tools", 30, chunk_size=30) for row in chunk]
+        chunked = [row for chunk in synthetic_rows("clinical_tools", 30, chunk_size=7) for row in chunk]
+        assert whole == chunked
+        assert [row["id"] for row in whole] == list(range(1, 31))
+
+    def test_seed_changes_rows(self):
+        first = next(synthetic_rows("clinical_organizations", 5, seed=0))
+        assert first != next(synthetic_rows("clinical_organizations", 5, seed=1))
+
+    def test_rows_have_loaded_columns_and_embedding_text(self):
+        for table, (_, embedding_text, columns) in CORPORA.items():
+            row = next(synthetic_rows(table, 1))[0]
+            assert set(columns) <= set(row)
+            assert embedding_text(row)
+
+    def test_queries_are_deterministic(self):
+        assert synthetic_queries(10) == synthetic_queries(10)
+        assert len(set(synthetic_queries(50))) > 1
+
+
+def test_bench_retriever_targets_bench_table():
+    retriever = bench_retriever(ToolsRetriever, ef_search=80)
+    assert retriever.table == "bench_clinical_tools"
+    assert "FROM bench_clinical_tools" in retriever.sql
+    assert ToolsRetriever.table == "clinical_tools"
+
+
+class FakeRawConnection:
+
+    def __init__(self):
+        self.driver_connection = self
+
+    def cursor(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, statement):
+        pass
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_load_corpus_passes_json_columns_through(monkeypatch):
+    # COPY dumps json columns itself; pre-encoding them stores a JSON string instead of an object
+    copied = []
+    monkeypatch.setattr(scale.engine, "raw_connection", FakeRawConnection)
+    monkeypatch.setattr(scale, "copy_rows", lambda cursor, table, columns, rows: copied.extend(rows))
+    embedder = LocalEmbedder(dimensions=16)
+    load_corpus("clinical_organizations", 3, embedder, TopK(np.ones((1, 16)), k=2), chunk_size=2)
+    assert len(copied) == 3
+    assert all(isinstance(row["services"], dict) for row in copied)
@@ -0,0 +1,40 @@
+import pytest
+
+from src.seed.clinical_data import CLINICAL_TOOLS
+from src.seed.run_seed import create_embedding_text_tool
+from src.seed.sync import content_hash, record_hash, sync_table, upsert_sql
+
+FIELDS = ["name", "category", "description", "target_users", "problem_solved"]
+
+
+class TestHashes:
+
+    def test_content_hash_follows_embedding_text(self):
+        tool = dict(CLINICAL_TOOLS[0])
+        before = content_hash(create_embedding_text_tool(tool))
+        tool["target_users"] = ["pharmacists"]
+        assert content_hash(create_embedding_text_tool(tool)) == before
+        tool["description"] += " Updated."
+        assert content_hash(create_embedding_text_tool(tool)) != before
+
+    def test_record_hash_covers_every_field(self):
+        tool = dict(CLINICAL_TOOLS[0])
+        before = record_hash(tool, FIELDS)
+        assert record_hash({**tool, "unsynced": 1}, FIELDS) == before
+        assert record_hash({**tool, "target_users": ["pharmacists"]}, FIELDS) != before
+
+    def test_record_hash_ignores_key_order(self):
+        tool = CLINICAL_TOOLS[0]
+        assert record_hash(dict(reversed(list(tool.items()))), FIELDS) == record_hash(tool, FIELDS)
+
+
+def test_upsert_keeps_embedding_and_created_at():
+    sql = upsert_sql("clinical_tools", "clinical_tools_staging", FIELDS + ["embedding", "created_at"])
+    assert "ON CONFLICT (source_key) DO UPDATE" in sql
+    assert "embedding = COALESCE(EXCLUDED.embedding, clinical_tools.embedding)" in sql
+    assert "created_at = EXCLUDED" not in sql
+
+
+def test_duplicate_source_keys_rejected_before_writing():
+    with pytest.raises(ValueError, match="Duplicate source key"):
+        sync_table("clinical_tools", [CLINICAL_TOOLS[0], CLINICAL_TOOLS[0]], create_embedding_text_tool)
@@ -0,0 +1,185 @@
+import asyncio
+
+from starlette.concurrency import iterate_in_threadpool
+
+from src.agents.semantic_cache import SemanticCache, SemanticCacheStats, SemanticCachedGraph
+from src.api.schemas import QueryResponse
+from src.config import FILTER_FALLBACK_EF_SEARCH
+from src.embeddings.context import scoped_embedding
+
+ANSWER = {
+    "route": "tool_finder",
+    "response": "Try a sepsis early-warning tool.",
+    "tools_results": [{"id": 1}],
+    "orgs_results": [],
+    "confidence": {"overall": 0.8},
+}
+
+
+class FakeSemanticCache(SemanticCache):
+    """SemanticCache with Postgres replaced by a list searched by exact embedding."""
+
+    def __init__(self, version=3):
+        super().__init__()
+        self.version = version
+        self.entries = []
+
+    def lookup(self, namespace, embedding):
+        for entry_namespace, entry_embedding, version, answer in self.entries:
+            if (entry_namespace, entry_embedding, version) == (namespace, embedding, self.version):
+                return self.version, answer
+        return self.version, None
+
+    def store(self, namespace, query, embedding, version, answer, ttl_seconds=None):
+        self.entries.append((namespace, embedding, version, {k: answer[k] for k in ANSWER}))
+
+
+class RecordingConnection:
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        self.executed.append((str(statement), params))
+
+
+class StubGraph:
+    """Compiled-graph stand-in that counts runs."""
+
+    def __init__(self, result=None):
+        self.result = ANSWER if result is None else result
+        self.runs = 0
+
+    def invoke(self, state, config=None):
+        self.runs += 1
+        return {**state, **self.result}
+
+    def stream(self, state, config=None):
+        self.runs += 1
+        route, confidence = self.result["route"], self.result["confidence"]
+        yield {"supervisor": {"route": route, "confidence": confidence}}
+        yield {route: {k: v for k, v in self.result.items() if k not in ("route", "confidence")}}
+
+
+class ScopedStubGraph(StubGraph):
+    """StubGraph whose first node embeds the query through the request's embedding scope."""
+
+    def __init__(self, embed_fn):
+        super().__init__()
+        self.embed_fn = embed_fn
+
+    def stream(self, state, config=None):
+        for event in super().stream(state, config):
+            scoped_embedding(self.embed_fn, state["query"])
+            yield event
+
+
+def embed(text):
+    # Paraphrases of the sepsis question land on the same vector
+    return [1.0, 0.0] if "sepsis" in text else [0.0, 1.0]
+
+
+def cached_graph(cache=None, graph=None, namespace="ns"):
+    return SemanticCachedGraph(graph or StubGraph(), cache or FakeSemanticCache(), namespace, embed_fn=embed)
+
+
+class TestSemanticCachedGraph:
+
+    def test_paraphrase_is_answered_from_cache(self):
+        graph = StubGraph()
+        cached = cached_graph(graph=graph)
+        first = cached.invoke({"query": "AI tools for sepsis"})
+        second = cached.invoke({"query": "which tools detect sepsis early?"})
+        assert (first["cache_hit"], second["cache_hit"]) == (False, True)
+        assert second["response"] == ANSWER["response"]
+        assert second["query"] == "which tools detect sepsis early?"
+        assert graph.runs == 1
+
+    def test_new_corpus_version_misses(self):
+        cache, graph = FakeSemanticCache(version=1), StubGraph()
+        cached = cached_graph(cache, graph)
+        cached.invoke({"query": "sepsis"})
+        cache.version = 2
+        assert cached.invoke({"query": "sepsis"})["cache_hit"] is False
+        assert graph.runs == 2
+
+    def test_namespaces_are_isolated(self):
+        cache = FakeSemanticCache()
+        cached_graph(cache, namespace="fast").invoke({"query": "sepsis"})
+        assert cached_graph(cache, namespace="accurate").invoke({"query": "sepsis"})["cache_hit"] is False
+
+    def test_errors_and_empty_answers_are_not_cached(self):
+        cache = FakeSemanticCache()
+        cached_graph(cache, StubGraph({**ANSWER, "response": ""})).invoke({"query": "sepsis"})
+        cached_graph(cache, StubGraph({**ANSWER, "error": "LLM timeout"})).invoke({"query": "sepsis"})
+        assert cache.entries == []
+
+    def test_unavailable_cache_falls_through_without_storing(self):
+        cache = FakeSemanticCache(version=None)
+        result = cached_graph(cache).invoke({"query": "sepsis"})
+        assert result["cache_hit"] is False
+        assert cache.entries == []
+
+    def test_stream_caches_merged_updates_and_replays_them(self):
+        cache, graph = FakeSemanticCache(), StubGraph()
+        cached = cached_graph(cache, graph)
+        assert [list(e) for e in cached.stream({"query": "sepsis"})] == [["supervisor"], ["tool_finder"]]
+        events = list(cached.stream({"query": "sepsis"}))
+        assert events == [{"semantic_cache": {**ANSWER, "cache_hit": True}}]
+        assert graph.runs == 1
+
+    def test_stream_through_a_threadpool_caches_the_answer(self):
+        # Servers resume each step of a sync generator in a fresh copy of the context
+        calls = []
+
+        def counting_embed(text):
+            calls.append(text)
+            return embed(text)
+
+        cache = FakeSemanticCache()
+        cached = SemanticCachedGraph(ScopedStubGraph(counting_embed), cache, "ns", embed_fn=counting_embed)
+
+        async def drain():
+            return [event async for event in iterate_in_threadpool(cached.stream({"query": "sepsis"}))]
+
+        assert [list(e) for e in asyncio.run(drain())] == [["supervisor"], ["tool_finder"]]
+        assert calls == ["sepsis"]
+        assert len(cache.entries) == 1
+
+    def test_hits_and_misses_are_timed(self):
+        cache = FakeSemanticCache()
+        cached = cached_graph(cache)
+        cached.invoke({"query": "sepsis"})
+        cached.invoke({"query": "sepsis"})
+        stats = cache.stats.to_dict()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+        assert stats["avg_hit_ms"] is not None and stats["avg_miss_ms"] is not None
+
+
+class TestSemanticCache:
+
+    def test_namespace_depends_on_settings(self):
+        assert SemanticCache.namespace({"profile": "fast"}) == SemanticCache.namespace({"profile": "fast"})
+        assert SemanticCache.namespace({"profile": "fast"}) != SemanticCache.namespace({"profile": "accurate"})
+
+    def test_empty_stats(self):
+        assert SemanticCacheStats().to_dict()["avg_hit_ms"] is None
+
+    def test_filtered_lookup_scans_iteratively(self, monkeypatch):
+        monkeypatch.setattr(SemanticCache, "_pgvector_version", (0, 8, 0))
+        conn = RecordingConnection()
+        SemanticCache()._widen_scan(conn)
+        assert conn.executed == [("SELECT set_config('hnsw.iterative_scan', 'strict_order', true)", None)]
+
+    def test_filtered_lookup_widens_ef_search_on_old_pgvector(self, monkeypatch):
+        monkeypatch.setattr(SemanticCache, "_pgvector_version", (0, 6, 2))
+        conn = RecordingConnection()
+        SemanticCache()._widen_scan(conn)
+        assert conn.executed == [
+            ("SELECT set_config('hnsw.ef_search', :ef, true)", {"ef": str(FILTER_FALLBACK_EF_SEARCH)})
+        ]
+
+
+def test_query_response_defaults_to_miss():
+    response = QueryResponse(**{k: v for k, v in ANSWER.items() if k != "confidence"}, confidence={})
+    assert response.cache_hit is False
@@ -0,0 +1,200 @@
+import json
+import threading
+from contextlib import nullcontext
+
+import pytest
+
+from src.seed import stream, sync
+from src.seed.clinical_data import CLINICAL_TOOLS
+from src.seed.stream import ToolRecord, OrganizationRecord, detect_format, read_batches, read_csv, read_jsonl
+from src.seed.run_seed import create_embedding_text_tool
+from src.seed.sync import changed_rows, ingest_key
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    path = tmp_path / "tools.jsonl"
+    lines = [json.dumps(tool) for tool in CLINICAL_TOOLS[:3]]
+    path.write_text(lines[0] + "\n\n{broken\n" + "\n".join(lines[1:]) + "\n")
+    return path
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "tools.csv"
+    path.write_text(
+        "name,category,description,target_users,problem_solved\n"
+        'Tool A,Documentation,"Spans\ntwo lines",physicians; nurses,Burnout\n'
+        "Tool B,Triage,Short,,\n"
+    )
+    return path
+
+
+class TestReaders:
+
+    def test_jsonl_offsets_resume_after_record(self, jsonl_path):
+        records = list(read_jsonl(str(jsonl_path)))
+        assert [r["name"] if r else None for _, r in records] == [
+            CLINICAL_TOOLS[0]["name"], None, CLINICAL_TOOLS[1]["name"], CLINICAL_TOOLS[2]["name"]
+        ]
+        offset = records[1][0]
+        resumed = list(read_jsonl(str(jsonl_path), offset))
+        assert resumed == records[2:]
+        assert records[-1][0] == jsonl_path.stat().st_size
+
+    def test_csv_multiline_field_and_resume_rereads_header(self, csv_path):
+        records = list(read_csv(str(csv_path)))
+        assert records[0][1]["description"] == "Spans\ntwo lines"
+        resumed = list(read_csv(str(csv_path), records[0][0]))
+        assert resumed == records[1:]
+        assert resumed[0][1]["name"] == "Tool B"
+
+    def test_detect_format(self):
+        assert detect_format("export.ndjson") == "jsonl"
+        assert detect_format("EXPORT.CSV") == "csv"
+        with pytest.raises(ValueError):
+            detect_format("export.xml")
+
+
+class TestValidation:
+
+    def test_csv_cells_parse_lists_and_blanks(self, csv_path):
+        (_, first), (_, second) = read_csv(str(csv_path))
+        assert ToolRecord.model_validate(first).target_users == ["physicians", "nurses"]
+        tool = ToolRecord.model_validate(second)
+        assert tool.target_users is None and tool.problem_solved is None
+
+    def test_organization_services_from_json_cell(self):
+        org = OrganizationRecord.model_validate({
+            "name": "Clinic", "org_type": "clinic", "description": "Primary care",
+            "services": '{"telehealth": true}', "ai_use_cases": '["triage"]', "city": " ",
+        })
+        assert org.services == {"telehealth": True}
+        assert org.ai_use_cases == ["triage"]
+        assert org.city is None
+
+    def test_batches_skip_invalid_and_carry_offsets(self, jsonl_path):
+        batches = list(read_batches(read_jsonl(str(jsonl_path)), ToolRecord, batch_size=2))
+        assert [(len(batch), invalid) for _, batch, invalid in batches] == [(1, 1), (2, 0)]
+        assert batches[-1][0] == jsonl_path.stat().st_size
+
+    def test_missing_required_field_is_invalid(self):
+        records = [(10, {"name": "No category", "description": "x"})]
+        (_, batch, invalid), = read_batches(records, ToolRecord, batch_size=10)
+        assert batch == [] and invalid == 1
+
+
+def test_changed_rows_split_by_hashes():
+    rows = [
+        {"source_key": "new", "content_hash": "a", "record_hash": "1"},
+        {"source_key": "text", "content_hash": "b", "record_hash": "2"},
+        {"source_key": "meta", "content_hash": "c", "record_hash": "3"},
+        {"source_key": "same", "content_hash": "d", "record_hash": "4"},
+    ]
+    stored = {"text": ("x", "2"), "meta": ("c", "x"), "same": ("d", "4")}
+    to_embed, metadata_only = changed_rows(rows, stored)
+    assert [row["source_key"] for row in to_embed] == ["new", "text"]
+    assert metadata_only == [{**rows[2], "embedding": None}]
+    to_embed, metadata_only = changed_rows(rows, stored, reembed=True)
+    assert len(to_embed) == 4 and metadata_only == []
+
+
+class FakeTable:
+    """Committed (content_hash, record_hash) per source key, written through fake raw connections."""
+
+    def __init__(self):
+        self.rows = {}
+        self.reads = 0
+        self.second_read = threading.Event()
+
+    def raw_connection(self):
+        return FakeRawConnection(self)
+
+
+class FakeRawConnection:
+
+    def __init__(self, table):
+        self.table = table
+        self.driver_connection = self
+        self.staged = {}
+
+    def cursor(self):
+        return nullcontext(self)
+
+    def commit(self):
+        self.table.rows.update(self.staged)
+        self.staged = {}
+
+    def rollback(self):
+        self.staged = {}
+
+    def execute(self, sql, params):
+        assert sql.startswith("DELETE")
+        vanished = params[0]
+        self.rowcount = sum(1 for key in self.table.rows if key in vanished)
+        self.table.rows = {key: row for key, row in self.table.rows.items() if key not in vanished}
+
+    def close(self):
+        pass
+
+
+def test_key_repeated_across_in_flight_batches_is_embedded_once(tmp_path, monkeypatch):
+    path = tmp_path / "tools.jsonl"
+    path.write_text(json.dumps(CLINICAL_TOOLS[0]) + "\n" + json.dumps(CLINICAL_TOOLS[0]) + "\n")
+    table = FakeTable()
+    embedded = []
+
+    def stored_hashes(cursor, name, keys):
+        table.reads += 1
+        if table.reads == 2:
+            table.second_read.set()
+        return {key: table.rows[key] for key in keys if key in table.rows}, 0
+
+    def get_embeddings_batch(texts):
+        # Hold the first batch until the second has read the table, so neither is committed yet
+        table.second_read.wait(timeout=5)
+        embedded.extend(texts)
+        return [fake_embedding(text) for text in texts]
+
+    def upsert_rows(cursor, name, rows):
+        cursor.staged.update({row["source_key"]: (row["content_hash"], row["record_hash"]) for row in rows})
+
+    monkeypatch.setattr(stream, "engine", table)
+    monkeypatch.setattr(stream, "stored_hashes", stored_hashes)
+    monkeypatch.setattr(stream, "get_embeddings_batch", get_embeddings_batch)
+    monkeypatch.setattr(stream, "upsert_rows", upsert_rows)
+    monkeypatch.setattr(stream, "save_checkpoint", lambda *args: None)
+    report = stream.ingest_file("clinical_tools", str(path), batch_size=1, concurrency=2, restart=True)
+    assert len(embedded) == 1
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (1, 0, 1)
+    assert list(table.rows) == [ingest_key("tools.jsonl", CLINICAL_TOOLS[0]["name"])]
+
+
+def test_seed_sync_keeps_ingested_rows(tmp_path, monkeypatch):
+    path = tmp_path / "export.jsonl"
+    path.write_text(json.dumps(CLINICAL_TOOLS[0]) + "\n")
+    table = FakeTable()
+
+    def stored_hashes(cursor, name, keys=None):
+        stored = {key: row for key, row in table.rows.items() if keys is None or key in keys}
+        return stored, 0
+
+    def upsert_rows(cursor, name, rows):
+        cursor.staged.update({row["source_key"]: (row["content_hash"], row["record_hash"]) for row in rows})
+
+    for module in (stream, sync):
+        monkeypatch.setattr(module, "engine", table)
+        monkeypatch.setattr(module, "stored_hashes", stored_hashes)
+        monkeypatch.setattr(module, "upsert_rows", upsert_rows)
+    monkeypatch.setattr(stream, "get_embeddings_batch", lambda texts: [fake_embedding(t) for t in texts])
+    monkeypatch.setattr(stream, "save_checkpoint", lambda *args: None)
+    monkeypatch.setattr(sync, "embed_rows", lambda rows, text, batch_size: rows)
+    stream.ingest_file("clinical_tools", str(path), restart=True)
+    ingested = ingest_key("export.jsonl", CLINICAL_TOOLS[0]["name"])
+    assert list(table.rows) == [ingested]
+
+    # The seed catalog doesn't list the ingested tool, yet its sync must not delete it
+    report = sync.sync_table("clinical_tools", [CLINICAL_TOOLS[1]], create_embedding_text_tool)
+    assert report["deleted"] == 0
+    assert set(table.rows) == {ingested, CLINICAL_TOOLS[1]["name"]}
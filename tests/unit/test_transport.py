@@ -0,0 +1,43 @@
+import socket
+import threading
+
+from sqlalchemy.engine import make_url
+
+from src.benchmark.transport import ByteCountingProxy, proxy_target
+
+
+def echo_server() -> tuple[str, int]:
+    """Local TCP server that echoes one connection back, upper-cased."""
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        conn, _ = listener.accept()
+        with conn:
+            while data := conn.recv(1024):
+                conn.sendall(data.upper())
+        listener.close()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()
+
+
+class TestByteCountingProxy:
+
+    def test_counts_both_directions(self):
+        proxy = ByteCountingProxy(echo_server())
+        with socket.create_connection(("127.0.0.1", proxy.port)) as client:
+            client.sendall(b"select 1")
+            assert client.recv(1024) == b"SELECT 1"
+            assert proxy.counts() == (8, 8)
+        proxy.close()
+
+
+class TestProxyTarget:
+
+    def test_unix_socket_directory(self):
+        url = make_url("postgresql://postgres:@/postgres?host=/tmp/pgdata")
+        assert proxy_target(url) == "/tmp/pgdata/.s.PGSQL.5432"
+
+    def test_tcp_host_and_port(self):
+        url = make_url("postgresql://postgres:postgres@db:5433/clinical_ai")
+        assert proxy_target(url) == ("db", 5433)
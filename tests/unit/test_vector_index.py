@@ -0,0 +1,198 @@
+import pytest
+
+from src.db import schema
+from src.db.schema import (
+    create_quantized_indexes,
+    deferred_vector_indexes,
+    index_build_progress,
+    ivfflat_lists,
+    quantized_index_sql,
+    recluster_vector_indexes,
+    vector_index_sql,
+)
+from src.retrievers import ToolsRetriever
+from src.retrievers.pgvector_retriever import profile_settings, set_probes
+
+
+class TestIvfflatLists:
+
+    def test_rows_per_thousand_up_to_a_million(self):
+        assert ivfflat_lists(250_000) == 250
+        assert ivfflat_lists(1_000_000) == 1000
+
+    def test_square_root_beyond_a_million(self):
+        assert ivfflat_lists(4_000_000) == 2000
+
+    def test_at_least_one_list(self):
+        assert ivfflat_lists(0) == 1
+        assert ivfflat_lists(999) == 1
+
+
+class TestVectorIndexSql:
+
+    def test_ivfflat(self):
+        sql = vector_index_sql("clinical_tools", "idx_tool_embedding", "ivfflat", lists=100)
+        assert "USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)" in sql
+
+    def test_hnsw_if_not_exists(self):
+        sql = vector_index_sql("clinical_tools", "idx_tool_embedding", "hnsw", if_not_exists=True)
+        assert sql.startswith("CREATE INDEX IF NOT EXISTS idx_tool_embedding ON clinical_tools USING hnsw")
+
+    def test_concurrently(self):
+        sql = vector_index_sql("clinical_tools", "idx_tool_embedding", "hnsw", concurrently=True)
+        assert sql.startswith("CREATE INDEX CONCURRENTLY idx_tool_embedding ON clinical_tools")
+
+    def test_unknown_type(self):
+        with pytest.raises(ValueError, match="Unknown vector index type"):
+            vector_index_sql("clinical_tools", "idx_tool_embedding", "diskann")
+
+
+class TestQuantizedIndexSql:
+
+    def test_hnsw_halfvec(self):
+        sql = quantized_index_sql("clinical_tools", "idx_tool_embedding", "halfvec", 384, "hnsw")
+        assert sql.startswith("CREATE INDEX IF NOT EXISTS idx_tool_embedding_halfvec ON clinical_tools USING hnsw")
+        assert "((embedding::halfvec(384)) halfvec_cosine_ops)" in sql
+
+    def test_ivfflat_binary(self):
+        sql = quantized_index_sql("clinical_tools", "idx_tool_embedding", "binary", 384, "ivfflat", lists=20)
+        assert "USING ivfflat ((binary_quantize(embedding)::bit(384)) bit_hamming_ops) WITH (lists = 20)" in sql
+
+    def test_unknown_quantization(self):
+        with pytest.raises(ValueError, match="Unknown quantization"):
+            quantized_index_sql("clinical_tools", "idx_tool_embedding", "pq", 384)
+
+
+class RecordingConn:
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        self.executed.append(str(statement))
+
+
+class TestCreateQuantizedIndexes:
+
+    def test_nothing_to_build_without_quantization(self):
+        conn = RecordingConn()
+        assert create_quantized_indexes(conn, 384, ("none",)) is False
+        assert conn.executed == []
+
+    def test_builds_only_the_requested_mode_as_the_index_type(self, monkeypatch):
+        monkeypatch.setattr(schema, "supports_quantization", lambda conn: True)
+        conn = RecordingConn()
+        assert create_quantized_indexes(conn, 384, ("halfvec",), "ivfflat", lists=10)
+        assert len(conn.executed) == len(schema.VECTOR_INDEXES)
+        assert all("_halfvec" in sql and "USING ivfflat" in sql for sql in conn.executed)
+
+
+class FakeEngine:
+    """Connections that accept any statement; every scalar is None (empty tables, no quantized indexes)."""
+
+    def connect(self):
+        return self
+
+    def execution_options(self, **options):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, *args):
+        return self
+
+    def scalar(self):
+        return None
+
+    def commit(self):
+        pass
+
+
+class TestDeferredVectorIndexes:
+
+    @pytest.fixture
+    def builds(self, monkeypatch):
+        built = []
+
+        def build_vector_index(table, **kwargs):
+            if table == "clinical_organizations":
+                raise RuntimeError("out of memory")
+            built.append(table)
+            return {"table": table}
+
+        monkeypatch.setattr(schema, "engine", FakeEngine())
+        monkeypatch.setattr(schema, "build_vector_index", build_vector_index)
+        return built
+
+    def test_load_error_is_not_hidden_by_a_build_error(self, builds):
+        with pytest.raises(ValueError, match="bad record"):
+            with deferred_vector_indexes(list(schema.VECTOR_INDEXES)):
+                raise ValueError("bad record")
+        assert builds == ["clinical_tools"]
+
+    def test_build_error_raised_after_the_other_tables_build(self, builds):
+        with pytest.raises(RuntimeError, match="out of memory"):
+            with deferred_vector_indexes(list(schema.VECTOR_INDEXES)) as report:
+                pass
+        assert builds == ["clinical_tools"]
+        assert report == [{"table": "clinical_tools", "quantized_indexes": []}]
+
+
+class TestReclusterVectorIndexes:
+
+    def test_rebuilds_only_ivfflat(self, monkeypatch):
+        rebuilds = []
+        monkeypatch.setattr(
+            schema, "rebuild_vector_indexes",
+            lambda index_type, tables=None: rebuilds.append((index_type, tables)) or []
+        )
+        assert recluster_vector_indexes(["clinical_tools"], index_type="hnsw") == []
+        recluster_vector_indexes(["clinical_tools"], index_type="ivfflat")
+        assert rebuilds == [("ivfflat", ["clinical_tools"])]
+
+
+class FakeProgressConn:
+
+    def __init__(self, row):
+        self.row = row
+
+    def execute(self, *args):
+        return self
+
+    def one_or_none(self):
+        return self.row
+
+
+class TestIndexBuildProgress:
+
+    def test_fraction_of_tuples(self):
+        progress = index_build_progress(FakeProgressConn(("building index: loading tuples", 0, 0, 250, 1000)), "t")
+        assert progress == {"phase": "building index: loading tuples", "tuples_done": 250, "done": 0.25}
+
+    def test_falls_back_to_blocks_then_unknown(self):
+        assert index_build_progress(FakeProgressConn(("initializing", 5, 10, 0, 0)), "t")["done"] == 0.5
+        assert index_build_progress(FakeProgressConn(("initializing", 0, 0, 0, 0)), "t")["done"] is None
+
+    def test_no_build_running(self):
+        assert index_build_progress(FakeProgressConn(None), "t") is None
+
+
+class TestProbes:
+
+    def test_profile_sets_probes_only_for_ivfflat(self):
+        assert profile_settings("accurate", "hnsw")["probes"] is None
+        assert profile_settings("accurate", "ivfflat")["probes"] > profile_settings("fast", "ivfflat")["probes"]
+
+    def test_sets_even_pgvectors_default(self):
+        # A server or role may configure another ivfflat.probes
+        conn = RecordingConn()
+        set_probes(conn, 1)
+        assert conn.executed == ["SELECT set_config('ivfflat.probes', :probes, true)"]
+
+    def test_probes_change_cache_settings(self):
+        plain = ToolsRetriever(embed_fn=None).cache_settings(5)
+        assert plain != ToolsRetriever(embed_fn=None, probes=10).cache_settings(5)
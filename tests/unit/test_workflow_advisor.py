@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.agents.state import AgentState
+from src.agents.workflow_advisor import WorkflowAdvisorAgent
+from src.retrievers import CombinedRetriever, OrgsRetriever, ToolsRetriever
+from src.retrievers import combined_retriever
+from src.retrievers.combined_retriever import build_combined_sql
+from tests.conftest import FakeLLM
+from tests.mocks.mock_db import (
+    MockCombinedRetriever, MockToolsRetriever, MockOrgsRetriever, MOCK_TOOLS, MOCK_ORGS
+)
+from tests.mocks.mock_embeddings import fake_embedding
+
+
+class TestWorkflowAdvisorAgent:
+    
+    def test_searches_both_retrievers(self):
+        agent = WorkflowAdvisorAgent(
+            tools_retriever=MockToolsRetriever(MOCK_TOOLS),
+            orgs_retriever=MockOrgsRetriever(MOCK_ORGS),
+            llm=FakeLLM()
+        )
+        result = agent.run(AgentState(query="reduce burnout"))
+        
+        assert len(result.tools_results) == 3
+        assert len(result.orgs_results) == 3
+    
+    def test_prefers_combined_retriever(self):
+        combined = MockCombinedRetriever(tools=MOCK_TOOLS[:1], orgs=MOCK_ORGS[:2])
+        agent = WorkflowAdvisorAgent(
+            tools_retriever=MockToolsRetriever(MOCK_TOOLS),
+            orgs_retriever=MockOrgsRetriever(MOCK_ORGS),
+            llm=FakeLLM(),
+            combined_retriever=combined
+        )
+        result = agent.run(AgentState(query="reduce burnout"))
+        
+        assert combined.calls == ["reduce burnout"]
+        assert result.tools_results == MOCK_TOOLS[:1]
+        assert result.orgs_results == MOCK_ORGS[:2]
+
+
+class TestBuildCombinedSql:
+    
+    def test_unions_each_retriever_search(self):
+        tools = ToolsRetriever(embed_fn=fake_embedding)
+        orgs = OrgsRetriever(embed_fn=fake_embedding)
+        sql = build_combined_sql({"tools": tools, "orgs": orgs})
+        
+        assert sql.count("UNION ALL") == 1
+        assert "'tools' AS source" in sql
+        assert "'orgs' AS source" in sql
+        assert tools.sql in sql and orgs.sql in sql
+    
+    def test_combined_retriever_keys_results_by_name(self, monkeypatch):
+        rows = [
+            SimpleNamespace(source="orgs", item={"name": "Mayo", "similarity": 0.7}),
+            SimpleNamespace(source="tools", item={"name": "Scribe", "similarity": 0.6}),
+            SimpleNamespace(source="tools", item={"name": "Triage", "similarity": 0.9}),
+        ]
+        conn = FakeConnection(rows)
+        monkeypatch.setattr(combined_retriever, "engine", SimpleNamespace(connect=lambda: conn))
+        embedded = []
+        combined = CombinedRetriever(
+            embed_fn=lambda text: embedded.append(text) or fake_embedding(text),
+            retrievers={
+                "tools": ToolsRetriever(embed_fn=fake_embedding),
+                "orgs": OrgsRetriever(embed_fn=fake_embedding),
+            }
+        )
+
+        results = combined.search("reduce burnout", limit=3)
+
+        assert results == {
+            "tools": [{"name": "Triage", "similarity": 0.9}, {"name": "Scribe", "similarity": 0.6}],
+            "orgs": [{"name": "Mayo", "similarity": 0.7}],
+        }
+        assert embedded == ["reduce burnout"]
+        assert len(conn.executed) == 1
+        sql, params = conn.executed[0]
+        assert "'tools' AS source" in str(sql) and "'orgs' AS source" in str(sql)
+        assert params["query"] == "reduce burnout"
+        assert params["limit"] == 3
+        assert np.allclose(params["vec"], fake_embedding("reduce burnout"))
+
+    def test_hybrid_results_keep_fused_order(self, monkeypatch):
+        rows = [
+            SimpleNamespace(source="tools", item={"name": "Scribe", "similarity": 0.9, "rrf_score": 0.016}),
+            SimpleNamespace(source="tools", item={"name": "Triage", "similarity": 0.6, "rrf_score": 0.032}),
+        ]
+        monkeypatch.setattr(combined_retriever, "engine", SimpleNamespace(connect=lambda: FakeConnection(rows)))
+        combined = CombinedRetriever(
+            embed_fn=fake_embedding,
+            retrievers={"tools": ToolsRetriever(embed_fn=fake_embedding, search_mode="hybrid")}
+        )
+
+        results = combined.search("triage nurse line", limit=2)
+
+        assert [item["name"] for item in results["tools"]] == ["Triage", "Scribe"]
+
+
+class FakeConnection:
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql, params=None):
+        self.executed.append((sql, params))
+        return iter(self.rows)